@@ -12,21 +12,18 @@ from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QSplitter, QTreeWidget,
     QTreeWidgetItem, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
     QPushButton, QMenu, QMessageBox, QFormLayout, QGroupBox,
-    QCheckBox, QComboBox, QFileDialog, QMenuBar, QToolBar, QDialog
+    QCheckBox, QComboBox, QFileDialog, QMenuBar, QToolBar, QDialog, QSpinBox, QInputDialog
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from PyQt6.QtGui import QAction, QIcon
 from styles import LIGHT_THEME, DARK_THEME
-
-def clean_var_name(name):
-    """Clean variable name by replacing spaces and special chars"""
-    if not name or name == "NULL":
-        return name
-    return name.replace(" ", "_").replace("-", "_").replace("(", "").replace(")", "")
-
-def snake_to_camel(s):
-    """Convert snake_case to Snake_Camel_Case (underscore separated, capitalized words)"""
-    return "_".join(word.capitalize() for word in s.split("_"))
+from codegen import (MenuCodeGenerator, GenerateOptions, NODE_ID_KEY, assign_node_ids, clean_var_name,
+                     default_cache_dir, generate_c_file, merge_conflict_files, write_text_if_changed)
+from footprint import (FOOTPRINT_CATEGORIES, estimate_footprint, generation_reports, parse_abi, subtree_footprint,
+                       text_layout_report, total_footprint)
+from glyphs import (DEFAULT_GLYPH_SIZE, GLYPH_FILE_NAME, GLYPH_SIZES, build_glyph_table, format_glyph_report,
+                    parse_glyph_size, write_glyph_files)
+from periods import DEFAULT_BUDGET, DEFAULT_SCREEN_LINES, analyze_periods, format_period_report, parse_costs
 
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
@@ -74,252 +71,6 @@ class ThemeManager:
 
 
 
-def preserve_user_code(old_content, new_content):
-    """
-    Preserves user code between /* USER CODE BEGIN */ and /* USER CODE END */ markers,
-    as well as between /* USER CODE VALUE BEGIN */ and /* USER CODE VALUE END */ markers,
-    and between /* USER CODE PUBLIC BEGIN */ and /* USER CODE PUBLIC END */ markers.
-    
-    Enhanced to preserve code even when function names change, by matching function types and order.
-    """
-    import re
-
-    def get_function_type(signature):
-        """Determine function type based on parameters"""
-        if "unsigned char data" in signature:
-            return "switch"
-        elif "void *data" in signature:
-            return "data"
-        elif "char *str" in signature:
-            return "text_enum"
-        elif "void" in signature and "Enter_Callback" in signature:
-            return "page_enter"
-        elif "void" in signature and "Period_Callback" in signature:
-            return "page_period"
-        elif "void" in signature and "Exit_Callback" in signature:
-            return "page_exit"
-        elif "void" in signature and "(" in signature and ")" in signature:
-            # Generic void(void) callback, usually show item
-            return "show_item"
-        return "unknown"
-
-    # Helper to extract code blocks
-    def extract_blocks(content):
-        user_blocks = {}  # Map signature -> code
-        value_block = ""
-        public_block = ""
-        functions = []  # List of {sig, code, type}
-        
-        lines = content.split('\n')
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            
-            # Extract Value Block
-            if '/* USER CODE VALUE BEGIN */' in line:
-                start = i + 1
-                end = start
-                for j in range(start, len(lines)):
-                    if '/* USER CODE VALUE END */' in lines[j]:
-                        end = j
-                        break
-                value_block = '\n'.join(lines[start:end])
-                i = end
-            
-            # Extract Public Block
-            elif '/* USER CODE PUBLIC BEGIN */' in line:
-                start = i + 1
-                end = start
-                for j in range(start, len(lines)):
-                    if '/* USER CODE PUBLIC END */' in lines[j]:
-                        end = j
-                        break
-                public_block = '\n'.join(lines[start:end])
-                i = end
-                
-            # Extract Function Block
-            elif '/* USER CODE BEGIN */' in line:
-                # Find signature (look backwards)
-                sig_start = i
-                while sig_start >= 0 and not ('void' in lines[sig_start] and '(' in lines[sig_start]):
-                    sig_start -= 1
-                
-                if sig_start >= 0:
-                    # Find header end
-                    header_end = sig_start
-                    while header_end < len(lines) and '{' not in lines[header_end]:
-                        header_end += 1
-                    
-                    full_sig = '\n'.join(lines[sig_start:header_end+1]).strip()
-                    
-                    # Find block end
-                    code_start = i + 1
-                    code_end = i
-                    brace_count = 1 # We are inside the function
-                    
-                    # Search for USER CODE END first
-                    user_end_marker = -1
-                    for j in range(i + 1, len(lines)):
-                        if '/* USER CODE END */' in lines[j]:
-                            user_end_marker = j
-                            break
-                    
-                    if user_end_marker != -1:
-                        code_end = user_end_marker
-                        code = '\n'.join(lines[code_start:code_end])
-                        
-                        func_type = get_function_type(full_sig)
-                        user_blocks[full_sig] = code
-                        functions.append({
-                            'signature': full_sig,
-                            'code': code,
-                            'type': func_type,
-                            'used': False
-                        })
-                        i = user_end_marker
-            i += 1
-        return user_blocks, value_block, public_block, functions
-
-    old_blocks, old_value, old_public, old_funcs = extract_blocks(old_content)
-    new_blocks, _, _, new_funcs = extract_blocks(new_content)
-
-    # Prepare result
-    result_lines = new_content.split('\n')
-    
-    # 1. Replace Value Block
-    if old_value.strip():
-        start_idx = -1
-        end_idx = -1
-        for i, line in enumerate(result_lines):
-            if '/* USER CODE VALUE BEGIN */' in line:
-                start_idx = i + 1
-            elif '/* USER CODE VALUE END */' in line:
-                end_idx = i
-                break
-        
-        if start_idx != -1 and end_idx != -1:
-            # Remove old lines
-            del result_lines[start_idx:end_idx]
-            # Insert new lines
-            for line in reversed(old_value.split('\n')):
-                result_lines.insert(start_idx, line)
-
-    # 2. Replace Public Block
-    # Need to re-find indices because line numbers shifted
-    start_idx = -1
-    end_idx = -1
-    for i, line in enumerate(result_lines):
-        if '/* USER CODE PUBLIC BEGIN */' in line:
-            start_idx = i + 1
-        elif '/* USER CODE PUBLIC END */' in line:
-            end_idx = i
-            break
-            
-    if start_idx != -1 and end_idx != -1 and old_public.strip():
-        del result_lines[start_idx:end_idx]
-        for line in reversed(old_public.split('\n')):
-            result_lines.insert(start_idx, line)
-
-    # 3. Match and Replace Functions
-    # Strategy: 
-    # a. Exact signature match
-    # b. Type match (sequential)
-    
-    # Map for new functions: new_sig -> code_to_inject
-    injection_map = {}
-    
-    # a. Exact match
-    for new_f in new_funcs:
-        for old_f in old_funcs:
-            if not old_f['used'] and old_f['signature'] == new_f['signature']:
-                injection_map[new_f['signature']] = old_f['code']
-                old_f['used'] = True
-                new_f['used'] = True
-                break
-    
-    # b. Type match (sequential)
-    for new_f in new_funcs:
-        if not new_f['used']:
-            for old_f in old_funcs:
-                if not old_f['used'] and old_f['type'] == new_f['type']:
-                    # Additional check: prevent mixing widely different names if possible?
-                    # For now, trust the type and order.
-                    injection_map[new_f['signature']] = old_f['code']
-                    old_f['used'] = True
-                    new_f['used'] = True
-                    break
-
-    # Apply injections
-    # We need to process result_lines again to find function blocks
-    # Since we modified lines above, we can't use cached indices easily.
-    # But we can iterate and look for signatures.
-    
-    # Actually, easier to iterate result_lines, identify function start, extract sig, check map.
-    i = 0
-    while i < len(result_lines):
-        line = result_lines[i]
-        if '/* USER CODE BEGIN */' in line:
-            # Find signature
-            sig_start = i
-            while sig_start >= 0 and not ('void' in result_lines[sig_start] and '(' in result_lines[sig_start]):
-                sig_start -= 1
-            
-            if sig_start >= 0:
-                header_end = i
-                while header_end >= sig_start:
-                     if '{' in result_lines[header_end]:
-                         break
-                     header_end -= 1
-                     
-                # Reconstruct signature from current lines
-                # Note: header_end is where '{' is, which might be on the same line as ')' or later
-                # We need to capture from sig_start up to the line containing '{'
-                
-                # Find where '{' is
-                brace_line_idx = i
-                while brace_line_idx >= sig_start:
-                    if '{' in result_lines[brace_line_idx]:
-                        break
-                    brace_line_idx -= 1
-                
-                full_sig = '\n'.join(result_lines[sig_start:brace_line_idx+1]).strip()
-                
-                # Check if we have code to inject for this signature
-                # Note: exact signature string matching might be fragile if formatting changes
-                # But here we are processing the *same* new_content that generated new_funcs, so it should match.
-                
-                code_to_inject = injection_map.get(full_sig)
-                
-                if code_to_inject:
-                    # Find END marker
-                    end_idx = -1
-                    for j in range(i + 1, len(result_lines)):
-                        if '/* USER CODE END */' in result_lines[j]:
-                            end_idx = j
-                            break
-                    
-                    if end_idx != -1:
-                        # Replace content
-                        del result_lines[i+1:end_idx]
-                        for line in reversed(code_to_inject.split('\n')):
-                            result_lines.insert(i+1, line)
-                        
-                        # Move i to the end of this block
-                        # The new length is i + 1 + len(code_lines) + 1 (for END)
-                        # So i should point to END line
-                        # But simpler: just continue loop, we will skip over inserted lines because they don't contain BEGIN
-                        # However, we must ensure we don't process the same block again if we mess up indices.
-                        # We just deleted lines and inserted new ones.
-                        # Let's set i to the line after the inserted code
-                        # i was at BEGIN. 
-                        # We inserted code at i+1.
-                        # The END line is now at i + 1 + len(code_lines).
-                        # We want to continue searching AFTER the END line.
-                        i = i + 1 + len(code_to_inject.split('\n'))
-        i += 1
-
-    return '\n'.join(result_lines)
-
 
 
 class MenuItem(QTreeWidgetItem):
@@ -344,7 +95,7 @@ class MenuItem(QTreeWidgetItem):
     
     def _get_default_properties(self, item_type, name):
         """根据类型获取默认属性"""
-        # 所有类型都有的基本属性
+        # 所有类型都有的基本属性（节点ID只在用户代码锚点模式下分配，见 MainWindow.assignNodeIds）
         properties = {
             "变量名": name,
             "以父级作为前缀": False
@@ -1061,6 +812,18 @@ class MainWindow(QMainWindow):
         self.import_basename = None
         # 默认编码设置
         self.encoding_setting = 'gb2312'  # 可选 'utf-8' 或 'gb2312'
+        # 代码生成选项
+        self.generate_options = GenerateOptions()
+        # 增量生成缓存，默认关闭
+        self.use_cache = False
+        # 空间估算使用的类型大小（parse_abi 的格式，空为 32 位 Cortex-M）
+        self.abi_spec = ""
+        # 周期分析的每屏条目行数、代价（parse_costs 的格式，空为默认值）与 CPU 负载预算
+        self.period_lines = DEFAULT_SCREEN_LINES
+        self.period_costs_spec = ""
+        self.period_budget = DEFAULT_BUDGET
+        # 裁剪字库时中文字符的点阵大小（宽x高）
+        self.glyph_size = DEFAULT_GLYPH_SIZE
         self.initUI()
         
         # Set object names for specific styling
@@ -1163,6 +926,24 @@ class MainWindow(QMainWindow):
         generate_code_action.triggered.connect(self.generateCode)
         toolbar.addAction(generate_code_action)
         
+        # Footprint
+        footprint_action = QAction("空间估算", self)
+        footprint_action.setToolTip("按页面子树估算生成代码占用的 Flash / RAM")
+        footprint_action.triggered.connect(self.openFootprintDialog)
+        toolbar.addAction(footprint_action)
+        
+        # Periods
+        periods_action = QAction("周期分析", self)
+        periods_action.setToolTip("分析展示页面与展示条目的周期，估算 CPU 负载并给出建议周期")
+        periods_action.triggered.connect(self.openPeriodsDialog)
+        toolbar.addAction(periods_action)
+        
+        # Glyphs
+        glyph_action = QAction("裁剪字库", self)
+        glyph_action.setToolTip(f"从 HZK / BDF 字库中只取出菜单用到的中文字符，生成 {GLYPH_FILE_NAME}.c / .h")
+        glyph_action.triggered.connect(self.generateGlyphs)
+        toolbar.addAction(glyph_action)
+        
         toolbar.addSeparator()
         
         # Encoding Setting (Independent)
@@ -1182,6 +963,98 @@ class MainWindow(QMainWindow):
             
         self.encoding_combo.currentIndexChanged.connect(self.onEncodingChanged)
         toolbar.addWidget(self.encoding_combo)
+        
+        toolbar.addSeparator()
+        
+        # ROM 常量初始化
+        self.const_init_cb = QCheckBox("ROM 常量")
+        self.const_init_cb.setToolTip("用 const 指定初始化器静态定义页面和条目，代替 Easy_Menu_Ui_Init 中的初始化调用")
+        self.const_init_cb.setChecked(self.generate_options.const_init)
+        self.const_init_cb.toggled.connect(self.onConstInitToggled)
+        toolbar.addWidget(self.const_init_cb)
+        
+        # 字符串池
+        self.string_pool_cb = QCheckBox("字符串池")
+        self.string_pool_cb.setToolTip("显示名称与枚举字符串去重后放入字符串池，内容相同的枚举数组共用")
+        self.string_pool_cb.setChecked(self.generate_options.string_pool)
+        self.string_pool_cb.toggled.connect(self.onStringPoolToggled)
+        toolbar.addWidget(self.string_pool_cb)
+        
+        # 数据字段按对齐排序
+        self.sort_data_fields_cb = QCheckBox("紧凑数据")
+        self.sort_data_fields_cb.setToolTip("Easy_Menu_Ui_Data 的字段按对齐从大到小排列，减少填充占用的 RAM")
+        self.sort_data_fields_cb.setChecked(self.generate_options.sort_data_fields)
+        self.sort_data_fields_cb.toggled.connect(self.onSortDataFieldsToggled)
+        toolbar.addWidget(self.sort_data_fields_cb)
+        
+        # 开关按位存放
+        self.pack_switches_cb = QCheckBox("开关按位存放")
+        self.pack_switches_cb.setToolTip("开关条目的数据按位存放，需要在 Easy_Menu.h 中将 SWITCH_ITEM_BIT_PACK 设为 1")
+        self.pack_switches_cb.setChecked(self.generate_options.pack_switches)
+        self.pack_switches_cb.toggled.connect(self.onPackSwitchesToggled)
+        toolbar.addWidget(self.pack_switches_cb)
+        
+        # 按页面拆分文件
+        self.split_pages_cb = QCheckBox("按页面拆分")
+        self.split_pages_cb.setToolTip("每个顶层页面生成一个 .c 文件，修改菜单后只需重新编译有变化的文件")
+        self.split_pages_cb.setChecked(self.generate_options.split_pages)
+        self.split_pages_cb.toggled.connect(self.onSplitPagesToggled)
+        toolbar.addWidget(self.split_pages_cb)
+        
+        # 生成 Easy_Menu_User.h
+        self.user_header_cb = QCheckBox("生成头文件")
+        self.user_header_cb.setToolTip("同时生成 Easy_Menu_User.h：Easy_Menu_Ui_Data、页面和条目的 extern 声明以及条目数量宏")
+        self.user_header_cb.setChecked(self.generate_options.user_header)
+        self.user_header_cb.toggled.connect(self.onUserHeaderToggled)
+        toolbar.addWidget(self.user_header_cb)
+        
+        # 预计算文本布局
+        self.text_layout_cb = QCheckBox("预计算文本布局")
+        self.text_layout_cb.setToolTip("与 ROM 常量一起使用时在页面和条目中写入名称的显示长度与标题位置，"
+                                       "需要在 Easy_Menu.h 中将 TEXT_LAYOUT_PRECOMPUTE 设为 1")
+        self.text_layout_cb.setChecked(self.generate_options.text_layout)
+        self.text_layout_cb.toggled.connect(self.onTextLayoutToggled)
+        toolbar.addWidget(self.text_layout_cb)
+        
+        toolbar.addWidget(QLabel("每行列数:"))
+        self.screen_columns_spin = QSpinBox()
+        self.screen_columns_spin.setRange(2, 255)
+        self.screen_columns_spin.setValue(self.generate_options.screen_columns)
+        self.screen_columns_spin.setToolTip("Easy_Menu.h 中的 SCREEN_WIDTH / CHAR_WIDTH，用于预计算文本布局和检查会被截断的名称")
+        self.screen_columns_spin.valueChanged.connect(self.onScreenColumnsChanged)
+        toolbar.addWidget(self.screen_columns_spin)
+        
+        # 数值格式化类型检查
+        self.value_format_cb = QCheckBox("专用数值格式化")
+        self.value_format_cb.setToolTip("Easy_Menu.h 中 VALUE_FORMAT_MODE 为 1 时使用：检查 VALUE_FORMAT_TYPES 是否包含"
+                                        "用到的数值类型，并给出只含这些类型的设置")
+        self.value_format_cb.setChecked(self.generate_options.value_format)
+        self.value_format_cb.toggled.connect(self.onValueFormatToggled)
+        toolbar.addWidget(self.value_format_cb)
+        
+        # 页面表
+        self.page_table_cb = QCheckBox("页面表")
+        self.page_table_cb.setToolTip("生成页面表，可以按序号跳转页面、查找上级和子页面（需要将 Easy_Menu.h 中的 PAGE_TABLE_MODE 设为 1），"
+                                      "同时生成 Easy_Menu_User.h 时其中有各页面的序号")
+        self.page_table_cb.setChecked(self.generate_options.page_table)
+        self.page_table_cb.toggled.connect(self.onPageTableToggled)
+        toolbar.addWidget(self.page_table_cb)
+        
+        # 用户代码锚点
+        self.anchors_cb = QCheckBox("用户代码锚点")
+        self.anchors_cb.setToolTip("在回调函数的 USER CODE BEGIN 标记中写入节点ID，"
+                                   "条目改名、调整顺序或移到其他页面后仍能找回其中的用户代码")
+        self.anchors_cb.setChecked(self.generate_options.anchors)
+        self.anchors_cb.toggled.connect(self.onAnchorsToggled)
+        toolbar.addWidget(self.anchors_cb)
+        
+        # 增量生成缓存
+        self.use_cache_cb = QCheckBox("增量缓存")
+        self.use_cache_cb.setToolTip("在 .easy_menu_cache 目录中保存上次生成的结果，只重新生成有变化的页面，"
+                                     "并与 USER CODE 块之外的手工修改做三方合并")
+        self.use_cache_cb.setChecked(self.use_cache)
+        self.use_cache_cb.toggled.connect(self.onUseCacheToggled)
+        toolbar.addWidget(self.use_cache_cb)
 
     def onEncodingChanged(self, index):
         """Handle encoding change from toolbar combobox"""
@@ -1190,6 +1063,111 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'statusBar'):
             self.statusBar().showMessage(f"编码设置已更改为: {encoding}")
 
+    def onConstInitToggled(self, checked):
+        """切换 ROM 常量初始化模式"""
+        self.generate_options = self.generate_options._replace(const_init=checked)
+        self.statusBar().showMessage("已开启 ROM 常量初始化" if checked else "已关闭 ROM 常量初始化")
+    
+    def onStringPoolToggled(self, checked):
+        """切换字符串池"""
+        self.generate_options = self.generate_options._replace(string_pool=checked)
+        self.statusBar().showMessage("已开启字符串池" if checked else "已关闭字符串池")
+    
+    def onSortDataFieldsToggled(self, checked):
+        """切换数据字段排序"""
+        self.generate_options = self.generate_options._replace(sort_data_fields=checked)
+        self.statusBar().showMessage("数据字段按对齐排序" if checked else "数据字段按配置顺序排列")
+    
+    def onPackSwitchesToggled(self, checked):
+        """切换开关按位存放"""
+        self.generate_options = self.generate_options._replace(pack_switches=checked)
+        self.statusBar().showMessage("开关数据按位存放（需要将 SWITCH_ITEM_BIT_PACK 设为 1）" if checked
+                                     else "开关数据按字节存放")
+    
+    def onSplitPagesToggled(self, checked):
+        """切换按页面拆分文件"""
+        self.generate_options = self.generate_options._replace(split_pages=checked)
+        self.statusBar().showMessage("每个顶层页面生成一个 .c 文件" if checked else "生成单个 Easy_Menu_User.c")
+    
+    def onUserHeaderToggled(self, checked):
+        """切换是否生成 Easy_Menu_User.h"""
+        self.generate_options = self.generate_options._replace(user_header=checked)
+        self.statusBar().showMessage("同时生成 Easy_Menu_User.h" if checked else "Easy_Menu_User.h 由用户维护")
+    
+    def onTextLayoutToggled(self, checked):
+        """切换预计算文本布局"""
+        self.generate_options = self.generate_options._replace(text_layout=checked)
+        self.statusBar().showMessage("预计算名称长度与标题位置（需要将 TEXT_LAYOUT_PRECOMPUTE 设为 1）" if checked
+                                     else "运行时计算名称长度与标题位置")
+    
+    def onValueFormatToggled(self, checked):
+        """切换数值格式化类型检查"""
+        self.generate_options = self.generate_options._replace(value_format=checked)
+        self.statusBar().showMessage("检查 VALUE_FORMAT_TYPES 中的数值类型" if checked else "不检查数值格式化类型")
+    
+    def onPageTableToggled(self, checked):
+        """切换页面表"""
+        self.generate_options = self.generate_options._replace(page_table=checked)
+        self.statusBar().showMessage("生成页面表（需要将 PAGE_TABLE_MODE 设为 1）" if checked else "不生成页面表")
+    
+    def onAnchorsToggled(self, checked):
+        """切换用户代码锚点，打开时为还没有节点ID的节点分配节点ID"""
+        self.generate_options = self.generate_options._replace(anchors=checked)
+        if checked:
+            self.assignNodeIds()
+        self.statusBar().showMessage("回调函数的用户代码按节点ID对应" if checked else "回调函数的用户代码按函数签名与类型对应")
+    
+    def onUseCacheToggled(self, checked):
+        """切换增量生成缓存"""
+        self.use_cache = checked
+        self.statusBar().showMessage("已开启增量生成缓存" if checked else "已关闭增量生成缓存")
+    
+    def assignNodeIds(self):
+        """
+        为树中没有节点ID或节点ID重复的节点分配节点ID，返回分配的个数；保存配置时一并写入
+        与命令行的 --anchors 一致，只在用户代码锚点模式下分配，关闭时配置中不会增加节点ID
+        """
+        items = []
+        
+        def walk(item):
+            items.append(item)
+            for i in range(item.childCount()):
+                walk(item.child(i))
+        
+        for i in range(self.tree_widget.topLevelItemCount()):
+            walk(self.tree_widget.topLevelItem(i))
+        
+        # 按树的先序排成一层，assign_node_ids 对其分配的结果与对完整配置树相同
+        nodes = [{"properties": dict((item.data(0, Qt.ItemDataRole.UserRole) or {}).get("properties", {}))}
+                 for item in items]
+        assigned = assign_node_ids(nodes)
+        if assigned:
+            for item, node in zip(items, nodes):
+                data = item.data(0, Qt.ItemDataRole.UserRole)
+                node_id = node["properties"][NODE_ID_KEY]
+                if data and data.get("properties", {}).get(NODE_ID_KEY) != node_id:
+                    data.setdefault("properties", {})[NODE_ID_KEY] = node_id
+                    item.setData(0, Qt.ItemDataRole.UserRole, data)
+        return assigned
+    
+    def onScreenColumnsChanged(self, value):
+        """修改每行列数"""
+        self.generate_options = self.generate_options._replace(screen_columns=value)
+        self.statusBar().showMessage(f"每行列数已更改为: {value}")
+    
+    def generateReport(self, tree_data, c_file_path=None, cache_dir=None):
+        """生成选项附带的空间报告、文本布局检查与三方合并冲突的结果，没有时返回空字符串"""
+        generator = MenuCodeGenerator(self.generate_options)
+        generator.collect(tree_data)
+        reports = generation_reports(generator, self.encoding_setting)
+        layout_report = text_layout_report(generator, self.encoding_setting)
+        if layout_report is not None:
+            reports.append(layout_report)
+        for path, orig_path in merge_conflict_files(generator, c_file_path, cache_dir):
+            reports.append(f"注意: {os.path.basename(path)} 中有手工修改与新生成的代码冲突，已按生成的代码处理，"
+                           f"合并前的文件保存在:\n{orig_path}")
+        return "".join(f"\n\n{report}" for report in reports)
+
     def override_styles(self):
         """
         Clear hardcoded styles from the original classes to allow 
@@ -1308,6 +1286,9 @@ class MainWindow(QMainWindow):
             new_item = MenuItem(default_name, page_type, parent_item)
             parent_item.setExpanded(True)
         
+        if self.generate_options.anchors:
+            self.assignNodeIds()
+        
         # 如果需要，更新变量名属性
         if var_prop_value:
             new_item.update_property("变量名", var_prop_value)
@@ -1365,9 +1346,10 @@ class MainWindow(QMainWindow):
         tree_data = self.buildTreeData()
         
         try:
-            # 保存JSON文件
-            with open(file_path, 'w', encoding=self.encoding_setting) as f:
-                json.dump(tree_data, f, ensure_ascii=False, indent=2)
+            # 保存JSON文件（内容未变化时不改写）
+            json_changed = write_text_if_changed(
+                file_path, json.dumps(tree_data, ensure_ascii=False, indent=2), self.encoding_setting)
+            json_state = "" if json_changed else "（未变化）"
             
             # 如果没有导入动作，则同时保存.c文件
             if self.import_dir is None or self.import_basename is None:
@@ -1379,19 +1361,18 @@ class MainWindow(QMainWindow):
                 # 创建C文件路径
                 c_file_path = os.path.join(json_dir, "Easy_Menu_User.c")
                 
-                # 生成C文件内容
-                c_content = self.generateCFileContent(tree_data, json_basename)
-                
-                # 保存C文件
-                with open(c_file_path, 'w', encoding=self.encoding_setting) as f:
-                    f.write(c_content)
-                self.statusBar().showMessage(f"配置已导出到: {file_path} 和 {c_file_path}")
+                # 生成并保存C文件
+                c_changed = MenuCodeGenerator(self.generate_options).writeCFile(
+                    tree_data, c_file_path, json_basename, self.encoding_setting)
+                c_state = "" if c_changed else "（未变化）"
+                self.statusBar().showMessage(f"配置已导出到: {file_path}{json_state} 和 {c_file_path}{c_state}")
                 QMessageBox.information(self, "导出成功", 
-                    f"配置已成功导出到:\n{file_path}\n\nC文件已保存到:\n{c_file_path}")
+                    f"配置已成功导出到:\n{file_path}{json_state}\n\nC文件已保存到:\n{c_file_path}{c_state}"
+                    f"{self.generateReport(tree_data)}")
             else:
                 # 如果有导入动作，只保存JSON文件
-                self.statusBar().showMessage(f"配置已导出到: {file_path}")
-                QMessageBox.information(self, "导出成功", f"配置已成功导出到:\n{file_path}")
+                self.statusBar().showMessage(f"配置已导出到: {file_path}{json_state}")
+                QMessageBox.information(self, "导出成功", f"配置已成功导出到:\n{file_path}{json_state}")
             
             # 更新导入文件信息，以便后续操作（如生成代码）能识别当前文件
             import os
@@ -1410,6 +1391,10 @@ class MainWindow(QMainWindow):
             with open(file_path, 'r', encoding=self.encoding_setting) as f:
                 tree_data = json.load(f)
             
+            # 用户代码锚点模式下为没有节点ID（旧版本保存的配置）或节点ID重复的节点分配节点ID，保存配置时一并写入
+            if self.generate_options.anchors:
+                assign_node_ids(tree_data)
+            
             # 清除现有数据
             self.tree_widget.clear()
             self.property_editor.setItem(None)
@@ -1617,21 +1602,9 @@ class MainWindow(QMainWindow):
         
         update_counters(tree_data)
     
-    def generateCFileContent(self, tree_data, basename):
+    def generateCFileContent(self, tree_data, basename=None):
         """生成C文件内容"""
-        c_content = f"""/* Easy Menu User Configuration File */
-/* This file is auto-generated by Easy Menu Builder */
-/* Configuration: {basename} */
-
-#include "Easy_Menu.h"
-
-/* User menu configuration will be generated here */
-
-/* TODO: Implement actual C code generation */
-/* This is a placeholder for future implementation */
-
-"""
-        return c_content
+        return MenuCodeGenerator().generateCFileContent(tree_data, basename)
     
     def generateCode(self):
         """生成C语言代码"""
@@ -1645,41 +1618,20 @@ class MainWindow(QMainWindow):
                 # 构建树形结构数据
                 tree_data = self.buildTreeData()
                 
-                # 生成C文件内容
-                c_content = self.generateCFileContent(tree_data, self.import_basename)
-                
-                # If the C file already exists, preserve user code between /* USER CODE BEGIN */ and /* USER CODE END */
-                if os.path.exists(c_file_path):
-                    # Try to read with the selected encoding, fall back to alternative encodings if needed
-                    old_c_content = ""
-                    encodings_to_try = [self.encoding_setting]
-                    if self.encoding_setting != 'gb2312':
-                        encodings_to_try.append('gb2312')
-                    if self.encoding_setting != 'utf-8':
-                        encodings_to_try.append('utf-8')
-                    
-                    for enc in encodings_to_try:
-                        try:
-                            with open(c_file_path, 'r', encoding=enc) as f:
-                                old_c_content = f.read()
-                            break  # Successfully read, exit the loop
-                        except UnicodeDecodeError:
-                            continue  # Try the next encoding
-                    
-                    # If still empty, try with errors='ignore' as last resort
-                    if not old_c_content:
-                        with open(c_file_path, 'r', encoding=self.encoding_setting, errors='ignore') as f:
-                            old_c_content = f.read()
-                    
-                    # Preserve user code between /* USER CODE BEGIN */ and /* USER CODE END */
-                    c_content = preserve_user_code(old_c_content, c_content)
-                
-                # Save C file
-                with open(c_file_path, 'w', encoding=self.encoding_setting) as f:
-                    f.write(c_content)
+                # 生成C文件，保留 /* USER CODE BEGIN */ 和 /* USER CODE END */ 之间的用户代码
+                # 开启增量缓存时只重新生成有变化的页面
+                cache_dir = default_cache_dir(c_file_path) if self.use_cache else None
+                changed = generate_c_file(tree_data, c_file_path, self.import_basename, self.encoding_setting,
+                                          cache_dir, self.generate_options)
+                report = self.generateReport(tree_data, c_file_path, cache_dir)
                 
-                self.statusBar().showMessage(f"C代码已生成到: {c_file_path}")
-                QMessageBox.information(self, "生成成功", f"C代码已成功生成到:\n{c_file_path}\n")
+                if changed:
+                    self.statusBar().showMessage(f"C代码已生成到: {c_file_path}")
+                    QMessageBox.information(self, "生成成功", f"C代码已成功生成到:\n{c_file_path}\n{report}")
+                else:
+                    # 内容与已有文件相同，未改写文件，不会触发重新编译
+                    self.statusBar().showMessage(f"C代码未变化: {c_file_path}")
+                    QMessageBox.information(self, "生成成功", f"C代码未变化，文件未改写:\n{c_file_path}\n{report}")
 #                QMessageBox.information(self, "生成成功", f"C代码已成功生成到:\n{c_file_path}\n\n注意：保留了 /* USER CODE BEGIN */ 和 /* USER CODE END */ 之间的用户代码")
                 
                 # 自动保存配置文件
@@ -1709,15 +1661,14 @@ class MainWindow(QMainWindow):
                 # 构建树形结构数据
                 tree_data = self.buildTreeData()
                 
-                # 生成C文件内容
-                c_content = self.generateCFileContent(tree_data)
-                
-                # 保存C文件
-                with open(file_path, 'w', encoding=self.encoding_setting) as f:
-                    f.write(c_content)
-                
-                self.statusBar().showMessage(f"C代码已生成到: {file_path}")
-                QMessageBox.information(self, "生成成功", f"C代码已成功生成到:\n{file_path}")
+                # 生成并保存C文件
+                report = self.generateReport(tree_data)
+                if MenuCodeGenerator(self.generate_options).writeCFile(tree_data, file_path, None, self.encoding_setting):
+                    self.statusBar().showMessage(f"C代码已生成到: {file_path}")
+                    QMessageBox.information(self, "生成成功", f"C代码已成功生成到:\n{file_path}{report}")
+                else:
+                    self.statusBar().showMessage(f"C代码未变化: {file_path}")
+                    QMessageBox.information(self, "生成成功", f"C代码未变化，文件未改写:\n{file_path}{report}")
                 
                 # 自动保存配置文件
                 self.saveConfig()
@@ -1731,679 +1682,6 @@ class MainWindow(QMainWindow):
                 self.statusBar().showMessage(f"生成失败: {str(e)}")
                 QMessageBox.critical(self, "生成失败", f"生成C代码时发生错误:\n{str(e)}")
     
-    def generateCFileContent(self, tree_data, basename=None):
-        """生成C文件内容"""
-        # Initialize collections
-        self.page_definitions = []  # 页面和条目定义
-        self.enum_definitions = []  # 枚举定义
-        self.item_callbacks = []    # 条目回调函数
-        self.page_callbacks = []    # 页面回调函数
-        self.setup_lists = {}       # 页面设置列表
-        self.init_code = []         # 初始化代码
-        self.variables = {}         # 占位变量
-        
-        # 遍历树形数据，收集信息
-        self.collectCodeInfo(tree_data, None, 0)
-        
-        # Clean up the flag after collection is complete
-        if hasattr(self, '_initialized_collections'):
-            delattr(self, '_initialized_collections')
-        
-        # 生成代码各部分
-        code_parts = []
-        
-        # 添加文件头注释
-        if basename:
-            code_parts.append(f"""/* Easy Menu User Configuration File */
-/* This file is auto-generated by Easy Menu Builder */
-/* Configuration: {basename} */
-
-/* USER CODE PUBLIC BEGIN */
-
-/* USER CODE PUBLIC END */
-""")
-        else:
-            code_parts.append("""/* Easy Menu User Configuration File */
-/* This file is auto-generated by Easy Menu Builder */
-
-""")
-        
-        # 1. 占位变量部分
-        code_parts.append(self.generatePlaceholderVariables())
-        
-        # 2. 页面、条目定义部分
-        code_parts.append(self.generatePageDefinitions())
-        
-        # 3. 枚举列表
-        code_parts.append(self.generateEnumLists())
-        
-        # 4. 回调函数（条目）
-        code_parts.append(self.generateItemCallbacks())
-        
-        # 5. 回调函数（页面）
-        code_parts.append(self.generatePageCallbacks())
-        
-        # 6. 设置列表（普通页面）
-        code_parts.append(self.generateSetupLists())
-        
-        # 7. 系统初始化
-        code_parts.append(self.generateSystemInit())
-        
-        # 组合所有部分
-        c_content = """#include "Easy_Menu_User.h"
-
-"""
-        c_content += "\n".join(code_parts)
-        
-        return c_content
-    
-    def collectCodeInfo(self, tree_data, parent_page_var=None, indent_level=0):
-        """收集代码生成所需的信息"""
-        # Initialize collections only once per complete collection process
-        # This ensures that collections are not reset during recursive calls
-        if not hasattr(self, '_initialized_collections'):
-            self._initialized_collections = True
-            self.page_definitions = []  # 页面和条目定义
-            self.enum_definitions = []  # 枚举定义
-            self.item_callbacks = []    # 条目回调函数
-            self.page_callbacks = []    # 页面回调函数
-            self.setup_lists = {}       # 页面设置列表
-            self.init_code = []         # 初始化代码
-            self.variables = {}         # 占位变量
-        
-        for item_data in tree_data:
-            item_type = item_data.get("type", "普通页面")
-            item_name = item_data.get("name", "")
-            properties = item_data.get("properties", {})
-            children = item_data.get("children", [])
-            
-            # 生成变量名
-            if item_type == "普通页面":
-                page_var = properties.get("变量名", "")
-                if not page_var:
-                    # 根据参考文件格式生成变量名
-                    page_var = clean_var_name(item_name).lower()
-                else:
-                    page_var = clean_var_name(page_var)
-                
-                # 页面定义
-                page_def = {
-                    "type": "Ordinary_Page",
-                    "var_name": page_var,
-                    "display_name": item_name,
-                    "indent": indent_level,
-                    "parent": parent_page_var,
-                    "properties": properties,
-                    "children": []
-                }
-                self.page_definitions.append(page_def)
-                
-                # 收集子项信息
-                child_index = 1
-                for child in children:
-                    child_type = child.get("type", "")
-                    child_name = child.get("name", "")
-                    child_props = child.get("properties", {})
-                    
-                    # 生成条目变量名
-                    use_prefix = child_props.get("以父级作为前缀", True)
-                    child_var_prop = child_props.get("变量名", "")
-                    if not child_var_prop:
-                        # Fallback if empty property
-                        # Use display name as variable name base
-                        child_var_prop = clean_var_name(child_name).lower()
-                    else:
-                        child_var_prop = clean_var_name(child_var_prop)
-                    
-                    if use_prefix:
-                        # <所属页面>_<变量名属性中的值>
-                        item_var = f"{page_var}__{child_var_prop}"
-                    else:
-                        # 否则直接采用属性中的变量名（全小写）
-                        item_var = child_var_prop
-                    
-                    # 如果是跳转类条目（普通页面、展示页面、跳转条目），为了避免变量名冲突，添加 goto_ 前缀
-                    if child_type in ["普通页面", "展示页面", "跳转条目"]:
-                        item_var = f"goto__{item_var}"
-                    
-                    # 确定条目类型和定义
-                    item_def = {
-                        "var_name": item_var,
-                        "display_name": child_name,
-                        "indent": indent_level + 1,
-                        "parent": page_var,
-                        "properties": child_props
-                    }
-                    
-                    if child_type == "普通页面":
-                        # 子页面，需要生成跳转条目
-                        item_def["type"] = "Goto_Item"
-                        child_page_var = child_props.get("变量名", "")
-                        if not child_page_var:
-                            child_page_var = clean_var_name(child_name).lower()
-                        else:
-                            child_page_var = clean_var_name(child_page_var)
-                        item_def["target_page"] = child_page_var
-                        
-                        self.page_definitions.append(item_def)
-                        page_def["children"].append({
-                            "type": "Goto_Item",
-                            "var_name": item_var,
-                            "target_page": child_page_var
-                        })
-                        
-                    elif child_type == "展示页面":
-                        # 展示页面作为子页面，需要生成跳转条目
-                        item_def["type"] = "Goto_Item"
-                        child_page_var = child_props.get("变量名", "")
-                        if not child_page_var:
-                            child_page_var = clean_var_name(child_name).lower()
-                        else:
-                            child_page_var = clean_var_name(child_page_var)
-                        item_def["target_page"] = child_page_var
-                        
-                        self.page_definitions.append(item_def)
-                        page_def["children"].append({
-                            "type": "Goto_Item",
-                            "var_name": item_var,
-                            "target_page": child_page_var
-                        })
-                        
-                    elif child_type == "跳转条目":
-                        # 跳转条目
-                        item_def["type"] = "Goto_Item"
-                        target_page = child_props.get("目标页面", "NULL")
-                        if target_page and target_page != "NULL":
-                            target_page = clean_var_name(target_page)
-                        item_def["target_page"] = target_page
-                        
-                        self.page_definitions.append(item_def)
-                        page_def["children"].append({
-                            "type": "Goto_Item",
-                            "var_name": item_var,
-                            "target_page": target_page
-                        })
-                        
-                    else:
-                        # 普通条目
-                        type_map = {
-                            "文本条目": "Text_Item",
-                            "开关条目": "Switch_Item",
-                            "数据条目": "Data_Item",
-                            "枚举条目": "Enum_Item",
-                            "展示条目": "Show_Item"
-                        }
-                        item_type_name = type_map.get(child_type, "Text_Item")
-                        item_def["type"] = item_type_name
-                        
-                        self.page_definitions.append(item_def)
-                        page_def["children"].append({
-                            "type": item_type_name,
-                            "var_name": item_var
-                        })
-                        
-                        # 收集回调函数信息
-                        if child_props.get("回调函数"):
-                            # 回调函数为<页面/条目的变量名>_Callback（下划线分割的首字母大写）
-                            callback_name = f"{snake_to_camel(item_var)}_Callback"
-                            
-                            self.item_callbacks.append({
-                                "item_type": child_type,
-                                "item_name": child_name,
-                                "item_var": item_var,
-                                "parent_page": page_var,
-                                "callback_name": callback_name,
-                                "properties": child_props
-                            })
-                        
-                        # 收集枚举定义
-                        if child_type == "枚举条目":
-                            enum_strings = child_props.get("枚举字符串", [])
-                            if enum_strings:
-                                # 生成枚举数组名称
-                                enum_array_name = f"{item_var}_enum_str"
-                                self.enum_definitions.append({
-                                    "var_name": enum_array_name,
-                                    "strings": enum_strings,
-                                    "parent_page": page_var,
-                                    "item_name": child_name,
-                                    "item_var": item_var
-                                })
-                        
-                        # 收集变量信息
-                        if child_type in ["开关条目", "数据条目", "展示条目"]:
-                            data_var = child_props.get("数据变量名", "")
-                            if data_var:
-                                data_var = clean_var_name(data_var)
-                                var_type = child_props.get("变量类型", "uint8_val")
-                                initial_value = child_props.get("初始值", "0")
-                                
-                                type_map_c = {
-                                    "uint8_val": "unsigned char",
-                                    "int8_val": "signed char",
-                                    "uint16_val": "unsigned short int",
-                                    "int16_val": "signed short int",
-                                    "uint32_val": "unsigned int",
-                                    "int32_val": "signed int",
-                                    "float_val": "float"
-                                }
-                                c_type = type_map_c.get(var_type, "unsigned char")
-                                
-                                if var_type == "float_val":
-                                    # Ensure float values have 'f' suffix
-                                    if not initial_value.endswith('f'):
-                                        if '.' not in initial_value and initial_value.replace('-', '', 1).isdigit():
-                                            initial_value += '.0f'
-                                        else:
-                                            initial_value += 'f'
-                                
-                                self.variables[data_var] = {
-                                    "type": c_type,
-                                    "init_value": initial_value
-                                }
-                        
-                    child_index += 1
-                
-                # 收集设置列表信息
-                if page_def["children"]:
-                    self.setup_lists[page_var] = {
-                        "page_var": page_var,
-                        "display_name": item_name,
-                        "items": page_def["children"],
-                        "item_count": len(page_def["children"])
-                    }
-                
-                # 递归处理子页面
-                for child in children:
-                    if child.get("type") == "普通页面":
-                        self.collectCodeInfo([child], page_var, indent_level + 2)
-                    elif child.get("type") == "展示页面":
-                        self.collectCodeInfo([child], page_var, indent_level + 2)
-            
-            elif item_type == "展示页面":
-                page_var = properties.get("变量名", "")
-                if not page_var:
-                    page_var = clean_var_name(item_name).lower()
-                else:
-                    page_var = clean_var_name(page_var)
-                
-                self.page_definitions.append({
-                    "type": "Show_Page",
-                    "var_name": page_var,
-                    "display_name": item_name,
-                    "indent": indent_level,
-                    "parent": parent_page_var,
-                    "properties": properties
-                })
-                
-                # 收集页面回调函数信息
-                formatted_page_name = snake_to_camel(page_var)
-                
-                if properties.get("进入回调函数"):
-                    callback_name = f"{formatted_page_name}_Enter_Callback"
-                    self.page_callbacks.append({
-                        "page_var": page_var,
-                        "callback_type": "enter",
-                        "callback_name": callback_name
-                    })
-                
-                if properties.get("周期回调函数"):
-                    callback_name = f"{formatted_page_name}_Period_Callback"
-                    self.page_callbacks.append({
-                        "page_var": page_var,
-                        "callback_type": "period",
-                        "callback_name": callback_name
-                    })
-                
-                if properties.get("退出回调函数"):
-                    callback_name = f"{formatted_page_name}_Exit_Callback"
-                    self.page_callbacks.append({
-                        "page_var": page_var,
-                        "callback_type": "exit",
-                        "callback_name": callback_name
-                    })
-                
-                # 收集初始化代码信息
-                period = properties.get("周期", "100")
-                enter_callback = f"{formatted_page_name}_Enter_Callback" if properties.get("进入回调函数") else "NULL"
-                period_callback = f"{formatted_page_name}_Period_Callback" if properties.get("周期回调函数") else "NULL"
-                exit_callback = f"{formatted_page_name}_Exit_Callback" if properties.get("退出回调函数") else "NULL"
-                parent_page = parent_page_var if parent_page_var else "NULL"
-                
-                # 添加初始化代码
-                self.init_code.append({
-                    "page_var": page_var,
-                    "display_name": item_name,
-                    "period": period,
-                    "enter_callback": enter_callback,
-                    "period_callback": period_callback,
-                    "exit_callback": exit_callback,
-                    "parent_page": parent_page,
-                    "indent": indent_level
-                })
-                
-                # 递归处理子项目
-                if children:
-                    self.collectCodeInfo(children, page_var, indent_level + 1)
-            else:
-                # 其他类型的处理
-                pass
-        
-        # Don't reset collections during recursive calls - only initialize once
-
-    
-    def generateCallbackName(self, item_type, item_name, parent_page_var):
-        """生成回调函数名称"""
-        # 根据参考文件.c的命名规则生成回调函数名称
-        # 规则：下划线分隔，每个单词的首字母大写
-        # 例如：Text_Page_2_Item_Callback, Switch_Page_1_Item_Callback
-        
-        # 清理名称：移除特殊字符，用下划线替换空格
-        item_name_clean = clean_var_name(item_name)
-        parent_page_clean = clean_var_name(parent_page_var)
-        
-        # 根据条目类型确定前缀
-        type_prefix_map = {
-            "文本条目": "Text",
-            "开关条目": "Switch",
-            "数据条目": "Data",
-            "枚举条目": "Enum",
-            "展示条目": "Show"
-        }
-        
-        prefix = type_prefix_map.get(item_type, "Item")
-        
-        # 构建回调函数名：前缀_页面名_条目名_Callback
-        # 注意：参考文件中，文本条目的回调函数名是 Text_Page_2_Item_Callback
-        # 其中"Page_2"是页面名，"Item"是固定标识
-        # 我们需要根据实际结构调整
-        
-        # 对于文本条目，参考文件中的格式是：Text_Page_2_Item_Callback
-        # 其中"Page_2"来自页面名，"Item"是固定标识
-        if item_type == "文本条目":
-            # 文本条目的回调函数名格式：Text_页面名_条目名_Callback
-            # 但参考文件中是 Text_Page_2_Item_Callback，其中"Page_2"是页面名
-            # 我们需要从parent_page_var中提取页面名
-            if parent_page_clean:
-                # 将页面名转换为首字母大写的格式
-                page_parts = parent_page_clean.split('_')
-                page_name_formatted = '_'.join([part.capitalize() for part in page_parts])
-                
-                # 将条目名转换为首字母大写的格式
-                item_parts = item_name_clean.split('_')
-                item_name_formatted = '_'.join([part.capitalize() for part in item_parts])
-                
-                # 简化文本条目回调函数名 to match reference format
-                return f"Text_{page_name_formatted}_{item_name_formatted}_Callback"
-            else:
-                return f"Text_{item_name_clean.capitalize()}_Callback"
-        else:
-            # 其他类型的回调函数名格式：前缀_页面名_条目名_Callback
-            if parent_page_clean:
-                # 将页面名转换为首字母大写的格式
-                page_parts = parent_page_clean.split('_')
-                page_name_formatted = '_'.join([part.capitalize() for part in page_parts])
-                
-                # 将条目名转换为首字母大写的格式
-                item_parts = item_name_clean.split('_')
-                item_name_formatted = '_'.join([part.capitalize() for part in item_parts])
-                
-                return f"{prefix}_{page_name_formatted}_{item_name_formatted}_Callback"
-            else:
-                return f"{prefix}_{item_name_clean.capitalize()}_Callback"
-    
-    def generatePlaceholderVariables(self):
-        """生成占位变量部分"""
-        code_lines = ["/* ================================================================= 占位变量 ================================================================= */"]
-        code_lines.append("struct {")
-        
-        # 使用动态收集的变量
-        for var_name, var_info in self.variables.items():
-            var_type = var_info.get("type", "unsigned char")
-            code_lines.append(f"    {var_type} {var_name};")
-        
-        code_lines.append("} Easy_Menu_Ui_Data = {")
-        
-        # 添加变量初始化
-        for var_name, var_info in self.variables.items():
-            init_value = var_info.get("init_value", "0")
-            code_lines.append(f"    .{var_name} = {init_value},")
-        
-        code_lines.append("};")
-        
-        return "\n".join(code_lines)
-    
-    def generatePageDefinitions(self):
-        """生成页面、条目定义部分"""
-        if not self.page_definitions:
-            return "/* ============================================================== 页面、条目定义 ============================================================== */    \n/* No page definitions */"
-        
-        lines = ["/* ============================================================== 页面、条目定义 ============================================================== */    "]
-        
-        # 按照树形结构排序：先按父页面，再按缩进级别
-        # 首先构建页面树
-        page_tree = {}
-        for definition in self.page_definitions:
-            parent = definition.get("parent")  # Don't default to "" since parent might be None
-            if parent is None:
-                parent = ""
-            if parent not in page_tree:
-                page_tree[parent] = []
-            page_tree[parent].append(definition)
-        
-        # 递归生成树形结构
-        def generate_tree(parent_var, indent_level):
-            if parent_var not in page_tree:
-                return []
-            
-            tree_lines = []
-            for definition in page_tree[parent_var]:
-                item_type = definition.get("type", "")
-                var_name = definition.get("var_name", "")
-                indent_str = "    " * indent_level
-                
-                if item_type and var_name:
-                    tree_lines.append(f"{indent_str}{item_type} {var_name};")
-                    
-                    # 递归处理子页面 - handle all page types that can have children
-                    if item_type in ["Ordinary_Page", "Show_Page"]:
-                        # 普通页面和展示页面可能有子条目
-                        child_lines = generate_tree(var_name, indent_level + 1)
-                        tree_lines.extend(child_lines)
-            
-            return tree_lines
-        
-        # 从根节点开始生成（父页面为None或空字符串）
-        root_lines = generate_tree("", 0)
-        lines.extend(root_lines)
-        
-        return "\n".join(lines)
-    
-    def generateEnumLists(self):
-        """生成枚举列表部分"""
-        if not self.enum_definitions:
-            return "/* ================================================================= 枚举列表 ================================================================= */\n/* No enum definitions */"
-        
-        lines = ["/* ================================================================= 枚举列表 ================================================================= */"]
-        
-        for enum_def in self.enum_definitions:
-            var_name = enum_def.get("var_name", "")
-            strings = enum_def.get("strings", [])
-            
-            if var_name and strings:
-                # 生成数组定义
-                lines.append(f'char *{var_name}[{len(strings)}] = {{')
-                
-                # 添加每个字符串
-                for i, string in enumerate(strings):
-                    if i < len(strings) - 1:
-                        lines.append(f'    "{string}",')
-                    else:
-                        lines.append(f'    "{string}"')
-                
-                lines.append("};")
-                lines.append("")  # 空行分隔
-        
-        return "\n".join(lines)
-    
-    def generateItemCallbacks(self):
-        """生成回调函数（条目）部分"""
-        if not self.item_callbacks:
-            return "/* ============================================================== 回调函数（条目） ============================================================ */\n/* No item callbacks */"
-        
-        lines = ["/* ============================================================== 回调函数（条目） ============================================================ */"]
-        
-        for callback in self.item_callbacks:
-            item_type = callback.get("item_type", "")
-            callback_name = callback.get("callback_name", "")
-            properties = callback.get("properties", {})
-            
-            if not callback_name:
-                continue
-            
-            # 根据条目类型生成不同的函数签名
-            if item_type == "开关条目":
-                lines.append(f"void {callback_name}(unsigned char data)")
-                lines.append("{")
-                lines.append("    /* USER CODE BEGIN */")
-                lines.append("")
-                lines.append("    /* USER CODE END */")
-                lines.append("}")
-                lines.append("")
-            
-            elif item_type == "数据条目":
-                var_type = properties.get("变量类型", "uint8_val")
-                # 根据变量类型生成注释
-                type_comment_map = {
-                    "uint8_val": "// *((unsigned char*)data)",
-                    "int8_val": "// *((signed char*)data)",
-                    "uint16_val": "// *((unsigned short int*)data)",
-                    "int16_val": "// *((signed short int*)data)",
-                    "uint32_val": "// *((unsigned int*)data)",
-                    "int32_val": "// *((signed int*)data)",
-                    "float_val": "// *((float*)data)"
-                }
-                comment = type_comment_map.get(var_type, "// *((unsigned char*)data)")
-                
-                lines.append(f"void {callback_name}(void *data) {comment}")
-                lines.append("{")
-                lines.append("    /* USER CODE BEGIN */")
-                lines.append("")
-                lines.append("    /* USER CODE END */")
-                lines.append("}")
-                lines.append("")
-            
-            elif item_type == "枚举条目":
-                lines.append(f"void {callback_name}(char *str)")
-                lines.append("{")
-                lines.append("    /* USER CODE BEGIN */")
-                lines.append("")
-                lines.append("    /* USER CODE END */")
-                lines.append("}")
-                lines.append("")
-            
-            elif item_type == "展示条目":
-                lines.append(f"void {callback_name}(void)")
-                lines.append("{")
-                lines.append("    /* USER CODE BEGIN */")
-                lines.append("")
-                lines.append("    /* USER CODE END */")
-                lines.append("}")
-                lines.append("")
-            
-            elif item_type == "文本条目":
-                lines.append(f"void {callback_name}(char *str)")
-                lines.append("{")
-                lines.append("    /* USER CODE BEGIN */")
-                lines.append("")
-                lines.append("    /* USER CODE END */")
-                lines.append("}")
-                lines.append("")
-        
-        return "\n".join(lines)
-    
-    def generatePageCallbacks(self):
-        """生成回调函数（页面）部分"""
-        if not self.page_callbacks:
-            return "/* ============================================================== 回调函数（页面） ============================================================ */\n/* No page callbacks */"
-        
-        lines = ["/* ============================================================== 回调函数（页面） ============================================================ */"]
-        
-        # 添加私有变量部分（如果有展示页面）
-        show_pages = [defn for defn in self.page_definitions if defn.get("type") == "Show_Page"]
-        if show_pages:
-            lines.append("/* Private variables ---------------------------------------------------------*/")
-            lines.append("/* USER CODE VALUE BEGIN */")
-            lines.append("/* USER CODE VALUE END */")
-            lines.append("/* Private function ----------------------------------------------------------*/")
-        
-        # 生成每个页面回调函数
-        for callback in self.page_callbacks:
-            callback_name = callback.get("callback_name", "")
-            callback_type = callback.get("callback_type", "")
-            
-            if not callback_name:
-                continue
-            
-            # 根据回调类型生成函数
-            if callback_type == "enter":
-                lines.append(f"void {callback_name}(void)")
-                lines.append("{")
-                lines.append("    /* USER CODE BEGIN */")
-                lines.append("")
-                lines.append("    /* USER CODE END */")
-                lines.append("}")
-                lines.append("")
-            elif callback_type == "period":
-                lines.append(f"void {callback_name}(void* temp, Easy_Menu_Input_TYPE user_input)")
-                lines.append("{")
-                lines.append("    /* USER CODE BEGIN */")
-                lines.append("")
-                lines.append("    /* USER CODE END */")
-                lines.append("}")
-                lines.append("")
-            elif callback_type == "exit":
-                lines.append(f"void {callback_name}(void)")
-                lines.append("{")
-                lines.append("    /* USER CODE BEGIN */")
-                lines.append("")
-                lines.append("    /* USER CODE END */")
-                lines.append("}")
-                lines.append("")
-        
-        return "\n".join(lines)
-    
-    def generateSetupLists(self):
-        """生成设置列表（普通页面）部分"""
-        if not self.setup_lists:
-            return "/* =========================================================== 设置列表（普通页面） =========================================================== */\n/* No setup lists */"
-        
-        lines = ["/* =========================================================== 设置列表（普通页面） =========================================================== */"]
-        
-        # 为每个普通页面生成设置列表
-        for page_var, page_info in self.setup_lists.items():
-            display_name = page_info.get("display_name", "")
-            items = page_info.get("items", [])
-            item_count = page_info.get("item_count", 0)
-            
-            if item_count > 0:
-                # 生成数组定义
-                lines.append(f"Item *{page_var}_items[{item_count}] = {{")
-                
-                # 添加每个条目
-                for i, item in enumerate(items):
-                    item_var = item.get("var_name", "")
-                    if item_var:
-                        if i < item_count - 1:
-                            lines.append(f"    ITEM({item_var}),")
-                        else:
-                            lines.append(f"    ITEM({item_var})")
-                
-                lines.append("};")
-                lines.append("")  # 空行分隔
-        
-        return "\n".join(lines)
-    
     def newConfig(self):
         """新建配置，回到初始状态"""
         # 检查是否有未保存的更改
@@ -2462,13 +1740,16 @@ class MainWindow(QMainWindow):
                 # 构建树形结构数据
                 tree_data = self.buildTreeData()
                 
-                # 保存JSON文件
-                with open(json_file_path, 'w', encoding=self.encoding_setting) as f:
-                    json.dump(tree_data, f, ensure_ascii=False, indent=2)
-                
-                self.statusBar().showMessage(f"配置已保存到: {json_file_path}")
-                QMessageBox.information(self, "保存成功", 
-                    f"配置已成功保存到:\n{json_file_path}")
+                # 保存JSON文件（内容未变化时不改写）
+                if write_text_if_changed(json_file_path, json.dumps(tree_data, ensure_ascii=False, indent=2),
+                                         self.encoding_setting):
+                    self.statusBar().showMessage(f"配置已保存到: {json_file_path}")
+                    QMessageBox.information(self, "保存成功", 
+                        f"配置已成功保存到:\n{json_file_path}")
+                else:
+                    self.statusBar().showMessage(f"配置未变化: {json_file_path}")
+                    QMessageBox.information(self, "保存成功", 
+                        f"配置未变化，文件未改写:\n{json_file_path}")
                 
             except Exception as e:
                 self.statusBar().showMessage(f"保存失败: {str(e)}")
@@ -2525,200 +1806,202 @@ class MainWindow(QMainWindow):
         
         dialog.exec()
 
-    def applyEncodingSetting(self, encoding, dialog):
-        """应用编码设置""" 
-        self.encoding_setting = encoding
-        dialog.close()
-        self.statusBar().showMessage(f"编码设置已更改为: {encoding}")
-
-    def generateSystemInit(self):
-        """生成系统初始化部分"""
-        lines = ["/* ================================================================ 系统初始化 ================================================================ */"]
-        lines.append("void Easy_Menu_Ui_Init(void)")
-        lines.append("{")
-        
-        # 按原始顺序处理所有页面和条目初始化（保持配置顺序）
-        for definition in self.page_definitions:
-            item_type = definition.get("type", "")
-            var_name = definition.get("var_name", "")
-            display_name = definition.get("display_name", "")
-            parent = definition.get("parent", "")
-            properties = definition.get("properties", {})
-            
-            if item_type == "Show_Page":
-                # 展示页面初始化
-                period = properties.get("周期", "100")
-                # Look up the properly formatted callback names from collected page callbacks
-                enter_callback = "NULL"  # Default to NULL
-                period_callback = "NULL"  # Default to NULL
-                exit_callback = "NULL"  # Default to NULL
-                
-                # Find the properly formatted callback names
-                for callback in self.page_callbacks:
-                    if callback.get("page_var") == var_name:
-                        callback_type = callback.get("callback_type")
-                        callback_name = callback.get("callback_name", f"{var_name}_Callback")
-                        if callback_type == "enter":
-                            enter_callback = callback_name
-                        elif callback_type == "period":
-                            period_callback = callback_name
-                        elif callback_type == "exit":
-                            exit_callback = callback_name
-                
-                parent_page = f"PAGE({parent})" if parent else "NULL"
-                
-                lines.append(f"\n    Show_Page_Init({parent_page}, PAGE({var_name}), \"{display_name}\", {period}, {enter_callback}, {period_callback}, {exit_callback});")
-            
-            elif item_type == "Ordinary_Page":
-                # 普通页面初始化
-                parent_page = f"PAGE({parent})" if parent else "NULL"
-                items_array = f"{var_name}_items"
-                item_count = len(self.setup_lists.get(var_name, {}).get("items", [])) if var_name in self.setup_lists else 0
-                
-                lines.append(f"\n    Ordinary_Page_Init({parent_page}, PAGE({var_name}), \"{display_name}\", {items_array}, {item_count});")
-            
-            elif item_type == "Goto_Item":
-                # 跳转条目初始化
-                target_page = definition.get("target_page", "")
-                if target_page and target_page != "NULL":
-                    lines.append(f"        Goto_Item_Init(PAGE({parent}), ITEM({var_name}), \"{display_name}\", PAGE({target_page}));")
-                else:
-                    # 当目标页面为 NULL 时，应使用 NULL 而不是 PAGE(NULL)
-                    lines.append(f"        Goto_Item_Init(PAGE({parent}), ITEM({var_name}), \"{display_name}\", NULL);")
-            
-            elif item_type == "Text_Item":
-                # 文本条目初始化
-                callback_name = None
-                # 检查是否有回调函数
-                for callback in self.item_callbacks:
-                    if callback.get("parent_page") == parent and callback.get("item_var") == var_name:
-                        callback_name = callback.get("callback_name")
-                        break
-                    
-                callback = callback_name if callback_name else "NULL"
-                lines.append(f"        Text_Item_Init(PAGE({parent}), ITEM({var_name}), \"{display_name}\", {callback});")
-            
-            elif item_type == "Switch_Item":
-                # 开关条目初始化
-                data_var = properties.get("数据变量名", "")
-                callback_name = None
-                # 检查是否有回调函数
-                for callback in self.item_callbacks:
-                    if callback.get("parent_page") == parent and callback.get("item_var") == var_name:
-                        callback_name = callback.get("callback_name")
-                        break
-                    
-                callback = callback_name if callback_name else "NULL"
-                if data_var:
-                    lines.append(f"        Switch_Item_Init(PAGE({parent}), ITEM({var_name}), \"{display_name}\", &Easy_Menu_Ui_Data.{data_var}, {callback});")
-            
-            elif item_type == "Data_Item":
-                # 数据条目初始化
-                data_var = properties.get("数据变量名", "")
-                var_type = properties.get("变量类型", "uint8_val")
-                step = properties.get("步进", "1")
-                min_val = properties.get("最小值", "NULL")
-                max_val = properties.get("最大值", "NULL")
-                callback_name = None
-                    
-                # 检查是否有回调函数
-                for callback in self.item_callbacks:
-                    if callback.get("parent_page") == parent and callback.get("item_var") == var_name:
-                        callback_name = callback.get("callback_name")
-                        break
-                    
-                # 映射变量类型到Easy_Menu类型
-                type_map = {
-                    "uint8_val": "UNSIGNED_CHAR",
-                    "int8_val": "SIGNED_CHAR",
-                    "uint16_val": "UNSIGNED_SHORT_INT",
-                    "int16_val": "SIGNED_SHORT_INT",
-                    "uint32_val": "UNSIGNED_INT",
-                    "int32_val": "SIGNED_INT",
-                    "float_val": "FLOAT"
-                }
-                easy_menu_type = type_map.get(var_type, "UNSIGNED_CHAR")
-                    
-                callback = callback_name if callback_name else "NULL"
-                if data_var:
-                    # Format the min/max values according to reference file format
-                    formatted_min_val = f"{easy_menu_type}_VAL({min_val})" if min_val != "NULL" else f"{easy_menu_type}_VAL(0)"
-                    formatted_max_val = f"{easy_menu_type}_VAL({max_val})" if max_val != "NULL" else f"{easy_menu_type}_VAL(0)"
-                    # Check if min/max values are set to determine enable flags
-                    min_enable_flag = 1 if min_val != "NULL" else 0
-                    max_enable_flag = 1 if max_val != "NULL" else 0
-                    lines.append(f"        Data_Item_Init(PAGE({parent}), ITEM({var_name}), \"{display_name}\", {easy_menu_type}, &Easy_Menu_Ui_Data.{data_var}, {easy_menu_type}_VAL({step}), 1, {formatted_min_val}, {min_enable_flag}, {formatted_max_val}, {max_enable_flag}, {callback});")
-            
-            elif item_type == "Enum_Item":
-                # 枚举条目初始化
-                enum_count = properties.get("枚举数量", "1")
-                enum_strings = properties.get("枚举字符串", [])
-                callback_name = None
-                    
-                # 检查是否有回调函数
-                for callback in self.item_callbacks:
-                    if callback.get("parent_page") == parent and callback.get("item_var") == var_name:
-                        callback_name = callback.get("callback_name")
-                        break
-                    
-                # 查找对应的枚举数组
-                enum_array_name = None
-                for enum_def in self.enum_definitions:
-                    if var_name in enum_def.get("var_name", ""):
-                        enum_array_name = enum_def.get("var_name")
-                        break
-                    
-                if enum_array_name:
-                    callback = callback_name if callback_name else "NULL"
-                    lines.append(f"        Enum_Item_Init(PAGE({parent}), ITEM({var_name}), \"{display_name}\", {enum_array_name}, {enum_count}, {callback});")
+    def generateGlyphs(self):
+        """选择完整的中文字库，只取出菜单用到的字符生成字形表，输出到配置文件所在目录"""
+        font_path, _ = QFileDialog.getOpenFileName(self, "选择中文字库", self.import_dir or "",
+                                                   "字库文件 (*.bdf HZK* *.bin *.dzk);;所有文件 (*)")
+        if not font_path:
+            return
+        # 点阵大小须与字库一致（与命令行的 --glyph-size 相同），可以选择常见大小或直接输入
+        sizes = list(GLYPH_SIZES) if self.glyph_size in GLYPH_SIZES else [self.glyph_size, *GLYPH_SIZES]
+        glyph_size, ok = QInputDialog.getItem(self, "点阵大小", "字库中文字符的点阵大小（宽x高）:",
+                                              sizes, sizes.index(self.glyph_size), True)
+        if not ok:
+            return
+        output_dir = self.import_dir or QFileDialog.getExistingDirectory(self, "选择输出目录")
+        if not output_dir:
+            return
+        
+        try:
+            width, height = parse_glyph_size(glyph_size)
+            self.glyph_size = glyph_size.strip().lower()
+            generator = MenuCodeGenerator(self.generate_options)
+            generator.collect(self.buildTreeData())
+            table = build_glyph_table(generator, font_path, width, height)
+            write_glyph_files(table, output_dir, self.encoding_setting)
+        except (OSError, ValueError) as e:
+            self.statusBar().showMessage(f"裁剪字库失败: {str(e)}")
+            QMessageBox.critical(self, "裁剪字库失败", f"裁剪字库时发生错误:\n{str(e)}")
+            return
+        self.statusBar().showMessage(f"字形表已生成到: {output_dir}")
+        QMessageBox.information(self, "裁剪字库", f"{GLYPH_FILE_NAME}.c / .h 已生成到:\n{output_dir}\n\n"
+                                f"{format_glyph_report(table)}")
+    
+    def openFootprintDialog(self):
+        """打开空间估算面板：按当前的生成选项和类型大小估算每个页面及其子树占用的 Flash / RAM"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("空间估算")
+        dialog.setGeometry(200, 200, 640, 480)
+        
+        layout = QVBoxLayout()
+        
+        # 类型大小
+        abi_layout = QHBoxLayout()
+        abi_layout.addWidget(QLabel("类型大小:"))
+        abi_edit = QLineEdit(self.abi_spec)
+        abi_edit.setPlaceholderText("默认 32 位 Cortex-M，例如 pointer=8,enum=1 或 Data_Item=40")
+        abi_layout.addWidget(abi_edit)
+        refresh_btn = QPushButton("重新估算")
+        abi_layout.addWidget(refresh_btn)
+        layout.addLayout(abi_layout)
+        
+        # 页面树：自身与子树的占用
+        tree = QTreeWidget()
+        tree.setHeaderLabels(["页面", "Flash", "RAM", "子树 Flash", "子树 RAM"])
+        layout.addWidget(tree)
+        
+        summary_label = QLabel()
+        summary_label.setWordWrap(True)
+        layout.addWidget(summary_label)
+        
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(dialog.accept)
+        layout.addWidget(close_btn)
+        dialog.setLayout(layout)
+        
+        def add_page(parent, estimate, page):
+            own = estimate.pages[page]
+            subtree = subtree_footprint(estimate, page)
+            node = QTreeWidgetItem(parent, [f"{page.display_name} ({page.var_name})",
+                                            str(own.flash_bytes), str(own.ram_bytes),
+                                            str(subtree.flash_bytes), str(subtree.ram_bytes)])
+            for child in page.child_pages:
+                add_page(node, estimate, child)
+        
+        def refresh():
+            try:
+                abi = parse_abi(abi_edit.text())
+            except ValueError as e:
+                summary_label.setText(str(e))
+                return
+            self.abi_spec = abi_edit.text()
+            generator = MenuCodeGenerator(self.generate_options)
+            generator.collect(self.buildTreeData())
+            estimate = estimate_footprint(generator, self.encoding_setting, abi)
             
-            elif item_type == "Show_Item":
-                # 展示条目初始化
-                period = properties.get("周期", "100")
-                data_var = properties.get("数据变量名", "")
-                var_type = properties.get("变量类型", "uint8_val")
-                callback_name = None
-                    
-                # 检查是否有回调函数
-                for callback in self.item_callbacks:
-                    if callback.get("parent_page") == parent and callback.get("item_var") == var_name:
-                        callback_name = callback.get("callback_name")
-                        break
-                    
-                # 映射变量类型到Easy_Menu类型
-                type_map = {
-                    "uint8_val": "UNSIGNED_CHAR",
-                    "int8_val": "SIGNED_CHAR",
-                    "uint16_val": "UNSIGNED_SHORT_INT",
-                    "int16_val": "SIGNED_SHORT_INT",
-                    "uint32_val": "UNSIGNED_INT",
-                    "int32_val": "SIGNED_INT",
-                    "float_val": "FLOAT"
-                }
-                easy_menu_type = type_map.get(var_type, "UNSIGNED_CHAR")
-                    
-                callback = callback_name if callback_name else "NULL"
-                if data_var:
-                    lines.append(f"        Show_Item_Init(PAGE({parent}), ITEM({var_name}), \"{display_name}\", {easy_menu_type}, &Easy_Menu_Ui_Data.{data_var}, {period}, {callback});")
+            tree.clear()
+            for root in estimate.roots:
+                add_page(tree, estimate, root)
+            QTreeWidgetItem(tree, ["(Easy_Menu_Ui_Data 填充与开关字节)", str(estimate.shared.flash_bytes),
+                                   str(estimate.shared.ram_bytes), "", ""])
+            tree.expandAll()
+            for column in range(tree.columnCount()):
+                tree.resizeColumnToContents(column)
             
+            total = total_footprint(estimate)
+            categories = "，".join(f"{name} {total.flash[category]} / {total.ram[category]}"
+                                   for category, name in FOOTPRINT_CATEGORIES.items())
+            summary_label.setText(f"合计: Flash 约 {total.flash_bytes} 字节，RAM 约 {total.ram_bytes} 字节\n"
+                                  f"按类别（Flash / RAM）: {categories}\n"
+                                  "有初值的 RAM 数据在 Flash 中另有一份初值，已计入 Flash；不含菜单框架与回调函数的代码")
+        
+        refresh_btn.clicked.connect(refresh)
+        abi_edit.returnPressed.connect(refresh)
+        refresh()
+        dialog.exec()
+
+    def openPeriodsDialog(self):
+        """打开周期分析面板：按每屏条目行数和代价估算各页面周期刷新的 CPU 负载，标出超出预算的页面"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("周期分析")
+        dialog.setGeometry(200, 200, 720, 480)
         
-        # 获取第一个页面变量作为首页
-        first_page_var = None
-        for definition in self.page_definitions:
-            item_type = definition.get("type", "")
-            if item_type in ["Show_Page", "Ordinary_Page"]:  # 查找第一个页面
-                first_page_var = definition.get("var_name", "")
-                if first_page_var:  # 找到第一个页面就跳出
-                    break
-        
-        # 添加跳转到首页的语句
-        if first_page_var:
-            lines.append(f"    ")
-            lines.append(f"    Easy_Menu_Goto_Page(PAGE({first_page_var}));")
+        layout = QVBoxLayout()
         
-        lines.append("}\n")
+        # 每屏条目行数、代价与预算
+        settings_layout = QHBoxLayout()
+        settings_layout.addWidget(QLabel("每屏条目行数:"))
+        lines_spin = QSpinBox()
+        lines_spin.setRange(1, 255)
+        lines_spin.setValue(self.period_lines)
+        lines_spin.setToolTip("Easy_Menu.h 中的 EASY_MENU_LINE_MAX_NUM，开启标题显示时减 1")
+        settings_layout.addWidget(lines_spin)
+        settings_layout.addWidget(QLabel("代价:"))
+        costs_edit = QLineEdit(self.period_costs_spec)
+        costs_edit.setPlaceholderText("微秒，默认 tick=1000,callback=20,line=30,update=500")
+        settings_layout.addWidget(costs_edit)
+        settings_layout.addWidget(QLabel("预算 (%):"))
+        budget_spin = QSpinBox()
+        budget_spin.setRange(1, 100)
+        budget_spin.setValue(round(self.period_budget))
+        settings_layout.addWidget(budget_spin)
+        refresh_btn = QPushButton("重新分析")
+        settings_layout.addWidget(refresh_btn)
+        layout.addLayout(settings_layout)
+        
+        # 页面：负载最高的窗口；子项：其中的展示条目
+        tree = QTreeWidget()
+        tree.setHeaderLabels(["页面 / 条目", "周期 / 超周期 (tick)", "建议周期", "CPU 负载"])
+        layout.addWidget(tree)
+        
+        summary_label = QLabel()
+        summary_label.setWordWrap(True)
+        layout.addWidget(summary_label)
+        
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(dialog.accept)
+        layout.addWidget(close_btn)
+        dialog.setLayout(layout)
         
-        return "\n".join(lines)
+        def refresh():
+            try:
+                costs = parse_costs(costs_edit.text())
+            except ValueError as e:
+                summary_label.setText(str(e))
+                return
+            self.period_lines = lines_spin.value()
+            self.period_costs_spec = costs_edit.text()
+            self.period_budget = budget_spin.value()
+            generator = MenuCodeGenerator(self.generate_options)
+            generator.collect(self.buildTreeData())
+            schedules = analyze_periods(generator, self.period_lines, costs, self.period_budget)
+            
+            tree.clear()
+            for schedule in schedules:
+                window = schedule.window
+                if window is None:
+                    continue
+                suggested = schedule.suggested_window
+                node = QTreeWidgetItem(tree, [f"{schedule.page.display_name} ({schedule.page.var_name})",
+                                              str(window.hyperperiod),
+                                              str(suggested.hyperperiod) if suggested else "",
+                                              f"{window.load:.2f}%" + (" 超出预算" if schedule.over_budget else "")])
+                for index, item in enumerate(window.items):
+                    new = schedule.suggested[index] if schedule.suggested else window.intervals[index]
+                    QTreeWidgetItem(node, [f"{item.display_name} ({item.var_name})", str(window.intervals[index]),
+                                           str(new) if new != window.intervals[index] else "", ""])
+            tree.expandAll()
+            for column in range(tree.columnCount()):
+                tree.resizeColumnToContents(column)
+            
+            over = [schedule.page.display_name for schedule in schedules if schedule.over_budget]
+            skipped = [item.display_name for schedule in schedules for item in schedule.skipped]
+            summary = [f"超出预算的页面: {'，'.join(over)}" if over else "所有页面都在预算内"]
+            if skipped:
+                summary.append(f"没有回调函数或周期不是整数，不参与分析: {'，'.join(skipped)}")
+            summary_label.setText("\n".join(summary))
+            summary_label.setToolTip(format_period_report(schedules, self.period_lines, costs, self.period_budget))
+        
+        refresh_btn.clicked.connect(refresh)
+        costs_edit.returnPressed.connect(refresh)
+        refresh()
+        dialog.exec()
+
+    def applyEncodingSetting(self, encoding, dialog):
+        """应用编码设置""" 
+        self.encoding_setting = encoding
+        dialog.close()
+        self.statusBar().showMessage(f"编码设置已更改为: {encoding}")
 
 
 def main():
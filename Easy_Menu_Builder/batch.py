@@ -0,0 +1,163 @@
+"""
+Easy Menu - 批量生成
+一次为多个 JSON 配置生成 Easy_Menu_User.c，每个配置在独立的工作进程中完成收集、生成与用户代码合并
+
+命令行用法:
+    python batch.py configs/                  # 目录下（含子目录）的所有 .json 配置，输出到 configs/<配置名>/
+    python batch.py "products/*/*.json" -j 8  # 通配符，-j 指定进程数（默认使用全部核心）
+    python batch.py configs/ --const-init     # 生成选项与 codegen.py 相同，对所有配置生效
+"""
+
+import sys
+import json
+import os
+import glob
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from codegen import (CACHE_DIR_NAME, add_generate_option_arguments, assign_node_ids, default_cache_dir,
+                     generate_c_file, generate_options_from_args, load_config, write_text_if_changed)
+
+
+def find_configs(patterns):
+    """把目录、通配符或文件路径展开为去重后的配置文件列表，目录会递归查找 .json 文件"""
+    configs = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "**", "*.json"), recursive=True)
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        for path in sorted(matches):
+            path = os.path.abspath(path)
+            if CACHE_DIR_NAME in path.split(os.sep):
+                continue
+            if path not in configs:
+                configs.append(path)
+    return configs
+
+
+def output_path(config_path, output_root=None):
+    """
+    配置对应的输出文件 <配置名>/Easy_Menu_User.c：默认位于配置文件所在目录，指定 output_root 时位于 output_root 下
+    同一目录中的多个配置各自输出到以配置名命名的子目录，互不覆盖
+    """
+    basename = os.path.splitext(os.path.basename(config_path))[0]
+    return os.path.join(os.path.abspath(output_root) if output_root else os.path.dirname(config_path),
+                        basename, "Easy_Menu_User.c")
+
+
+def generate_one(config_path, c_file_path, encoding='gb2312', use_cache=True, options=None):
+    """
+    在工作进程中生成一个配置，返回 (配置路径, 输出路径, 是否改写, 耗时秒数, 错误信息)
+    出错时不抛出异常，由错误信息返回给主进程汇总；格式不对的配置在收集时引发的 KeyError、TypeError 等也只记为该配置失败
+    """
+    start = time.perf_counter()
+    try:
+        tree_data = load_config(config_path, encoding)
+        if options is not None and options.anchors and assign_node_ids(tree_data):
+            # 与 codegen.py 相同，节点ID写回配置文件，下次生成时才能对应
+            write_text_if_changed(config_path, json.dumps(tree_data, ensure_ascii=False, indent=2), encoding)
+        os.makedirs(os.path.dirname(c_file_path), exist_ok=True)
+        basename = os.path.splitext(os.path.basename(config_path))[0]
+        cache_dir = default_cache_dir(c_file_path) if use_cache else None
+        changed = generate_c_file(tree_data, c_file_path, basename, encoding, cache_dir, options)
+        error = None
+    except (OSError, ValueError) as e:
+        changed = False
+        error = str(e)
+    except Exception as e:
+        changed = False
+        error = f"{type(e).__name__}: {e}"
+    return config_path, c_file_path, changed, time.perf_counter() - start, error
+
+
+def generate_batch(configs, output_root=None, encoding='gb2312', jobs=None, use_cache=True, report=print, options=None):
+    """
+    并行生成多个配置，每完成一个调用 report 输出一行，返回各配置的结果列表（按完成顺序）
+    所有配置使用同一组生成选项 options（GenerateOptions）
+    多个配置写到同一个输出文件时（指定 output_root 后不同目录中的同名配置），后面的配置记为失败，避免互相覆盖
+    """
+    tasks = []
+    targets = {}
+    results = []
+    for config_path in configs:
+        c_file_path = output_path(config_path, output_root)
+        if c_file_path in targets:
+            error = f"与 {targets[c_file_path]} 同名，输出到同一文件"
+            results.append((config_path, c_file_path, False, 0.0, error))
+            report(f"[失败] {config_path}: {error}")
+            continue
+        targets[c_file_path] = config_path
+        tasks.append((config_path, c_file_path))
+
+    def report_result(result):
+        config_path, c_file_path, changed, seconds, error = result
+        results.append(result)
+        if error:
+            report(f"[失败] {config_path}: {error}")
+        else:
+            state = "已生成" if changed else "未变化"
+            report(f"[{state}] {seconds * 1000:8.1f} ms  {config_path} -> {c_file_path}")
+
+    if jobs == 1 or len(tasks) <= 1:
+        # 只有一个任务时不值得启动进程池
+        for config_path, c_file_path in tasks:
+            report_result(generate_one(config_path, c_file_path, encoding, use_cache, options))
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(generate_one, config_path, c_file_path, encoding, use_cache, options):
+                   (config_path, c_file_path) for config_path, c_file_path in tasks}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # 工作进程异常退出等，generate_one 无法返回结果
+                config_path, c_file_path = futures[future]
+                result = (config_path, c_file_path, False, 0.0, f"{type(e).__name__}: {e}")
+            report_result(result)
+    return results
+
+
+def main(argv=None):
+    """命令行入口"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="easy-menu-batch",
+        description="并行为多个 Easy Menu Builder 配置生成 Easy_Menu_User.c")
+    parser.add_argument("configs", nargs="+", help="配置文件、目录（递归查找 .json）或通配符")
+    parser.add_argument("-o", "--output-root", default=None,
+                        help="输出根目录，每个配置输出到 <输出根目录>/<配置名>/；默认为 <配置文件所在目录>/<配置名>/")
+    parser.add_argument("-e", "--encoding", default="gb2312", choices=["gb2312", "utf-8"],
+                        help="文件编码（默认 gb2312）")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="工作进程数，默认为 CPU 核心数")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"不使用增量生成缓存（{CACHE_DIR_NAME}）")
+    add_generate_option_arguments(parser)
+    args = parser.parse_args(argv)
+    options = generate_options_from_args(parser, args)
+
+    configs = find_configs(args.configs)
+    if not configs:
+        print("没有找到配置文件", file=sys.stderr)
+        return 1
+
+    jobs = args.jobs or os.cpu_count() or 1
+    print(f"共 {len(configs)} 个配置，使用 {min(jobs, len(configs))} 个进程")
+    start = time.perf_counter()
+    results = generate_batch(configs, args.output_root, args.encoding, jobs, not args.no_cache, options=options)
+    wall_time = time.perf_counter() - start
+
+    failed = sum(1 for result in results if result[4])
+    changed = sum(1 for result in results if result[2])
+    unchanged = len(results) - failed - changed
+    busy_time = sum(result[3] for result in results)
+    print(f"完成: {changed} 个已生成, {unchanged} 个未变化, {failed} 个失败")
+    print(f"总耗时 {wall_time:.2f} s（各配置耗时合计 {busy_time:.2f} s）")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
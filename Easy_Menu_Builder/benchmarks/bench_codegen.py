@@ -0,0 +1,202 @@
+"""
+代码生成基准测试套件
+用 synth_config 生成不同规模的配置，分别统计 JSON 读写、collectCodeInfo、各 generate* 部分、
+preserve_user_code 以及完整生成文件的耗时、吞吐量（条目/秒）和内存峰值，结果写入 JSON 文件以便跟踪性能变化
+
+用法:
+    python benchmarks/bench_codegen.py                          # small、medium、large 三档
+    python benchmarks/bench_codegen.py -s large xlarge -r 5     # 指定规模与重复次数
+    python benchmarks/bench_codegen.py --baseline old.json      # 与之前的结果比较
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from codegen import MenuCodeGenerator, generate_c_file, load_config, preserve_user_code, write_text_if_changed
+from synth_config import DEFAULT_MIX, count_nodes, make_config
+
+# 规模档位：(层数, 每页子页面数, 每页条目数)
+SCENARIOS = {
+    "small": (2, 4, 8),
+    "medium": (3, 5, 10),
+    "large": (4, 6, 12),
+    "xlarge": (5, 6, 12),
+}
+
+# 单独计时的各部分生成函数
+SECTION_STAGES = [
+    "generateFileHeader",
+    "generatePlaceholderVariables",
+    "generatePageDefinitions",
+    "generateEnumLists",
+    "generateItemCallbacks",
+    "generatePageCallbacks",
+    "generateSetupLists",
+    "generateSystemInit",
+]
+
+ENCODING = 'gb2312'
+
+
+def fill_user_code(content):
+    """模拟用户在每个 USER CODE 块中写入代码"""
+    return content.replace("/* USER CODE BEGIN */\n", "/* USER CODE BEGIN */\n    user_code();\n")
+
+
+def build_stages(tree_data, work_dir):
+    """返回 [(阶段名, 无参函数)]，各函数只执行被测的那一步，准备工作在这里完成"""
+    json_path = os.path.join(work_dir, "config.json")
+    c_file_path = os.path.join(work_dir, "Easy_Menu_User.c")
+    json_text = json.dumps(tree_data, ensure_ascii=False, indent=2)
+
+    generator = MenuCodeGenerator()
+    new_content = generator.generateCFileContent(tree_data, "bench")
+    old_content = fill_user_code(new_content)
+
+    def json_save():
+        # 每次保存前删除旧文件，保证真正写出
+        if os.path.exists(json_path):
+            os.remove(json_path)
+        write_text_if_changed(json_path, json.dumps(tree_data, ensure_ascii=False, indent=2), ENCODING)
+
+    def json_load():
+        load_config(json_path, ENCODING)
+
+    def collect():
+        collector = MenuCodeGenerator()
+        collector.collectCodeInfo(tree_data)
+
+    def section(method_name):
+        method = getattr(generator, method_name)
+        return lambda: "".join(method())
+
+    def merge():
+        preserve_user_code(old_content, new_content)
+
+    def generate_file():
+        with open(c_file_path, 'w', encoding=ENCODING) as f:
+            f.write(old_content)
+        generate_c_file(tree_data, c_file_path, "bench", ENCODING)
+
+    with open(json_path, 'w', encoding=ENCODING) as f:
+        f.write(json_text)
+
+    stages = [("json_save", json_save), ("json_load", json_load), ("collectCodeInfo", collect)]
+    stages += [(method_name, section(method_name)) for method_name in SECTION_STAGES]
+    stages += [("preserve_user_code", merge), ("generate_c_file", generate_file)]
+    return stages
+
+
+def measure(func, repeat):
+    """返回 (最短耗时秒数, 内存峰值字节数)；内存峰值单独运行一次测量，不影响计时"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_scenario(name, depth, fanout, items_per_page, mix, repeat, report=print):
+    """运行一个规模档位的所有阶段，返回结果字典"""
+    tree_data = make_config(depth, fanout, items_per_page, mix)
+    pages, items = count_nodes(tree_data)
+    report(f"\n[{name}] depth={depth} fanout={fanout} items/page={items_per_page}: {pages} pages, {items} items")
+    report(f"{'stage':<30} {'time (ms)':>11} {'items/s':>13} {'peak (KiB)':>12}")
+
+    result = {"scenario": name, "depth": depth, "fanout": fanout, "items_per_page": items_per_page,
+              "mix": mix, "pages": pages, "items": items, "stages": {}}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for stage, func in build_stages(tree_data, work_dir):
+            seconds, peak = measure(func, repeat)
+            throughput = items / seconds if seconds > 0 else None
+            result["stages"][stage] = {"seconds": seconds, "items_per_s": throughput, "peak_bytes": peak}
+            report(f"{stage:<30} {seconds * 1000:>11.2f} {throughput or 0:>13,.0f} {peak / 1024:>12,.0f}")
+    return result
+
+
+def git_commit():
+    """当前代码的提交号，不在 git 仓库中时返回 None"""
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def compare(results, baseline_path, report=print):
+    """与之前保存的结果逐阶段比较耗时，慢 10% 以上的阶段标记出来"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {entry["scenario"]: entry for entry in json.load(f)["results"]}
+    report(f"\n与 {baseline_path} 比较（比值 = 本次耗时 / 基线耗时）")
+    for result in results:
+        old = baseline.get(result["scenario"])
+        if old is None or old["items"] != result["items"]:
+            report(f"[{result['scenario']}] 基线中没有相同规模的结果")
+            continue
+        for stage, data in result["stages"].items():
+            old_stage = old["stages"].get(stage)
+            if not old_stage or not old_stage["seconds"]:
+                continue
+            ratio = data["seconds"] / old_stage["seconds"]
+            flag = "  <-- 变慢" if ratio > 1.1 else ""
+            report(f"[{result['scenario']}] {stage:<30} {ratio:>6.2f}{flag}")
+
+
+def main(argv=None):
+    """命令行入口"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Easy Menu Builder 代码生成基准测试")
+    parser.add_argument("-s", "--scenarios", nargs="+", default=["small", "medium", "large"],
+                        choices=list(SCENARIOS), help="规模档位（默认 small medium large）")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="每个阶段重复次数，取最短耗时（默认 3）")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"条目类型比例（默认 {DEFAULT_MIX}）")
+    parser.add_argument("-o", "--output", default=None,
+                        help="结果文件，默认为 benchmarks/results/codegen-<时间>.json")
+    parser.add_argument("--baseline", default=None, help="与之前保存的结果文件比较")
+    args = parser.parse_args(argv)
+
+    started = datetime.now()
+    results = [run_scenario(name, *SCENARIOS[name], args.mix, args.repeat) for name in args.scenarios]
+
+    output = args.output or os.path.join(BENCH_DIR, "results", f"codegen-{started:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    document = {
+        "benchmark": "codegen",
+        "timestamp": started.isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已保存到: {output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+增量生成基准
+生成一个 10k 条目的菜单并在每个回调函数中填入用户代码，然后修改一个条目，
+分别统计完整重新生成与使用缓存增量生成的耗时，并确认两者结果一致
+每次计时前都从同一份快照复制出新的目录，取最短耗时；增量生成比完整生成快不到 --min-speedup 倍或结果不一致时返回非零
+
+用法:
+    python benchmarks/bench_incremental.py [-n 条目数] [-r 重复次数] [--min-speedup 倍数]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codegen import default_cache_dir, generate_c_file
+from bench_system_init import build_tree
+
+C_FILE_NAME = "Easy_Menu_User.c"
+
+# 修改一个条目后增量生成至少要比完整生成快的倍数：只收集和生成这一个页面，
+# 剩下的耗时主要是读取已有文件、查找用户代码和写出整个文件
+MIN_SPEEDUP = 3.0
+
+
+def fill_user_code(c_file_path):
+    """模拟用户在每个 USER CODE 块中写入代码"""
+    with open(c_file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    content = content.replace("/* USER CODE BEGIN */\n", "/* USER CODE BEGIN */\n    user_code();\n")
+    with open(c_file_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def timed_generate(tree_data, c_file_path, cache_dir=None):
+    start = time.perf_counter()
+    generate_c_file(tree_data, c_file_path, "bench", 'utf-8', cache_dir)
+    return time.perf_counter() - start
+
+
+def best_generate(tree_data, snapshot_dir, work_root, use_cache, repeat):
+    """
+    每次从快照复制出新的目录后生成，返回 (最短耗时, 生成的文件内容)
+    每次的路径都不同，不会沿用上一次读取的已有文件
+    """
+    best = None
+    for index in range(repeat):
+        work_dir = os.path.join(work_root, f"run{index}")
+        shutil.copytree(snapshot_dir, work_dir)
+        c_file_path = os.path.join(work_dir, C_FILE_NAME)
+        seconds = timed_generate(tree_data, c_file_path, default_cache_dir(c_file_path) if use_cache else None)
+        best = seconds if best is None else min(best, seconds)
+    with open(c_file_path, 'r', encoding='utf-8') as f:
+        return best, f.read()
+
+
+def main(argv=None):
+    """命令行入口"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Easy Menu Builder 增量生成基准")
+    parser.add_argument("-n", "--items", type=int, default=10000, help="条目数（默认 10000）")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="重复次数，取最短耗时（默认 5）")
+    parser.add_argument("--min-speedup", type=float, default=MIN_SPEEDUP,
+                        help=f"增量生成至少要比完整生成快的倍数（默认 {MIN_SPEEDUP}）")
+    args = parser.parse_args(argv)
+
+    tree_data = build_tree(args.items)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        full_snapshot = os.path.join(temp_dir, "full")
+        incremental_snapshot = os.path.join(temp_dir, "incremental")
+        os.makedirs(full_snapshot)
+        os.makedirs(incremental_snapshot)
+        full_path = os.path.join(full_snapshot, C_FILE_NAME)
+        incremental_path = os.path.join(incremental_snapshot, C_FILE_NAME)
+
+        first_time = timed_generate(tree_data, incremental_path, default_cache_dir(incremental_path))
+        generate_c_file(tree_data, full_path, "bench", 'utf-8')
+        fill_user_code(full_path)
+        fill_user_code(incremental_path)
+
+        # 修改其中一个条目的显示名称
+        tree_data[0]["children"][0]["children"][0]["name"] += " (edited)"
+
+        full_time, full_content = best_generate(
+            tree_data, full_snapshot, os.path.join(temp_dir, "full-runs"), False, args.repeat)
+        incremental_time, incremental_content = best_generate(
+            tree_data, incremental_snapshot, os.path.join(temp_dir, "incremental-runs"), True, args.repeat)
+
+    speedup = full_time / incremental_time
+    identical = full_content == incremental_content
+    print(f"items: {args.items}, best of {args.repeat}")
+    print(f"first generation (cache cold):  {first_time * 1000:>9.1f} ms")
+    print(f"full regeneration:              {full_time * 1000:>9.1f} ms")
+    print(f"incremental regeneration:       {incremental_time * 1000:>9.1f} ms")
+    print(f"speedup: {speedup:.2f}x, identical output: {identical}")
+    if not identical:
+        print("增量生成的结果与完整生成不一致", file=sys.stderr)
+        return 1
+    if speedup < args.min_speedup:
+        print(f"增量生成只比完整生成快 {speedup:.2f} 倍，低于 {args.min_speedup} 倍", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
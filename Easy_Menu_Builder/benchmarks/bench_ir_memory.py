@@ -0,0 +1,124 @@
+"""
+IR 内存占用对比
+与基准提交中 MainWindow 的收集过程（按字典收集）对比 collect 的耗时、内存峰值和收集结果保留的内存
+基准版本的 collectCodeInfo 及其用到的函数从 git 中取出后单独执行，不需要 PyQt
+
+用法:
+    python benchmarks/bench_ir_memory.py [-n 条目数 ...] [-r 重复次数] [--baseline 提交]
+"""
+
+import ast
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from codegen import MenuCodeGenerator
+from bench_system_init import build_tree
+
+# 改为 IR 之前的提交
+BASELINE_COMMIT = "6a4c708"
+BASELINE_FILE = "Easy_Menu_Builder/Easy_Menu_Builder.py"
+
+# 基准版本中收集过程用到的模块级函数
+BASELINE_FUNCTIONS = ("clean_var_name", "snake_to_camel")
+
+
+def load_baseline_collector(commit):
+    """
+    从 git 中取出基准版本的 MainWindow.collectCodeInfo，返回只含该方法的类
+    与基准版本的 generateCFileContent 一样，收集前清空各集合，收集后删除 _initialized_collections
+    """
+    source = subprocess.run(["git", "show", f"{commit}:{BASELINE_FILE}"], cwd=BENCH_DIR,
+                            capture_output=True, text=True, encoding='utf-8', check=True).stdout
+    module = ast.parse(source)
+    nodes = [node for node in module.body if isinstance(node, ast.FunctionDef) and node.name in BASELINE_FUNCTIONS]
+    main_window = next(node for node in module.body if isinstance(node, ast.ClassDef) and node.name == "MainWindow")
+    method = next(node for node in main_window.body
+                  if isinstance(node, ast.FunctionDef) and node.name == "collectCodeInfo")
+    namespace = {}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), f"{commit}:{BASELINE_FILE}", "exec"), namespace)
+    exec(compile(ast.Module(body=[method], type_ignores=[]), f"{commit}:{BASELINE_FILE}", "exec"), namespace)
+
+    class BaselineCollector:
+        collectCodeInfo = namespace["collectCodeInfo"]
+
+        def collect(self, tree_data):
+            self.page_definitions = []
+            self.enum_definitions = []
+            self.item_callbacks = []
+            self.page_callbacks = []
+            self.setup_lists = {}
+            self.init_code = []
+            self.variables = {}
+            self.collectCodeInfo(tree_data, None, 0)
+            if hasattr(self, '_initialized_collections'):
+                delattr(self, '_initialized_collections')
+
+    return BaselineCollector
+
+
+def measure(func, repeat):
+    """返回 (最短耗时秒数, 内存峰值字节数, 结果保留的字节数)；内存单独运行一次测量，不影响计时"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return best, peak, current
+
+
+def main(argv=None):
+    """命令行入口"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Easy Menu Builder IR 内存占用对比")
+    parser.add_argument("-n", "--items", type=int, nargs="+", default=[1000, 10000, 50000],
+                        help="条目数（默认 1000 10000 50000）")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="计时重复次数，取最短耗时（默认 3）")
+    parser.add_argument("--baseline", default=BASELINE_COMMIT, help=f"对比的提交（默认 {BASELINE_COMMIT}）")
+    args = parser.parse_args(argv)
+
+    try:
+        baseline_collector = load_baseline_collector(args.baseline)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"无法从 git 中取出 {args.baseline}:{BASELINE_FILE}: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{'items':>8} {'layout':>9} {'time (ms)':>10} {'peak (KB)':>10} {'retained (KB)':>14}")
+    for item_count in args.items:
+        tree_data = build_tree(item_count)
+
+        def collect_baseline():
+            collector = baseline_collector()
+            collector.collect(tree_data)
+            return collector
+
+        def collect_ir():
+            generator = MenuCodeGenerator()
+            generator.collect(tree_data)
+            return generator
+
+        results = {}
+        for name, func in [("baseline", collect_baseline), ("IR", collect_ir)]:
+            results[name] = seconds, peak, retained = measure(func, args.repeat)
+            print(f"{item_count:>8} {name:>9} {seconds * 1000:>10.1f} {peak / 1024:>10.0f} {retained / 1024:>14.0f}")
+        (base_time, base_peak, _), (ir_time, ir_peak, _) = results["baseline"], results["IR"]
+        print(f"{'':>8} {'IR/base':>9} {ir_time / base_time:>10.2f} {ir_peak / base_peak:>10.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+用户代码合并基准
+按条目数成倍增加的菜单生成 C 文件，在每个 USER CODE 块中填入用户代码，并把部分条目改名（按类型匹配），
+分别统计 extract_blocks、match_functions 与 preserve_user_code 的耗时和每千行耗时，
+并给出相邻规模间的增长指数（耗时 ∝ 行数^指数，线性时约为 1）
+
+用法:
+    python benchmarks/bench_merge.py                        # 1000 到 16000 个条目
+    python benchmarks/bench_merge.py -n 4000 64000 -r 5     # 指定最小、最大条目数与重复次数
+"""
+
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codegen import MenuCodeGenerator, extract_blocks, match_functions, preserve_user_code
+from bench_system_init import build_tree
+
+# 每隔多少个条目改一个变量名，改名后的回调函数只能按类型匹配
+RENAME_EVERY = 10
+
+
+def fill_user_code(content):
+    """模拟用户在每个 USER CODE 块中写入代码"""
+    return content.replace("/* USER CODE BEGIN */\n", "/* USER CODE BEGIN */\n    user_code();\n    more_code();\n")
+
+
+def rename_items(tree_data):
+    """把每 RENAME_EVERY 个条目中的一个改名"""
+    count = 0
+    for page in tree_data[0]["children"]:
+        for item in page.get("children", []):
+            count += 1
+            if count % RENAME_EVERY == 0:
+                item["properties"]["变量名"] += "_renamed"
+    return tree_data
+
+
+def best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_size(item_count, repeat):
+    """返回 (行数, {阶段: 秒数})"""
+    old_content = fill_user_code(MenuCodeGenerator().generateCFileContent(build_tree(item_count), "bench"))
+    new_content = MenuCodeGenerator().generateCFileContent(rename_items(build_tree(item_count)), "bench")
+    old_funcs = extract_blocks(old_content)[2]
+    new_funcs = extract_blocks(new_content)[2]
+
+    def match():
+        for func in old_funcs + new_funcs:
+            func['used'] = False
+        match_functions(old_funcs, new_funcs)
+
+    merged = preserve_user_code(old_content, new_content)
+    # 改名的函数按类型取回用户代码，合并结果中的用户代码数应与原文件相同
+    assert merged.count("user_code();") == old_content.count("user_code();")
+
+    stages = {
+        "extract_blocks": best_time(lambda: extract_blocks(old_content), repeat),
+        "match_functions": best_time(match, repeat),
+        "preserve_user_code": best_time(lambda: preserve_user_code(old_content, new_content), repeat),
+    }
+    return old_content.count('\n'), stages
+
+
+def main(argv=None):
+    """命令行入口"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Easy Menu Builder 用户代码合并基准")
+    parser.add_argument("-n", "--items", nargs=2, type=int, default=[1000, 16000], metavar=("MIN", "MAX"),
+                        help="最小与最大条目数，每档翻倍（默认 1000 16000）")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="每个阶段重复次数，取最短耗时（默认 3）")
+    args = parser.parse_args(argv)
+
+    sizes = []
+    item_count = args.items[0]
+    while item_count <= args.items[1]:
+        sizes.append(item_count)
+        item_count *= 2
+
+    print(f"{'items':>7} {'lines':>8} {'stage':<20} {'time (ms)':>10} {'us/kline':>10} {'exponent':>9}")
+    previous = None
+    for item_count in sizes:
+        lines, stages = run_size(item_count, args.repeat)
+        for stage, seconds in stages.items():
+            exponent = ""
+            if previous is not None and previous[1][stage] > 0:
+                exponent = f"{math.log(seconds / previous[1][stage]) / math.log(lines / previous[0]):.2f}"
+            print(f"{item_count:>7} {lines:>8} {stage:<20} {seconds * 1000:>10.2f} "
+                  f"{seconds * 1e9 / lines:>10.1f} {exponent:>9}")
+        previous = (lines, stages)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
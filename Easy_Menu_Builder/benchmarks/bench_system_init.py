@@ -0,0 +1,72 @@
+"""
+generateSystemInit 规模基准
+按 100 ~ 50k 个条目构造菜单，统计收集与初始化代码生成的耗时，每条目耗时应基本不变（线性增长）
+
+用法:
+    python benchmarks/bench_system_init.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codegen import MenuCodeGenerator
+
+ITEM_TYPES = ["文本条目", "开关条目", "数据条目", "枚举条目", "展示条目"]
+ITEMS_PER_PAGE = 20
+
+
+def build_tree(item_count):
+    """构造包含 item_count 个条目的菜单，所有条目都开启回调函数"""
+    root = {"name": "Main", "type": "普通页面", "properties": {"变量名": "main_page"}, "children": []}
+    page = None
+    for i in range(item_count):
+        if i % ITEMS_PER_PAGE == 0:
+            page_index = i // ITEMS_PER_PAGE
+            page = {
+                "name": f"Page {page_index}",
+                "type": "普通页面",
+                "properties": {"变量名": f"page_{page_index}"},
+                "children": []
+            }
+            root["children"].append(page)
+            if page_index % 4 == 0:
+                root["children"].append({
+                    "name": f"Show {page_index}",
+                    "type": "展示页面",
+                    "properties": {"变量名": f"show_{page_index}", "周期": "100",
+                                   "进入回调函数": True, "周期回调函数": True, "退出回调函数": True}
+                })
+        item_type = ITEM_TYPES[i % len(ITEM_TYPES)]
+        properties = {"变量名": f"item_{i}", "以父级作为前缀": True, "回调函数": True}
+        if item_type in ["开关条目", "数据条目", "展示条目"]:
+            properties["数据变量名"] = f"item_{i}__data"
+        if item_type == "枚举条目":
+            properties["枚举字符串"] = ["OFF", "LOW", "MID", "HIGH"]
+            properties["枚举数量"] = "4"
+        page["children"].append({"name": f"Item {i}", "type": item_type, "properties": properties})
+    return [root]
+
+
+def main():
+    print(f"{'items':>8} {'collect (ms)':>14} {'init (ms)':>12} {'init us/item':>14}")
+    for item_count in [100, 1000, 5000, 10000, 20000, 50000]:
+        tree_data = build_tree(item_count)
+        generator = MenuCodeGenerator()
+        
+        start = time.perf_counter()
+        generator.collectCodeInfo(tree_data)
+        collect_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for _ in generator.generateSystemInit():
+            pass
+        init_time = time.perf_counter() - start
+        
+        print(f"{item_count:>8} {collect_time * 1000:>14.1f} {init_time * 1000:>12.1f} {init_time * 1e6 / item_count:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,281 @@
+"""
+数值格式化基准测试（主机上运行）
+用 synth_config 生成只含数据、展示条目的单页菜单，分别以 VALUE_FORMAT_MODE 为 0（Easy_Menu_Printf / vsnprintf）
+和 1（按类型的专用格式化函数）编译 menu_core，每次重绘前按字段类型写入新的数值并移动光标，
+统计 Easy_Menu_Display_Refresh 每次重绘的耗时（x86 上同时给出 TSC 周期数），并比较两种方式的显示内容是否一致
+
+用法:
+    python benchmarks/bench_value_format.py                     # integer、float、mixed 三种数值类型
+    python benchmarks/bench_value_format.py -s float -n 50000   # 指定类型与重绘次数
+    python benchmarks/bench_value_format.py --cflags "-Os"      # 指定编译选项
+"""
+
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from codegen import GenerateOptions, MenuCodeGenerator, generate_c_file, value_format_types_expr
+from synth_config import make_config
+from bench_codegen import git_commit
+
+CORE_DIR = os.path.join(os.path.dirname(os.path.dirname(BENCH_DIR)), "menu_core")
+
+# 数值类型档位：数据、展示条目的变量类型
+SCENARIOS = {
+    "integer": ["uint8_val", "int8_val", "uint16_val", "int16_val", "uint32_val", "int32_val"],
+    "float": ["float_val"],
+    "mixed": ["uint8_val", "int16_val", "int32_val", "float_val"],
+}
+
+# 各 C 类型写入的数值：xorshift 随机数 r 的表达式
+VALUE_EXPRESSIONS = {
+    "unsigned char": "(unsigned char)r",
+    "signed char": "(signed char)r",
+    "unsigned short int": "(unsigned short int)r",
+    "signed short int": "(signed short int)r",
+    "unsigned int": "(unsigned int)r",
+    "signed int": "(signed int)r",
+    # 传感器读数一类的数值：-10000.00 ~ 10000.00，带小数
+    "float": "(float)((signed int)(r % 2000001) - 1000000) / 100.0f",
+}
+
+BENCH_MAIN = r'''
+#define _POSIX_C_SOURCE 199309L
+#include "Easy_Menu_User.h"
+#include <stdio.h>
+#include <stdlib.h>
+#include <stdint.h>
+#include <time.h>
+#if defined(__x86_64__) || defined(__i386__)
+#include <x86intrin.h>
+#define HAVE_TSC 1
+#else
+#define HAVE_TSC 0
+#endif
+
+static uint32_t state = 2463534242UL;
+static uint32_t next_random(void)
+{
+    state ^= state << 13;
+    state ^= state >> 17;
+    state ^= state << 5;
+    return state;
+}
+
+static void display_char_line(unsigned short int x, unsigned char line, char ch, unsigned char reverse_flag)
+{
+    (void)x; (void)line; (void)ch; (void)reverse_flag;
+}
+
+static void display_chinese_char_line(unsigned short int x, unsigned char line, char *ch, unsigned char reverse_flag)
+{
+    (void)x; (void)line; (void)ch; (void)reverse_flag;
+}
+
+static void set_values(void)
+{
+    uint32_t r;
+@SET_VALUES@
+}
+
+static unsigned char step;
+
+/* 光标在条目间来回移动，每次重绘显示不同的条目 */
+static void move_cursor(unsigned int tick)
+{
+    Ordinary_Page *page = (Ordinary_Page*)easy_menu.current_page;
+    unsigned char span = page->item_num > 1 ? page->item_num - 1 : 1;
+
+    Easy_Menu_Input(step++ / span % 2 == 0 ? EASY_MENU_DOWN : EASY_MENU_UP);
+    Easy_Menu_Display(tick);
+}
+
+static uint64_t now_ns(void)
+{
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (uint64_t)ts.tv_sec * 1000000000ULL + ts.tv_nsec;
+}
+
+int main(int argc, char **argv)
+{
+    unsigned long redraws = argc > 1 ? strtoul(argv[1], NULL, 10) : 10000;
+    unsigned long checks = argc > 2 ? strtoul(argv[2], NULL, 10) : 2000;
+    unsigned int tick = 0;
+    uint64_t checksum = 1469598103934665603ULL;
+    uint64_t total_ns = 0;
+    uint64_t total_cycles = 0;
+
+    Easy_Menu_Init(NULL, display_char_line, NULL, display_chinese_char_line);
+    Easy_Menu_Display(tick);
+
+    /* 校验：记录每次重绘后的显示内容 */
+    for(unsigned long i = 0; i < checks; i++)
+    {
+        set_values();
+        move_cursor(tick += 10);
+        Easy_Menu_Display_Refresh();
+        for(unsigned char line = 0; line < EASY_MENU_LINE_MAX_NUM; line++)
+            for(unsigned char col = 0; col < EASY_MENU_COL_MAX_NUM; col++)
+                checksum = (checksum ^ (unsigned char)easy_menu.buffer[line][col]) * 1099511628211ULL;
+    }
+
+    /* 计时：只统计 Easy_Menu_Display_Refresh */
+    for(unsigned long i = 0; i < redraws; i++)
+    {
+        set_values();
+        move_cursor(tick += 10);
+
+        uint64_t start = now_ns();
+#if HAVE_TSC
+        uint64_t start_cycles = __rdtsc();
+#endif
+        Easy_Menu_Display_Refresh();
+#if HAVE_TSC
+        total_cycles += __rdtsc() - start_cycles;
+#endif
+        total_ns += now_ns() - start;
+    }
+
+    /* 没有 TSC 时周期数为 -1 */
+    printf("{\"redraws\": %lu, \"ns_per_redraw\": %.1f, \"cycles_per_redraw\": %.1f, \"checksum\": \"%016llx\"}\n",
+           redraws, (double)total_ns / redraws, HAVE_TSC ? (double)total_cycles / redraws : -1.0,
+           (unsigned long long)checksum);
+    return 0;
+}
+'''
+
+
+def make_menu(var_types, items, seed=0):
+    """单页菜单：items 个数据、展示条目，变量类型轮流取 var_types 中的类型"""
+    tree_data = make_config(1, 0, items, "data=1,show=1", show_ratio=0, callback_ratio=0, seed=seed)
+    for index, child in enumerate(tree_data[0]["children"]):
+        child["properties"]["变量类型"] = var_types[index % len(var_types)]
+    return tree_data
+
+
+def set_values_code(generator):
+    """按 Easy_Menu_Ui_Data 各字段的类型写入新数值的语句"""
+    lines = []
+    for name, variable in generator.variables.items():
+        lines.append("    r = next_random();")
+        lines.append(f"    Easy_Menu_Ui_Data.{name} = {VALUE_EXPRESSIONS[variable.c_type]};")
+    return "\n".join(lines) or "    (void)r;"
+
+
+def build(work_dir, tree_data, mode, cc, cflags):
+    """在 work_dir 中以 VALUE_FORMAT_MODE = mode 编译基准程序，返回可执行文件路径"""
+    # Easy_Menu_User.h 中有 Easy_Menu_Ui_Data 的类型与声明，基准程序直接写入其中的字段
+    options = GenerateOptions(value_format=True, user_header=True)
+    generator = MenuCodeGenerator(options)
+    generator.collect(tree_data)
+    types = value_format_types_expr(generator.valueFormatTypes())
+
+    os.makedirs(work_dir)
+    sources = []
+    for file_name in os.listdir(CORE_DIR):
+        if file_name.endswith((".c", ".h")) and file_name != "Easy_Menu_User.c":
+            shutil.copy(os.path.join(CORE_DIR, file_name), work_dir)
+            if file_name.endswith(".c"):
+                sources.append(file_name)
+    header_path = os.path.join(work_dir, "Easy_Menu.h")
+    with open(header_path, 'r', encoding='utf-8') as f:
+        header = f.read()
+    header = header.replace("#define VALUE_FORMAT_MODE   0", f"#define VALUE_FORMAT_MODE   {mode}")
+    header = "\n".join(f"#define VALUE_FORMAT_TYPES  {types}" if line.startswith("#define VALUE_FORMAT_TYPES") else line
+                       for line in header.split("\n"))
+    with open(header_path, 'w', encoding='utf-8') as f:
+        f.write(header)
+
+    generate_c_file(tree_data, os.path.join(work_dir, "Easy_Menu_User.c"), "bench", 'utf-8', None, options)
+    with open(os.path.join(work_dir, "bench_main.c"), 'w', encoding='utf-8') as f:
+        f.write(BENCH_MAIN.replace("@SET_VALUES@", set_values_code(generator)))
+    sources += ["Easy_Menu_User.c", "bench_main.c"]
+
+    binary = os.path.join(work_dir, "bench")
+    subprocess.run([cc, "-std=c99", *cflags.split(), "-o", binary, *sources],
+                   cwd=work_dir, check=True, capture_output=True, text=True)
+    return binary
+
+
+def run_scenario(name, items, redraws, repeat, cc, cflags, report=print):
+    """编译并运行一个数值类型档位的两种格式化方式，返回结果字典"""
+    tree_data = make_menu(SCENARIOS[name], items)
+    result = {"scenario": name, "items": items, "redraws": redraws, "modes": {}}
+    report(f"\n[{name}] {items} items, {', '.join(SCENARIOS[name])}")
+    report(f"{'VALUE_FORMAT_MODE':<20} {'ns/redraw':>12} {'cycles/redraw':>15}")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for mode in (0, 1):
+            binary = build(os.path.join(temp_dir, f"mode{mode}"), tree_data, mode, cc, cflags)
+            best = None
+            for _ in range(repeat):
+                output = subprocess.run([binary, str(redraws)], capture_output=True, text=True, check=True)
+                data = json.loads(output.stdout)
+                if data["cycles_per_redraw"] < 0:
+                    data["cycles_per_redraw"] = None
+                if best is None or data["ns_per_redraw"] < best["ns_per_redraw"]:
+                    best = data
+            result["modes"][mode] = best
+            cycles = best["cycles_per_redraw"]
+            report(f"{mode:<20} {best['ns_per_redraw']:>12.1f} {cycles if cycles is None else f'{cycles:.0f}':>15}")
+
+    plain, fast = result["modes"][0], result["modes"][1]
+    result["speedup"] = plain["ns_per_redraw"] / fast["ns_per_redraw"]
+    result["same_output"] = plain["checksum"] == fast["checksum"]
+    report(f"speedup: {result['speedup']:.2f}x, "
+           f"{'显示内容一致' if result['same_output'] else '显示内容不一致！'}")
+    return result
+
+
+def main(argv=None):
+    """命令行入口"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Easy Menu 数值格式化基准测试（vsnprintf 与专用格式化函数）")
+    parser.add_argument("-s", "--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS),
+                        help="数值类型档位（默认全部）")
+    parser.add_argument("-i", "--items", type=int, default=24, help="条目数（默认 24）")
+    parser.add_argument("-n", "--redraws", type=int, default=20000, help="计时的重绘次数（默认 20000）")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="重复运行次数，取最短耗时（默认 3）")
+    parser.add_argument("--cc", default="gcc", help="C 编译器（默认 gcc）")
+    parser.add_argument("--cflags", default="-O2", help="编译选项（默认 -O2）")
+    parser.add_argument("-o", "--output", default=None,
+                        help="结果文件，默认为 benchmarks/results/value-format-<时间>.json")
+    args = parser.parse_args(argv)
+
+    started = datetime.now()
+    try:
+        results = [run_scenario(name, args.items, args.redraws, args.repeat, args.cc, args.cflags)
+                   for name in args.scenarios]
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"编译或运行失败: {getattr(e, 'stderr', '') or e}", file=sys.stderr)
+        return 1
+
+    output = args.output or os.path.join(BENCH_DIR, "results", f"value-format-{started:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    document = {
+        "benchmark": "value_format",
+        "timestamp": started.isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "platform": platform.platform(),
+        "cc": args.cc,
+        "cflags": args.cflags,
+        "results": results,
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已保存到: {output}")
+    return 0 if all(result["same_output"] for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
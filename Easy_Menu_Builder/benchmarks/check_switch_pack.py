@@ -0,0 +1,196 @@
+"""
+开关按位存放的运行时检查（主机上运行）
+用 synth_config 生成只含开关、数据条目的单页菜单，开关的初始值取 0 ~ 9，并让部分开关与数据条目共用数据变量，
+以 SWITCH_ITEM_BIT_PACK 为 0 编译不按位存放的代码作为基准，再以 SWITCH_ITEM_BIT_PACK 为 1 编译各种生成选项的代码，
+逐个翻转开关，比较每次翻转后的开关状态、回调函数收到的值和屏幕内容是否与基准一致
+（初始值不是 0 / 1 或与其他条目共用的数据变量仍按字节存放，行为应与基准完全相同）
+
+用法:
+    python benchmarks/check_switch_pack.py              # 默认 5 个菜单
+    python benchmarks/check_switch_pack.py -n 20 -v     # 20 个菜单，并输出第一个菜单的运行记录
+    python benchmarks/check_switch_pack.py --cflags "-Os"
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from codegen import GenerateOptions, generate_c_file
+from synth_config import make_config
+
+CORE_DIR = os.path.join(os.path.dirname(os.path.dirname(BENCH_DIR)), "menu_core")
+
+# (SWITCH_ITEM_BIT_PACK, 生成选项)，第一项为基准
+VARIANTS = [
+    (0, GenerateOptions()),
+    (1, GenerateOptions()),
+    (1, GenerateOptions(pack_switches=True)),
+    (1, GenerateOptions(pack_switches=True, const_init=True)),
+    (1, GenerateOptions(pack_switches=True, const_init=True, string_pool=True, sort_data_fields=True)),
+]
+
+# 开关回调函数的开始标记之后写入的用户代码：记录回调函数收到的值
+CALLBACK_BEGIN = re.compile(r'(void \w+\(unsigned char data\)\n\{\n[ \t]*/\* USER CODE BEGIN[^\n]*\*/\n)')
+CALLBACK_TRACE = "    void switch_trace(const char *name, unsigned char data);\n    switch_trace(__func__, data);\n"
+
+CHECK_MAIN = r'''
+#include "Easy_Menu_Core.h"
+#include <stdio.h>
+
+static void display_char_line(unsigned short int x, unsigned char line, char ch, unsigned char reverse_flag)
+{
+    (void)x; (void)line; (void)ch; (void)reverse_flag;
+}
+
+static void display_chinese_char_line(unsigned short int x, unsigned char line, char *ch, unsigned char reverse_flag)
+{
+    (void)x; (void)line; (void)ch; (void)reverse_flag;
+}
+
+void switch_trace(const char *name, unsigned char data)
+{
+    printf("  %s(%u)\n", name, data);
+}
+
+static void print_screen(void)
+{
+    Easy_Menu_Display_Refresh();
+    for(unsigned char line = 0; line < EASY_MENU_LINE_MAX_NUM; line++)
+        printf("  |%.*s|\n", EASY_MENU_COL_MAX_NUM, easy_menu.buffer[line]);
+}
+
+int main(void)
+{
+    Easy_Menu_Init(NULL, display_char_line, NULL, display_chinese_char_line);
+    unsigned int tick = 0;
+    Easy_Menu_Display(tick);
+
+    /* 光标逐个移过首页中的条目，每个开关翻转三次，每次记录状态、回调函数收到的值和屏幕内容 */
+    Ordinary_Page *page = (Ordinary_Page*)easy_menu.current_page;
+    for(unsigned char i = 0; i < page->item_num; i++)
+    {
+        if(i > 0)
+        {
+            Easy_Menu_Input(EASY_MENU_DOWN);
+            Easy_Menu_Display(tick += 10);
+        }
+        Item *item = page->items[i];
+        if(item->type != SWITCH_ITEM)
+            continue;
+        Switch_Item *switch_item = (Switch_Item*)item;
+        printf("%s: %u\n", item->text, (unsigned)SWITCH_ITEM_STATE(switch_item));
+        for(unsigned char k = 0; k < 3; k++)
+        {
+            item->Input(item, EASY_MENU_UP);
+            printf(" -> %u\n", (unsigned)SWITCH_ITEM_STATE(switch_item));
+            print_screen();
+        }
+    }
+    return 0;
+}
+'''
+
+
+def make_menu(items, seed=0):
+    """
+    单页菜单：items 个开关、数据条目；第一个开关的初始值为 8，
+    每隔几个开关改为与前面的数据条目共用数据变量（此时数据变量的初始值为该数据条目的值）
+    """
+    tree_data = make_config(1, 0, items, "switch=3,data=1", show_ratio=0, callback_ratio=1.0, seed=seed)
+    children = tree_data[0]["children"]
+    switches = [child for child in children if child["type"] == "开关条目"]
+    if switches:
+        switches[0]["properties"]["初始值"] = "8"
+    data_var = None
+    for index, child in enumerate(children):
+        if child["type"] == "数据条目":
+            child["properties"]["变量类型"] = "uint8_val"
+            data_var = child["properties"]["数据变量名"]
+        elif data_var is not None and index % 3 == 0:
+            child["properties"]["数据变量名"] = data_var
+            child["properties"].pop("初始值", None)
+    return tree_data
+
+
+def build(work_dir, tree_data, bit_pack, options, cc, cflags):
+    """在 work_dir 中以 SWITCH_ITEM_BIT_PACK = bit_pack 编译检查程序，返回可执行文件路径"""
+    os.makedirs(work_dir)
+    sources = []
+    for file_name in os.listdir(CORE_DIR):
+        if file_name.endswith((".c", ".h")) and file_name != "Easy_Menu_User.c":
+            shutil.copy(os.path.join(CORE_DIR, file_name), work_dir)
+            if file_name.endswith(".c"):
+                sources.append(file_name)
+    header_path = os.path.join(work_dir, "Easy_Menu.h")
+    with open(header_path, 'r', encoding='utf-8') as f:
+        header = f.read()
+    header = header.replace("#define SWITCH_ITEM_BIT_PACK    0", f"#define SWITCH_ITEM_BIT_PACK    {bit_pack}")
+    with open(header_path, 'w', encoding='utf-8') as f:
+        f.write(header)
+
+    c_file_path = os.path.join(work_dir, "Easy_Menu_User.c")
+    generate_c_file(tree_data, c_file_path, "check", 'utf-8', None, options)
+    with open(c_file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    with open(c_file_path, 'w', encoding='utf-8') as f:
+        f.write(CALLBACK_BEGIN.sub(lambda match: match.group(1) + CALLBACK_TRACE, content))
+    with open(os.path.join(work_dir, "check_main.c"), 'w', encoding='utf-8') as f:
+        f.write(CHECK_MAIN)
+    sources += ["Easy_Menu_User.c", "check_main.c"]
+
+    binary = os.path.join(work_dir, "check")
+    subprocess.run([cc, "-std=c99", *cflags.split(), "-o", binary, *sources],
+                   cwd=work_dir, check=True, capture_output=True, text=True)
+    return binary
+
+
+def check_menu(tree_data, cc, cflags, work_dir):
+    """编译并运行各种组合，返回 (基准的运行记录, 与基准不一致的组合列表)"""
+    outputs = []
+    for index, (bit_pack, options) in enumerate(VARIANTS):
+        binary = build(os.path.join(work_dir, f"variant{index}"), tree_data, bit_pack, options, cc, cflags)
+        # 屏幕内容按字节比较（行尾可能截断中文字符）
+        outputs.append(subprocess.run([binary], capture_output=True, check=True).stdout)
+    mismatches = [VARIANTS[index] for index in range(1, len(VARIANTS)) if outputs[index] != outputs[0]]
+    return outputs[0], mismatches
+
+
+def main(argv=None):
+    """命令行入口"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Easy Menu 开关按位存放的运行时检查")
+    parser.add_argument("-n", "--menus", type=int, default=5, help="检查的菜单个数（默认 5）")
+    parser.add_argument("-i", "--items", type=int, default=12, help="每个菜单的条目数（默认 12）")
+    parser.add_argument("-v", "--verbose", action="store_true", help="输出第一个菜单在基准中的运行记录")
+    parser.add_argument("--cc", default="gcc", help="C 编译器（默认 gcc）")
+    parser.add_argument("--cflags", default="-O2", help="编译选项（默认 -O2）")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    try:
+        for seed in range(args.menus):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                trace, mismatches = check_menu(make_menu(args.items, seed), args.cc, args.cflags, temp_dir)
+            if args.verbose and seed == 0:
+                print(trace.decode('utf-8', errors='replace'))
+            for bit_pack, options in mismatches:
+                failures += 1
+                enabled = [name for name, value in options._asdict().items() if value is True]
+                print(f"菜单 {seed}: SWITCH_ITEM_BIT_PACK={bit_pack} {', '.join(enabled) or '默认选项'} 与基准不一致")
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"编译或运行失败: {getattr(e, 'stderr', '') or e}", file=sys.stderr)
+        return 1
+
+    print(f"{args.menus} 个菜单，{len(VARIANTS) - 1} 种组合，{failures} 处与基准不一致")
+    return 0 if failures == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""
+用户代码合并的模糊测试与基准
+每个用例按随机种子生成菜单配置，在每个 USER CODE 块中写入带编号的用户代码，再随机改名、调整顺序、
+开关回调函数、删除与复制节点后重新生成，用 preserve_user_code 合并并检查:
+    1. 用户代码没有重复出现
+    2. 签名不变的函数（开启 --anchors 时为锚点不变的函数）仍是原来的用户代码
+    3. 丢失的用户代码只能是无处可放的：同类型的新函数都已有用户代码（--anchors 时为节点已删除或已关闭回调函数）
+    4. VALUE / PUBLIC 块的用户代码保留；USER CODE 块之外的内容与新生成的文件相同
+    5. generate_c_file（不使用缓存、使用增量缓存两种方式）写出的文件与 preserve_user_code 的结果相同
+各用例在多个进程中并行运行；--bench 另外按条目数成倍增加统计合并耗时与增长指数
+
+用法:
+    python benchmarks/fuzz_merge.py                         # 200 个用例，使用全部核心
+    python benchmarks/fuzz_merge.py -n 2000 -s 100 -j 8     # 从种子 100 开始的 2000 个用例，8 个进程
+    python benchmarks/fuzz_merge.py --anchors               # 开启用户代码锚点
+    python benchmarks/fuzz_merge.py --case 137              # 单独运行一个用例并输出全部问题
+    python benchmarks/fuzz_merge.py -n 0 --bench 10 160     # 只运行基准：每页 10 到 160 个条目
+"""
+
+import copy
+import math
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codegen import (NODE_ID_KEY, GenerateOptions, MenuCodeGenerator, _page_var_name, assign_node_ids,
+                     clean_var_name, default_cache_dir, generate_c_file, get_function_type, index_regions,
+                     preserve_user_code, read_text_file, region_code)
+from synth_config import make_config
+
+BASENAME = "fuzz"
+
+# 各变化的概率（对每个节点）
+RENAME_RATE = 0.08
+TOGGLE_RATE = 0.05
+DELETE_RATE = 0.03
+COPY_RATE = 0.03
+SHUFFLE_RATE = 0.1
+
+# 写入 USER CODE 块的代码片段，混有空行、括号、注释与中文，编号行用于识别每一块代码
+CODE_FILLERS = ["", "    if (data) {", "    }", "    /* 用户注释 */", "    // void helper(void)",
+                "    static int count = 0;", "    count++;"]
+
+USER_CODE_TAG = re.compile(r'user_code_(\d+)\(')
+
+
+def user_code(index, rnd):
+    """第 index 块用户代码：编号行加几行随机内容"""
+    lines = [f"    user_code_{index}();"] + rnd.choices(CODE_FILLERS, k=rnd.randint(0, 3))
+    rnd.shuffle(lines)
+    return "\n".join(lines)
+
+
+def fill_user_code(content, rnd):
+    """在每个 USER CODE 块中写入用户代码，返回 (新内容, 新内容中的块列表)；块为 index_regions 的 UserCodeRegion"""
+    pieces = []
+    pos = 0
+    for index, region in enumerate(index_regions(content)):
+        pieces.append(content[pos:region.start])
+        pieces.append(user_code(index, rnd) + "\n")
+        pos = region.end
+    pieces.append(content[pos:])
+    filled = "".join(pieces)
+    return filled, index_regions(filled)
+
+
+def code_tags(code):
+    """一块代码中的用户代码编号"""
+    return {int(tag) for tag in USER_CODE_TAG.findall(code)}
+
+
+def mutate(tree_data, rnd, anchors):
+    """随机改名、开关回调函数、删除与复制节点、调整顺序，并把跳转条目中已不存在的目标页面改为 NULL"""
+    counter = [0]
+
+    def walk(nodes):
+        for node in list(nodes):
+            properties = node.setdefault("properties", {})
+            roll = rnd.random()
+            if roll < RENAME_RATE:
+                properties["变量名"] = properties.get("变量名", "node") + "_r"
+            elif roll < RENAME_RATE + TOGGLE_RATE:
+                for key in ("回调函数", "进入回调函数", "周期回调函数", "退出回调函数"):
+                    if key in properties:
+                        properties[key] = not properties[key]
+                        break
+            elif roll < RENAME_RATE + TOGGLE_RATE + DELETE_RATE and len(nodes) > 1:
+                nodes.remove(node)
+                continue
+            elif roll < RENAME_RATE + TOGGLE_RATE + DELETE_RATE + COPY_RATE and node.get("type") not in (
+                    "普通页面", "展示页面"):
+                counter[0] += 1
+                duplicate = copy.deepcopy(node)
+                duplicate["properties"]["变量名"] = f"{properties.get('变量名', 'node')}_copy{counter[0]}"
+                duplicate["properties"].pop(NODE_ID_KEY, None)
+                nodes.insert(nodes.index(node) + 1, duplicate)
+            walk(node.get("children", []))
+        if len(nodes) > 1 and rnd.random() < SHUFFLE_RATE:
+            rnd.shuffle(nodes)
+
+    walk(tree_data[0].get("children", []))
+    if anchors:
+        assign_node_ids(tree_data)
+
+    page_names = set()
+
+    def collect_pages(nodes):
+        for node in nodes:
+            if node.get("type") in ("普通页面", "展示页面"):
+                page_names.add(_page_var_name(node.get("name", ""), node.get("properties", {})))
+            collect_pages(node.get("children", []))
+
+    def fix_targets(nodes):
+        for node in nodes:
+            target = node.get("properties", {}).get("目标页面")
+            if target and target != "NULL" and clean_var_name(target) not in page_names:
+                node["properties"]["目标页面"] = "NULL"
+            fix_targets(node.get("children", []))
+
+    collect_pages(tree_data)
+    fix_targets(tree_data)
+    return tree_data
+
+
+def strip_regions(content):
+    """去掉所有 USER CODE 块内的代码，用于比较块之外的内容"""
+    pieces = []
+    pos = 0
+    for region in index_regions(content):
+        pieces.append(content[pos:region.start])
+        pos = region.end
+    pieces.append(content[pos:])
+    return "".join(pieces)
+
+
+def check_merge(old_content, blocks, new_content, merged, anchors):
+    """按模块说明中的规则 1 ~ 4 检查合并结果，返回问题列表"""
+    problems = []
+    old_regions = dict(enumerate(blocks))
+    old_codes = {index: code_tags(region_code(old_content, region)) for index, region in old_regions.items()}
+    merged_regions = index_regions(merged)
+
+    seen = {}
+    for region in merged_regions:
+        for tag in code_tags(region_code(merged, region)):
+            if tag in seen:
+                problems.append(f"用户代码 user_code_{tag} 重复出现在 {seen[tag]} 与 {region.signature or region.kind}")
+            seen[tag] = region.signature or region.kind
+
+    by_key = {}
+    for region in merged_regions:
+        key = (region.kind, region.anchor if anchors and region.anchor else region.signature)
+        by_key.setdefault(key, region)
+    for index, region in old_regions.items():
+        key = (region.kind, region.anchor if anchors and region.anchor else region.signature)
+        target = by_key.get(key)
+        if target is None:
+            continue
+        if code_tags(region_code(merged, target)) != old_codes[index]:
+            name = region.anchor if anchors and region.anchor else (region.signature or region.kind)
+            problems.append(f"{name} 的用户代码没有保留在原处")
+
+    # 丢失的用户代码必须是无处可放的
+    empty_types = {get_function_type(region.signature) for region in merged_regions
+                   if region.kind == '' and not region_code(merged, region).strip()}
+    new_anchors = {region.anchor for region in merged_regions if region.anchor}
+    for index, region in old_regions.items():
+        if old_codes[index] <= set(seen):
+            continue
+        name = region.signature or region.kind
+        if region.kind != '':
+            # VALUE 块只在有页面回调函数时生成
+            if any(new_region.kind == region.kind for new_region in merged_regions):
+                problems.append(f"{region.kind} 块的用户代码丢失")
+        elif anchors and region.anchor:
+            if region.anchor in new_anchors:
+                problems.append(f"{region.anchor} 的用户代码丢失")
+        elif get_function_type(region.signature) in empty_types:
+            problems.append(f"{name} 的用户代码丢失，而同类型的新函数中仍有空的")
+
+    if strip_regions(merged) != strip_regions(new_content):
+        problems.append("USER CODE 块之外的内容与新生成的文件不同")
+    return problems
+
+
+def run_case(seed, anchors=False):
+    """运行一个用例，返回 (种子, 问题列表, 合并耗时秒数)"""
+    rnd = random.Random(seed)
+    options = GenerateOptions(anchors=anchors)
+    tree_data = make_config(depth=rnd.randint(1, 3), fanout=rnd.randint(1, 3), items_per_page=rnd.randint(1, 12),
+                            callback_ratio=rnd.choice([0.3, 0.7, 1.0]), seed=seed)
+    if anchors:
+        assign_node_ids(tree_data)
+
+    work_dir = tempfile.mkdtemp(prefix="easy_menu_fuzz_")
+    try:
+        plain_path = os.path.join(work_dir, "plain", "Easy_Menu_User.c")
+        cached_path = os.path.join(work_dir, "cached", "Easy_Menu_User.c")
+        for path in (plain_path, cached_path):
+            os.makedirs(os.path.dirname(path))
+        generate_c_file(tree_data, cached_path, BASENAME, 'utf-8', default_cache_dir(cached_path), options)
+        old_content, blocks = fill_user_code(read_text_file(cached_path, 'utf-8'), rnd)
+        for path in (plain_path, cached_path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(old_content)
+
+        tree_data = mutate(tree_data, rnd, anchors)
+        new_content = MenuCodeGenerator(options).generateCFileContent(tree_data, BASENAME)
+        start = time.perf_counter()
+        merged = preserve_user_code(old_content, new_content)
+        seconds = time.perf_counter() - start
+
+        problems = check_merge(old_content, blocks, new_content, merged, anchors)
+        generate_c_file(tree_data, plain_path, BASENAME, 'utf-8', None, options)
+        if read_text_file(plain_path, 'utf-8') != merged:
+            problems.append("generate_c_file 的结果与 preserve_user_code 不同")
+        generate_c_file(tree_data, cached_path, BASENAME, 'utf-8', default_cache_dir(cached_path), options)
+        if read_text_file(cached_path, 'utf-8') != merged:
+            problems.append("使用增量缓存时 generate_c_file 的结果与 preserve_user_code 不同")
+    except (OSError, ValueError) as e:
+        problems, seconds = [f"生成失败: {e}"], 0.0
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return seed, problems, seconds
+
+
+def bench_size(items_per_page, repeat):
+    """按每页 items_per_page 个条目（3 层、每页 4 个子页面）统计合并耗时，返回 (每页条目数, 行数, 秒数)"""
+    rnd = random.Random(items_per_page)
+    tree_data = make_config(depth=3, fanout=4, items_per_page=items_per_page, callback_ratio=1.0, seed=0)
+    old_content, _ = fill_user_code(MenuCodeGenerator().generateCFileContent(tree_data, BASENAME), rnd)
+    new_content = MenuCodeGenerator().generateCFileContent(mutate(tree_data, rnd, False), BASENAME)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        preserve_user_code(old_content, new_content)
+        best = min(best, time.perf_counter() - start)
+    return items_per_page, old_content.count('\n'), best
+
+
+def main(argv=None):
+    """命令行入口"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Easy Menu Builder 用户代码合并的模糊测试与基准")
+    parser.add_argument("-n", "--cases", type=int, default=200, help="用例数（默认 200）")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="第一个用例的随机种子（默认 0）")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="工作进程数，默认为 CPU 核心数")
+    parser.add_argument("--anchors", action="store_true", help="开启用户代码锚点（GenerateOptions.anchors）")
+    parser.add_argument("--case", type=int, default=None, metavar="SEED", help="只运行指定种子的用例")
+    parser.add_argument("--bench", nargs=2, type=int, default=None, metavar=("MIN", "MAX"),
+                        help="统计合并耗时：每页条目数从 MIN 成倍增加到 MAX")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="基准中每个规模重复次数，取最短耗时（默认 3）")
+    args = parser.parse_args(argv)
+
+    if args.case is not None:
+        seed, problems, seconds = run_case(args.case, args.anchors)
+        for problem in problems:
+            print(f"  {problem}")
+        print(f"用例 {seed}: {'通过' if not problems else f'{len(problems)} 个问题'}，合并 {seconds * 1000:.1f} ms")
+        return 1 if problems else 0
+
+    sizes = []
+    if args.bench:
+        size = args.bench[0]
+        while size <= args.bench[1]:
+            sizes.append(size)
+            size *= 2
+
+    failed = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        seeds = range(args.seed, args.seed + args.cases)
+        case_results = executor.map(run_case, seeds, [args.anchors] * len(seeds), chunksize=8)
+        bench_futures = [executor.submit(bench_size, size, args.repeat) for size in sizes]
+        merge_seconds = 0.0
+        for seed, problems, seconds in case_results:
+            merge_seconds += seconds
+            if problems:
+                failed += 1
+                print(f"[失败] 用例 {seed}: {problems[0]}" + (f" 等 {len(problems)} 个问题" if len(problems) > 1 else ""))
+        if args.cases:
+            print(f"{args.cases} 个用例，{failed} 个失败，合并共 {merge_seconds * 1000:.0f} ms，"
+                  f"总耗时 {time.perf_counter() - start:.1f} s（用 --case 种子 查看单个用例）")
+
+        if sizes:
+            # 基准与用例在同一进程池中运行，需要稳定的耗时时使用 -n 0 -j 1
+            print(f"{'items/page':>10} {'lines':>8} {'time (ms)':>10} {'us/kline':>10} {'exponent':>9}")
+            previous = None
+            for future in bench_futures:
+                items_per_page, lines, seconds = future.result()
+                exponent = ""
+                if previous is not None and previous[1] > 0:
+                    exponent = f"{math.log(seconds / previous[1]) / math.log(lines / previous[0]):.2f}"
+                print(f"{items_per_page:>10} {lines:>8} {seconds * 1000:>10.2f} {seconds * 1e9 / lines:>10.1f} "
+                      f"{exponent:>9}")
+                previous = (lines, seconds)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
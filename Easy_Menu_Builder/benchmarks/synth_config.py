@@ -0,0 +1,145 @@
+"""
+合成菜单配置生成器
+按层数、每页子页面数和条目类型比例生成与配置器导出格式相同的 JSON 配置，用于基准测试
+
+用法:
+    python benchmarks/synth_config.py -d 4 -f 6 -i 12 -o big.json
+    python benchmarks/synth_config.py -d 3 -f 4 -i 10 --mix text=1,data=3,enum=1,show=2 -e utf-8 -o mix.json
+"""
+
+import json
+import os
+import random
+import sys
+
+# --mix 中使用的类型简称
+TYPE_ALIASES = {
+    "text": "文本条目",
+    "switch": "开关条目",
+    "data": "数据条目",
+    "enum": "枚举条目",
+    "show": "展示条目",
+    "goto": "跳转条目",
+}
+
+DEFAULT_MIX = "text=1,switch=1,data=1,enum=1,show=1,goto=1"
+
+VAR_TYPES = ["uint8_val", "int8_val", "uint16_val", "int16_val", "uint32_val", "int32_val", "float_val"]
+ENUM_CHOICES = [["OFF", "ON"], ["LOW", "MID", "HIGH"], ["Auto", "Manual", "Off", "Test"]]
+
+
+def parse_mix(mix):
+    """解析 "text=1,data=2" 形式的类型比例，返回 (条目类型, 权重) 列表"""
+    weights = []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in TYPE_ALIASES:
+            raise ValueError(f"未知的条目类型: {name}（可选: {', '.join(TYPE_ALIASES)}）")
+        weights.append((TYPE_ALIASES[name], float(weight or 1)))
+    return weights
+
+
+def _item(item_type, index, page_vars, rnd, callback_ratio):
+    """生成一个条目，属性与配置器新建条目时的默认属性一致"""
+    var_name = f"item_{index}"
+    properties = {"变量名": var_name, "以父级作为前缀": True}
+    if item_type != "跳转条目":
+        properties["回调函数"] = rnd.random() < callback_ratio
+    if item_type in ("开关条目", "数据条目", "展示条目"):
+        properties["数据变量名"] = f"{page_vars[-1]}__{var_name}__data"
+        properties["初始值"] = str(rnd.randint(0, 9))
+    if item_type in ("数据条目", "展示条目"):
+        properties["变量类型"] = rnd.choice(VAR_TYPES)
+    if item_type == "数据条目":
+        properties.update({"步进": "1", "最小值": rnd.choice(["NULL", "0"]), "最大值": rnd.choice(["NULL", "100"])})
+    elif item_type == "展示条目":
+        properties["周期"] = str(rnd.choice([20, 50, 100, 200, 500]))
+    elif item_type == "枚举条目":
+        strings = rnd.choice(ENUM_CHOICES)
+        properties.update({"枚举数量": str(len(strings)), "枚举字符串": list(strings)})
+    elif item_type == "跳转条目":
+        properties["目标页面"] = rnd.choice(page_vars)
+    return {"name": f"{item_type} {index}", "type": item_type, "properties": properties}
+
+
+def make_config(depth=3, fanout=4, items_per_page=10, mix=DEFAULT_MIX,
+                show_ratio=0.25, callback_ratio=0.5, seed=0):
+    """
+    生成配置树：一个主菜单，每个普通页面含 items_per_page 个条目和 fanout 个子页面，共 depth 层；
+    每个普通页面以 show_ratio 的概率带一个展示页面，条目以 callback_ratio 的概率开启回调函数
+    """
+    rnd = random.Random(seed)
+    weights = parse_mix(mix) if isinstance(mix, str) else list(mix)
+    item_types = [item_type for item_type, _ in weights]
+    type_weights = [weight for _, weight in weights]
+    page_vars = []
+    counter = [0]
+
+    def make_page(level, path):
+        var_name = "page_" + "_".join(map(str, path)) if path else "main_page"
+        page_vars.append(var_name)
+        page = {"name": f"Page {'.'.join(map(str, path)) or 'Main'}", "type": "普通页面",
+                "properties": {"变量名": var_name, "以父级作为前缀": False}, "children": []}
+        for item_type in rnd.choices(item_types, type_weights, k=items_per_page):
+            counter[0] += 1
+            page["children"].append(_item(item_type, counter[0], page_vars, rnd, callback_ratio))
+        if level + 1 < depth:
+            for index in range(fanout):
+                page["children"].append(make_page(level + 1, path + [index]))
+        if rnd.random() < show_ratio:
+            show_var = f"show_{var_name}"
+            page["children"].append({
+                "name": f"Show {page['name']}", "type": "展示页面",
+                "properties": {"变量名": show_var, "以父级作为前缀": False, "周期": "100",
+                               "进入回调函数": rnd.random() < 0.5, "周期回调函数": True,
+                               "退出回调函数": rnd.random() < 0.5},
+                "children": []})
+        return page
+
+    return [make_page(0, [])]
+
+
+def count_nodes(tree_data):
+    """统计配置树中的页面数与条目数（子页面同时计为父页面的一个条目）"""
+    pages = items = 0
+    for node in tree_data:
+        if node.get("type") in ("普通页面", "展示页面"):
+            pages += 1
+        children = node.get("children", [])
+        if node.get("type") == "普通页面":
+            items += len(children)
+        child_pages, child_items = count_nodes(children)
+        pages += child_pages
+        items += child_items
+    return pages, items
+
+
+def main(argv=None):
+    """命令行入口"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="生成用于基准测试的合成菜单配置")
+    parser.add_argument("-d", "--depth", type=int, default=3, help="页面层数（默认 3）")
+    parser.add_argument("-f", "--fanout", type=int, default=4, help="每个页面的子页面数（默认 4）")
+    parser.add_argument("-i", "--items", type=int, default=10, help="每个页面的条目数（默认 10）")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"条目类型比例（默认 {DEFAULT_MIX}）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("-e", "--encoding", default="gb2312", choices=["gb2312", "utf-8"],
+                        help="文件编码（默认 gb2312）")
+    parser.add_argument("-o", "--output", required=True, help="输出的 JSON 文件路径")
+    args = parser.parse_args(argv)
+
+    tree_data = make_config(args.depth, args.fanout, args.items, args.mix, seed=args.seed)
+    output_dir = os.path.dirname(os.path.abspath(args.output))
+    os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, 'w', encoding=args.encoding) as f:
+        json.dump(tree_data, f, ensure_ascii=False, indent=2)
+
+    pages, items = count_nodes(tree_data)
+    print(f"已生成 {args.output}: {pages} 个页面, {items} 个条目")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
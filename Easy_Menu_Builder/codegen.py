@@ -0,0 +1,2269 @@
+"""
+Easy Menu - C 代码生成器
+不依赖 PyQt6 的代码生成模块，配置器的“生成代码”和命令行共用同一套生成逻辑
+
+命令行用法:
+    python codegen.py config.json -o out/
+"""
+
+import sys
+import json
+import re
+import os
+from enum import IntEnum
+from typing import NamedTuple
+
+from text_layout import DEFAULT_SCREEN_COLUMNS, encode_text, item_text_len, page_text_len, title_offset
+
+# 写出生成文件时使用的缓冲区大小
+WRITE_BUFFER_SIZE = 1 << 16
+
+# 生成缓存目录，位于输出文件旁边
+CACHE_DIR_NAME = ".easy_menu_cache"
+
+
+def clean_var_name(name):
+    """Clean variable name by replacing spaces and special chars"""
+    if not name or name == "NULL":
+        return name
+    return name.replace(" ", "_").replace("-", "_").replace("(", "").replace(")", "")
+
+def snake_to_camel(s):
+    """Convert snake_case to Snake_Camel_Case (underscore separated, capitalized words)"""
+    return "_".join(word.capitalize() for word in s.split("_"))
+
+
+def get_function_type(signature):
+    """Determine function type based on parameters"""
+    if "unsigned char data" in signature:
+        return "switch"
+    elif "void *data" in signature:
+        return "data"
+    elif "char *str" in signature:
+        return "text_enum"
+    elif "void" in signature and "Enter_Callback" in signature:
+        return "page_enter"
+    elif "void" in signature and "Period_Callback" in signature:
+        return "page_period"
+    elif "void" in signature and "Exit_Callback" in signature:
+        return "page_exit"
+    elif "void" in signature and "(" in signature and ")" in signature:
+        # Generic void(void) callback, usually show item
+        return "show_item"
+    return "unknown"
+
+
+# Region markers: /* USER CODE BEGIN */, /* USER CODE VALUE END */, ...; group 1 is the region kind
+# ('' for a function block), group 2 is BEGIN or END, group 3 the anchor of a function block (/* USER CODE BEGIN 1a2b3c4d */)
+USER_CODE_MARKER = re.compile(r'/\* USER CODE (?:(VALUE|PUBLIC) )?(BEGIN|END)(?: ([\w.-]+))? \*/')
+
+
+class UserCodeRegion(NamedTuple):
+    """
+    A marked region found by index_regions. The code is content[start:end] without its last '\n':
+    start is the offset of the line after the BEGIN marker, end the offset of the line holding the END marker
+    """
+    kind: str           # 'VALUE', 'PUBLIC', or '' for a function block
+    start: int
+    end: int
+    signature: str      # Function blocks only: from the 'void (' line to the line containing '{'
+    anchor: str         # Function blocks only: the node id written in the BEGIN marker, '' without one
+
+
+def _line_end(content, pos):
+    """Offset just past the line containing pos (past its '\n')"""
+    newline = content.find('\n', pos)
+    return len(content) if newline == -1 else newline + 1
+
+
+def _find_signature(content, floor, begin_line):
+    """
+    Signature of the function whose /* USER CODE BEGIN */ line starts at begin_line: scans lines backwards,
+    but not before floor (the end of the previous region), for the first line containing 'void' and '('
+    """
+    line_start, line_stop = begin_line, _line_end(content, begin_line)
+    while True:
+        if content.find('void', line_start, line_stop) != -1 and content.find('(', line_start, line_stop) != -1:
+            break
+        if line_start <= floor:
+            return None
+        line_stop = line_start
+        line_start = content.rfind('\n', floor, line_start - 1) + 1
+        line_start = max(line_start, floor)
+    # Header ends at the line containing '{' (normally just above the BEGIN marker)
+    brace = content.find('{', line_start, _line_end(content, begin_line))
+    header_end = _line_end(content, brace if brace != -1 else begin_line)
+    return content[line_start:header_end].strip()
+
+
+def index_regions(content):
+    """
+    Index every marked region of content in one pass, returns a list of UserCodeRegion in file order.
+    A BEGIN marker pairs with the first END marker of the same kind on a later line; markers inside a region,
+    on the rest of a BEGIN or END line, and unpaired END markers are ignored
+    """
+    markers = [(match.start(), match.group(1) or '', match.group(2) == 'BEGIN', match.group(3) or '')
+               for match in USER_CODE_MARKER.finditer(content)]
+    ends = {}               # kind -> END marker offsets, in file order
+    for pos, kind, is_begin, _ in markers:
+        if not is_begin:
+            ends.setdefault(kind, []).append(pos)
+    next_end = dict.fromkeys(ends, 0)   # kind -> index of the next candidate in ends[kind]
+    
+    regions = []
+    cursor = 0              # Markers before cursor were consumed by a previous region or line
+    for pos, kind, is_begin, anchor in markers:
+        if pos < cursor or not is_begin:
+            continue
+        begin_line = content.rfind('\n', 0, pos) + 1
+        start = _line_end(content, pos)
+        
+        kind_ends = ends.get(kind, ())
+        index = next_end.get(kind, 0)
+        while index < len(kind_ends) and kind_ends[index] < start:
+            index += 1
+        next_end[kind] = index
+        
+        signature = ''
+        if kind == '':
+            signature = _find_signature(content, cursor, begin_line)
+        if index == len(kind_ends) or signature is None:
+            # No END marker, or a function block without a signature: skip the BEGIN line
+            cursor = start
+            continue
+        
+        end = content.rfind('\n', 0, kind_ends[index]) + 1
+        regions.append(UserCodeRegion(kind, start, max(end, start), signature, anchor if kind == '' else ''))
+        cursor = _line_end(content, kind_ends[index])
+    return regions
+
+
+def region_code(content, region):
+    """The code inside a region, without the newline before the END marker line"""
+    return content[region.start:max(region.end - 1, region.start)]
+
+
+def extract_blocks(content):
+    """Extract the VALUE block, the PUBLIC block and every USER CODE function block"""
+    value_block = ""
+    public_block = ""
+    functions = []  # List of {sig, code, type}
+    
+    for region in index_regions(content):
+        code = region_code(content, region)
+        if region.kind == 'VALUE':
+            value_block = code
+        elif region.kind == 'PUBLIC':
+            public_block = code
+        else:
+            functions.append({
+                'signature': region.signature,
+                'code': code,
+                'type': get_function_type(region.signature),
+                'anchor': region.anchor,
+                'used': False
+            })
+    return value_block, public_block, functions
+
+
+def match_functions(old_funcs, new_funcs):
+    """
+    Match old function blocks to new ones, returns new signature -> code to inject.
+    Strategy:
+    a. Anchor match: the same node id survives renames, reorders and moves between pages
+    b. Exact signature match
+    c. Type match (sequential), never between two anchored functions (those are different nodes)
+    Each pass takes the first unused old function in file order, looked up through a per-key queue
+    """
+    injection_map = {}
+    
+    def queues(key, funcs):
+        result = {}
+        for old_f in funcs:
+            result.setdefault(old_f.get(key) or '', []).append(old_f)
+        return {value: iter(funcs) for value, funcs in result.items()}
+    
+    def take(queue, key):
+        for old_f in queue.get(key, ()):
+            if not old_f['used']:
+                return old_f
+        return None
+    
+    def inject(new_f, old_f):
+        injection_map[new_f['signature']] = old_f['code']
+        old_f['used'] = True
+        new_f['used'] = True
+    
+    # a. Anchor match
+    by_anchor = queues('anchor', old_funcs)
+    by_anchor.pop('', None)
+    if by_anchor:
+        for new_f in new_funcs:
+            old_f = take(by_anchor, new_f.get('anchor') or '')
+            if old_f is not None:
+                inject(new_f, old_f)
+    
+    # b. Exact match
+    by_signature = queues('signature', old_funcs)
+    for new_f in new_funcs:
+        old_f = take(by_signature, new_f['signature'])
+        if old_f is not None:
+            inject(new_f, old_f)
+    
+    # c. Type match (sequential)
+    by_type = queues('type', old_funcs)
+    # An anchored old function left unmatched belongs to a deleted node; anchored new functions skip it
+    unanchored_by_type = queues('type', [old_f for old_f in old_funcs if not old_f.get('anchor')])
+    for new_f in new_funcs:
+        if not new_f['used']:
+            # For now, trust the type and order.
+            old_f = take(unanchored_by_type if new_f.get('anchor') else by_type, new_f['type'])
+            if old_f is not None:
+                inject(new_f, old_f)
+    
+    return injection_map
+
+
+def iter_preserve_user_code(old_content, new_content):
+    """
+    Yields the merged file as slices of new_content with the preserved user code in between,
+    in one pass over the regions of the new file (see preserve_user_code)
+    """
+    old_value, old_public, old_funcs = extract_blocks(old_content)
+    regions = index_regions(new_content)
+    new_funcs = [{'signature': region.signature, 'type': get_function_type(region.signature),
+                  'anchor': region.anchor, 'used': False}
+                 for region in regions if region.kind == '']
+    injection_map = match_functions(old_funcs, new_funcs)
+    
+    # Region kind -> code replacing the region, None when nothing to replace; only the first region is replaced
+    replacements = {
+        'VALUE': old_value if old_value.strip() else None,
+        'PUBLIC': old_public if old_public.strip() else None,
+    }
+    
+    pos = 0
+    for region in regions:
+        if region.kind:
+            code = replacements[region.kind]
+            replacements[region.kind] = None
+        else:
+            code = injection_map.get(region.signature)
+        if code:
+            yield new_content[pos:region.start]
+            yield code + '\n'
+            pos = region.end
+    yield new_content[pos:]
+
+
+def preserve_user_code(old_content, new_content):
+    """
+    Preserves user code between /* USER CODE BEGIN */ and /* USER CODE END */ markers,
+    as well as between /* USER CODE VALUE BEGIN */ and /* USER CODE VALUE END */ markers,
+    and between /* USER CODE PUBLIC BEGIN */ and /* USER CODE PUBLIC END */ markers.
+    
+    Enhanced to preserve code even when function names change, by matching function types and order.
+    Both files are indexed once (index_regions) and the result is assembled in a single linear pass.
+    """
+    return ''.join(iter_preserve_user_code(old_content, new_content))
+
+
+# ================================================================ 中间表示（IR） ================================================================
+# collectCodeInfo 将配置树整理成下面这些紧凑的结构，各生成函数只读取 IR，不再解析原始属性字典
+
+class ItemKind(IntEnum):
+    """条目类型，顺序与 Easy_Menu.h 中的 ITEM_TYPE 一致"""
+    TEXT = 0
+    SWITCH = 1
+    DATA = 2
+    ENUM = 3
+    SHOW = 4
+    GOTO = 5
+
+
+class PageKind(IntEnum):
+    """页面类型，顺序与 Easy_Menu.h 中的 PAGE_TYPE 一致"""
+    ORDINARY = 0
+    SHOW = 1
+
+
+class VarType(NamedTuple):
+    """数据变量类型：C 类型与 Easy_Menu 的 DATA_TYPE 标记"""
+    c_type: str
+    menu_type: str
+
+
+VAR_TYPES = {
+    "uint8_val": VarType("unsigned char", "UNSIGNED_CHAR"),
+    "int8_val": VarType("signed char", "SIGNED_CHAR"),
+    "uint16_val": VarType("unsigned short int", "UNSIGNED_SHORT_INT"),
+    "int16_val": VarType("signed short int", "SIGNED_SHORT_INT"),
+    "uint32_val": VarType("unsigned int", "UNSIGNED_INT"),
+    "int32_val": VarType("signed int", "SIGNED_INT"),
+    "float_val": VarType("float", "FLOAT"),
+}
+DEFAULT_VAR_TYPE = VAR_TYPES["uint8_val"]
+
+# 配置文件中的条目类型 -> ItemKind（未知类型按文本条目处理）
+ITEM_KINDS = {
+    "文本条目": ItemKind.TEXT,
+    "开关条目": ItemKind.SWITCH,
+    "数据条目": ItemKind.DATA,
+    "枚举条目": ItemKind.ENUM,
+    "展示条目": ItemKind.SHOW,
+    "跳转条目": ItemKind.GOTO,
+}
+
+ITEM_STRUCTS = {
+    ItemKind.TEXT: "Text_Item",
+    ItemKind.SWITCH: "Switch_Item",
+    ItemKind.DATA: "Data_Item",
+    ItemKind.ENUM: "Enum_Item",
+    ItemKind.SHOW: "Show_Item",
+    ItemKind.GOTO: "Goto_Item",
+}
+
+PAGE_STRUCTS = {
+    PageKind.ORDINARY: "Ordinary_Page",
+    PageKind.SHOW: "Show_Page",
+}
+
+
+class PageDef:
+    """页面定义"""
+    __slots__ = ("kind", "var_name", "display_name", "parent", "depth", "items", "child_pages",
+                 "period", "enter_callback", "period_callback", "exit_callback", "node_id")
+
+    def __init__(self, kind, var_name, display_name, parent, depth):
+        self.kind = kind
+        self.var_name = var_name
+        self.display_name = display_name
+        self.parent = parent            # 上级页面变量名，顶层页面为 None
+        self.node_id = None             # 配置中的节点ID（见 assign_node_ids），没有时为 None
+        self.depth = depth              # 在页面树中的层级（用于定义部分的缩进）
+        self.items = []                 # 条目（ItemDef），仅普通页面
+        self.child_pages = []           # 子页面（PageDef）
+        self.period = None              # 以下仅展示页面
+        self.enter_callback = None
+        self.period_callback = None
+        self.exit_callback = None
+
+    @property
+    def struct(self):
+        return PAGE_STRUCTS[self.kind]
+
+
+class ItemDef:
+    """条目定义，未用到的字段为 None"""
+    __slots__ = ("kind", "var_name", "display_name", "parent", "callback", "target_page",
+                 "data_var", "var_type", "step", "min_val", "max_val", "period",
+                 "enum_count", "enum_array", "enum_strings", "node_id")
+
+    def __init__(self, kind, var_name, display_name, parent):
+        self.kind = kind
+        self.var_name = var_name
+        self.display_name = display_name
+        self.parent = parent            # 所属页面变量名
+        self.node_id = None             # 配置中的节点ID
+        self.callback = None            # 回调函数名
+        self.target_page = None         # 跳转条目的目标页面变量名
+        self.data_var = None            # Easy_Menu_Ui_Data 中的数据变量名
+        self.var_type = None            # VarType
+        self.step = None                # 以下为数据条目的步进、最小值、最大值（原样输出）
+        self.min_val = None
+        self.max_val = None
+        self.period = None              # 展示条目周期
+        self.enum_count = None          # 枚举条目数量、枚举数组名与字符串
+        self.enum_array = None
+        self.enum_strings = None
+
+    @property
+    def struct(self):
+        return ITEM_STRUCTS[self.kind]
+
+
+class DataVar(NamedTuple):
+    """Easy_Menu_Ui_Data 中的一个字段"""
+    c_type: str
+    init_value: str
+
+
+class EnumDef(NamedTuple):
+    """枚举字符串数组"""
+    var_name: str
+    strings: list
+
+
+def _page_var_name(name, properties):
+    """页面变量名：优先使用“变量名”属性，否则使用显示名称"""
+    page_var = properties.get("变量名", "")
+    if not page_var:
+        return clean_var_name(name).lower()
+    return clean_var_name(page_var)
+
+
+def _node_id(properties):
+    """节点ID属性，没有或不是有效的锚点（字母、数字、下划线和减号）时返回 None"""
+    node_id = str(properties.get(NODE_ID_KEY) or "")
+    return node_id if NODE_ID_PATTERN.fullmatch(node_id) else None
+
+
+def new_node_id(existing=()):
+    """分配一个新的节点ID（8 位十六进制），不与 existing 中的重复"""
+    import uuid
+    
+    while True:
+        node_id = uuid.uuid4().hex[:8]
+        if node_id not in existing:
+            return node_id
+
+
+def assign_node_ids(tree_data):
+    """
+    为配置树中没有节点ID、节点ID无效或与前面的节点重复（例如手工复制）的节点分配新的节点ID，
+    直接写入各节点的属性，返回分配的个数；已有的节点ID保持不变
+    """
+    nodes = []
+    
+    def walk(nodes_data):
+        for node in nodes_data:
+            nodes.append(node)
+            walk(node.get("children", []))
+    
+    walk(tree_data)
+    taken = {_node_id(node.get("properties", {})) for node in nodes}
+    seen = set()
+    assigned = 0
+    for node in nodes:
+        properties = node.setdefault("properties", {})
+        node_id = _node_id(properties)
+        if node_id is None or node_id in seen:
+            node_id = new_node_id(taken)
+            properties[NODE_ID_KEY] = node_id
+            taken.add(node_id)
+            assigned += 1
+        seen.add(node_id)
+    return assigned
+
+
+def iter_subtree(page):
+    """按先序遍历页面及其所有子页面"""
+    yield page
+    for child in page.child_pages:
+        yield from iter_subtree(child)
+
+
+def unit_init_function(page):
+    """split_pages 模式下顶层页面子树文件的初始化函数名"""
+    return f"Easy_Menu_Ui_Init_{snake_to_camel(page.var_name)}"
+
+
+def unit_file_name(page):
+    """split_pages 模式下顶层页面子树的文件名"""
+    return f"{UNIT_FILE_PREFIX}{page.var_name}.c"
+
+
+def value_format_types_expr(groups):
+    """VALUE_FORMAT_TYPES 的取值表达式"""
+    if not groups:
+        return "0"
+    if len(groups) == 1:
+        return groups[0]
+    return f"({' | '.join(groups)})"
+
+
+def item_num_macro(page):
+    """user_header 模式下普通页面条目数量的宏名"""
+    return f"{page.var_name.upper()}_ITEM_NUM"
+
+
+def _switch_initial_bit(init_value):
+    """
+    开关数据变量的初始值对应的位（0 / 1），不是 0 或 1 时返回 None
+    按字节存放时开关用 ^= 1 切换，初始值为 2 时在 2、3 之间切换，按位存放会改变其行为
+    """
+    try:
+        value = int(init_value, 0)
+    except ValueError:
+        return None
+    return value if value in (0, 1) else None
+
+
+def _format_init_value(var_type_name, initial_value):
+    """浮点数初始值补全 f 后缀"""
+    if var_type_name == "float_val" and not initial_value.endswith('f'):
+        if '.' not in initial_value and initial_value.replace('-', '', 1).isdigit():
+            return initial_value + '.0f'
+        return initial_value + 'f'
+    return initial_value
+
+
+class GenerateOptions(NamedTuple):
+    """代码生成选项，默认值对应原有的生成结果"""
+    # 用指定初始化器静态定义页面、条目和设置列表，代替 Easy_Menu_Ui_Init 中的 *_Init 调用；
+    # 运行时不会修改的条目和设置列表加 const 放入 Flash
+    const_init: bool = False
+    # 所有显示名称与枚举字符串放入同一个字符串池，相同的字符串只保存一次；内容相同的枚举数组由多个条目共用
+    string_pool: bool = False
+    # Easy_Menu_Ui_Data 的字段按对齐从大到小排列，减少字段之间的填充
+    sort_data_fields: bool = False
+    # 只由开关条目使用的数据变量按位存放在 Easy_Menu_Ui_Data 的一个字节数组中（需要 SWITCH_ITEM_BIT_PACK 为 1）
+    pack_switches: bool = False
+    # 每个顶层页面子树生成一个 .c 文件，另外生成共用头文件和只含占位变量、Easy_Menu_Ui_Init 的根文件
+    split_pages: bool = False
+    # 同时生成 Easy_Menu_User.h：Easy_Menu_Ui_Data、页面和条目的 extern 声明以及各页面的条目数量宏
+    user_header: bool = False
+    # const_init 模式下在页面和条目的初始化器中写入预先计算的名称显示长度与标题位置（需要 TEXT_LAYOUT_PRECOMPUTE 为 1），
+    # screen_columns 为每行列数（SCREEN_WIDTH / CHAR_WIDTH），同时用于检查会被截断的名称
+    text_layout: bool = False
+    screen_columns: int = DEFAULT_SCREEN_COLUMNS
+    # 检查 Easy_Menu.h 的 VALUE_FORMAT_TYPES 是否包含数据、展示条目用到的数值类型（VALUE_FORMAT_MODE 为 1 时），
+    # 并给出只含这些类型的设置
+    value_format: bool = False
+    # 生成页面表 Easy_Menu_Page_Table（需要 PAGE_TABLE_MODE 为 1），按序号跳转页面、查找上级和子页面；
+    # user_header 模式下在头文件中给出各页面的序号
+    page_table: bool = False
+    # 在每个回调函数的 /* USER CODE BEGIN */ 标记中写入所属节点的节点ID（锚点），重新生成时按锚点找回用户代码，
+    # 不受改名、调整顺序和移动到其他页面的影响
+    anchors: bool = False
+
+
+# 运行时只在 *_Init 中写入的条目类型，const_init 模式下可以整体放入 Flash
+CONST_ITEM_KINDS = (ItemKind.TEXT, ItemKind.SWITCH, ItemKind.DATA, ItemKind.GOTO)
+
+# 各类型页面、条目在运行时中的类型枚举值与处理函数
+PAGE_TYPE_NAMES = {
+    PageKind.ORDINARY: "ORDINARY_PAGE",
+    PageKind.SHOW: "SHOW_PAGE",
+}
+
+PAGE_HANDLERS = {
+    PageKind.ORDINARY: ("Ordinary_Page_Enter", "Ordinary_Page_Display", "Ordinary_Page_Input", "Ordinary_Page_Exit"),
+    PageKind.SHOW: ("Show_Page_Enter", "Show_Page_Diaplsy", "Show_Page_Input", "Show_Page_Exit"),
+}
+
+ITEM_TYPE_NAMES = {
+    ItemKind.TEXT: "TEXT_ITEM",
+    ItemKind.SWITCH: "SWITCH_ITEM",
+    ItemKind.DATA: "DATA_ITEM",
+    ItemKind.ENUM: "ENUM_ITEM",
+    ItemKind.SHOW: "SHOW_ITEM",
+    ItemKind.GOTO: "GOTO_ITEM",
+}
+
+# 展示条目不设置 Input
+ITEM_INPUT_HANDLERS = {
+    ItemKind.TEXT: "Text_Item_Input",
+    ItemKind.SWITCH: "Switch_Item_Input",
+    ItemKind.DATA: "Data_Item_Input",
+    ItemKind.ENUM: "Enum_Item_Input",
+    ItemKind.GOTO: "Goto_Item_Input",
+}
+
+# Data_Item_Value 联合体中与 DATA_TYPE 对应的成员
+VALUE_FIELDS = {var_type.menu_type: name for name, var_type in VAR_TYPES.items()}
+
+# VALUE_FORMAT_MODE 为 1 时各 DATA_TYPE 使用的格式化函数对应的 VALUE_FORMAT_TYPES 位，按输出顺序排列
+VALUE_FORMAT_GROUPS = {
+    "VALUE_FORMAT_UNSIGNED": ("UNSIGNED_CHAR", "UNSIGNED_SHORT_INT", "UNSIGNED_INT"),
+    "VALUE_FORMAT_SIGNED": ("SIGNED_CHAR", "SIGNED_SHORT_INT", "SIGNED_INT"),
+    "VALUE_FORMAT_FLOAT": ("FLOAT",),
+}
+
+
+# 生成文件的各部分，按输出顺序排列
+SECTIONS = ("header", "variables", "definitions", "enums",
+            "item_callbacks", "page_callbacks", "setup_lists", "init")
+
+# 各部分的标题行，同时用于在已生成的文件中定位各部分
+SECTION_TITLES = {
+    "variables": "/* ================================================================= 占位变量 ================================================================= */\n",
+    "definitions": "/* ============================================================== 页面、条目定义 ============================================================== */    \n",
+    "enums": "/* ================================================================= 枚举列表 ================================================================= */\n",
+    "item_callbacks": "/* ============================================================== 回调函数（条目） ============================================================ */\n",
+    "page_callbacks": "/* ============================================================== 回调函数（页面） ============================================================ */\n",
+    "setup_lists": "/* =========================================================== 设置列表（普通页面） =========================================================== */\n",
+    "init": "/* ================================================================ 系统初始化 ================================================================ */\n",
+}
+
+USER_HEADER_NAME = "Easy_Menu_User.h"
+FILE_PREFIX = f'#include "{USER_HEADER_NAME}"\n\n'
+GENERATED_MARK = "This file is auto-generated by Easy Menu Builder"
+
+# user_header 模式下页面总数、条目总数的宏
+PAGE_NUM_MACRO = "EASY_MENU_PAGE_NUM"
+ITEM_NUM_MACRO = "EASY_MENU_ITEM_NUM"
+
+# page_table 模式：页面序号常量的前缀，以及表示“没有页面”的序号（页面序号保存在 unsigned char 中）
+PAGE_ID_PREFIX = "PAGE_ID_"
+PAGE_ID_NONE = 0xFF
+
+# split_pages 模式：各文件共用的头文件、页面文件名前缀，以及根文件包含的部分
+SPLIT_HEADER_NAME = "Easy_Menu_User_Pages.h"
+SPLIT_FILE_PREFIX = f'#include "{SPLIT_HEADER_NAME}"\n\n'
+UNIT_FILE_PREFIX = "Easy_Menu_User_"
+ROOT_SECTIONS = ("header", "variables", "init")
+ROOT_UNIT = "@root"
+
+# string_pool 模式下字符串池的名称
+STRING_POOL_NAME = "Easy_Menu_Strings"
+
+# pack_switches 模式下存放开关状态的字节数组字段名，以及各开关位序号常量的前缀
+SWITCH_BITS_FIELD = "switch_bits"
+SWITCH_BIT_PREFIX = "SWITCH_BIT_"
+
+# 部分中不属于任何页面的块（标题、结尾等）
+HEAD_BLOCK = "@head"
+TAIL_BLOCK = "@tail"
+
+# user_code 中 PUBLIC / VALUE 用户代码块的键，其余键为函数签名
+USER_PUBLIC = "@public"
+USER_VALUE = "@value"
+
+# 配置中保存节点ID的属性名；节点ID在节点创建时分配，此后不变，用作回调函数用户代码的锚点
+NODE_ID_KEY = "节点ID"
+NODE_ID_PATTERN = re.compile(r'[0-9A-Za-z_-]+')
+
+# 展示页面三个回调函数的锚点后缀
+PAGE_CALLBACK_ROLES = ("enter", "period", "exit")
+
+
+class MenuCodeGenerator:
+    """C 代码生成器，根据配置树生成 Easy_Menu_User.c 的内容"""
+
+    def __init__(self, options=None):
+        self.options = options or GenerateOptions()
+        # split_pages 模式下本生成器输出的文件：None 为单个文件，ROOT_UNIT 为根文件，PageDef 为该顶层页面的子树文件
+        self.unit = None
+        self.reset()
+
+    def reset(self):
+        """清空上一次收集到的信息"""
+        self.pages = []             # 所有页面（PageDef），按配置顺序（先序）排列
+        self.root_pages = []        # 顶层页面
+        self.page_index = {}        # 页面变量名 -> PageDef
+        self.enum_definitions = []  # 枚举定义（EnumDef）
+        self.item_callbacks = []    # 带回调函数的条目（ItemDef）
+        self.variables = {}         # 占位变量：数据变量名 -> DataVar
+        self.basename = None        # 配置文件名，写入文件头
+        self.user_code = {}         # 要填回的用户代码：函数签名 / USER_PUBLIC / USER_VALUE -> 代码
+        self.reused_blocks = {}     # 直接复用的页面块：(部分, 页面变量名 / HEAD_BLOCK / TAIL_BLOCK) -> 文本
+        self.strings = {}           # string_pool 模式：字符串 -> 池中序号
+        self.enum_arrays = {}       # string_pool 模式：枚举字符串元组 -> 共用的数组名
+        self.switch_bits = {}       # pack_switches 模式：按位存放的数据变量名 -> 位序号
+
+    def generateCFileContent(self, tree_data, basename=None):
+        """生成C文件内容"""
+        return "".join(self.iterCFileContent(tree_data, basename))
+    
+    def writeCFile(self, tree_data, file_path, basename=None, encoding='gb2312'):
+        """
+        生成C文件并写入文件，各部分边生成边写出；内容未变化时不改写文件，返回是否改写
+        split_pages 模式下 file_path 为根文件，同时生成共用头文件和各页面文件（见 generate_split_files）；
+        user_header 模式下同时生成同目录下的 Easy_Menu_User.h（见 write_user_header）
+        """
+        if self.options.split_pages:
+            self.collect(tree_data)
+            return any(generate_split_files(self, tree_data, file_path, basename, encoding).values())
+        changed = write_file_if_changed(file_path, self.iterCFileContent(tree_data, basename), encoding)
+        if self.options.user_header:
+            changed = write_user_header(self, file_path, basename, encoding) or changed
+        return changed
+    
+    def collect(self, tree_data):
+        """清空后重新收集整棵配置树的信息"""
+        self.reset()
+        self.collectCodeInfo(tree_data, None, 0)
+        self.resolveGotoTargets()
+        if self.options.anchors:
+            self.checkNodeIds()
+        if self.options.page_table and len(self.pages) >= PAGE_ID_NONE:
+            raise ValueError(f"页面表最多 {PAGE_ID_NONE - 1} 个页面，菜单中有 {len(self.pages)} 个")
+        if self.options.string_pool:
+            self.buildStringPool()
+        if self.options.pack_switches:
+            self.buildSwitchBits()
+    
+    def resolveGotoTargets(self):
+        """建立页面索引并检查跳转条目的目标页面，页面变量名重复或目标页面不存在时抛出 ValueError"""
+        self.page_index = {}
+        duplicates = []
+        for page in self.pages:
+            if page.var_name in self.page_index:
+                duplicates.append(page.var_name)
+            self.page_index.setdefault(page.var_name, page)
+        if duplicates:
+            raise ValueError(f"页面变量名重复: {', '.join(dict.fromkeys(duplicates))}")
+        
+        dangling = [item for page in self.pages for item in page.items
+                    if item.kind == ItemKind.GOTO and item.target_page and item.target_page not in self.page_index]
+        if dangling:
+            details = "，".join(f"{item.var_name}（{item.display_name}）-> {item.target_page}" for item in dangling)
+            raise ValueError(f"跳转条目的目标页面不存在: {details}")
+    
+    def checkNodeIds(self):
+        """anchors 模式：带回调函数的节点的节点ID不能重复，否则无法按锚点区分，重复时抛出 ValueError"""
+        seen = {}
+        duplicates = []
+        for page in self.pages:
+            for node in [page] + page.items:
+                if node.node_id and (node.enter_callback or node.period_callback or node.exit_callback
+                                     if isinstance(node, PageDef) else node.callback):
+                    if node.node_id in seen:
+                        duplicates.append(f"{seen[node.node_id]} / {node.var_name}（{node.node_id}）")
+                    seen.setdefault(node.node_id, node.var_name)
+        if duplicates:
+            raise ValueError(f"节点ID重复: {'，'.join(duplicates)}")
+    
+    def buildStringPool(self):
+        """按页面顺序收集所有显示名称与枚举字符串，内容相同的枚举数组使用第一个条目的数组名"""
+        self.strings = {}
+        self.enum_arrays = {}
+        for page in self.pages:
+            self.strings.setdefault(page.display_name, len(self.strings))
+            for item in page.items:
+                self.strings.setdefault(item.display_name, len(self.strings))
+                if item.enum_array:
+                    for string in item.enum_strings:
+                        self.strings.setdefault(string, len(self.strings))
+                    self.enum_arrays.setdefault(tuple(item.enum_strings), item.enum_array)
+    
+    def buildSwitchBits(self):
+        """
+        为只由开关条目使用、初始值为 0 或 1 的数据变量按配置顺序分配位序号
+        同时被数据、展示条目使用的变量需要完整的字节，初始值为其他值的变量按位存放会改变行为，都仍单独存放
+        """
+        users = {}
+        for page in self.pages:
+            for item in page.items:
+                if item.data_var:
+                    users.setdefault(item.data_var, set()).add(item.kind)
+        
+        self.switch_bits = {}
+        for data_var, kinds in users.items():
+            if kinds == {ItemKind.SWITCH} and _switch_initial_bit(self.variables[data_var].init_value) is not None:
+                self.switch_bits[data_var] = len(self.switch_bits)
+    
+    def splitUnits(self):
+        """
+        split_pages 模式：为每个顶层页面子树建立一个生成器，返回 [(顶层页面, 生成器)]
+        子树生成器与本生成器共用占位变量和开关位序号，字符串池与共用枚举数组在各文件内单独建立
+        """
+        units = []
+        for root in self.root_pages:
+            unit = MenuCodeGenerator(self.options)
+            unit.unit = root
+            unit.pages = list(iter_subtree(root))
+            unit.root_pages = [root]
+            unit.enum_definitions = [EnumDef(item.enum_array, item.enum_strings)
+                                     for page in unit.pages for item in page.items if item.enum_array]
+            unit.item_callbacks = [item for page in unit.pages for item in page.items if item.callback]
+            unit.variables = self.variables
+            unit.switch_bits = self.switch_bits
+            if self.options.string_pool:
+                unit.buildStringPool()
+            units.append((root, unit))
+        return units
+    
+    def nonLocalSections(self):
+        """页面块的内容与其他页面有关的部分（字符串池序号、开关位序号），增量生成时不能按页面复用"""
+        if self.options.string_pool or self.options.pack_switches:
+            return ("init",)
+        return ()
+    
+    def iterCFileContent(self, tree_data, basename=None):
+        """收集信息后逐段生成C文件内容"""
+        # 遍历树形数据，收集信息
+        self.collect(tree_data)
+        return self.iterCollectedContent(basename)
+    
+    def iterCollectedContent(self, basename=None, on_block=None):
+        """
+        按已收集的信息逐段生成C文件内容
+        on_block(部分, 块名, 文本) 在每一块生成后调用，用于记录增量生成的缓存
+        """
+        self.basename = basename
+        prefix = FILE_PREFIX if self.unit is None else SPLIT_FILE_PREFIX
+        if on_block is not None:
+            on_block(SECTIONS[0], HEAD_BLOCK, prefix)
+        yield prefix
+        
+        # 文件头注释、占位变量、页面条目定义、枚举列表、回调函数（条目/页面）、设置列表、系统初始化
+        for section in self.fileSections():
+            for key, text in self.iterSectionBlocks(section):
+                if on_block is not None:
+                    on_block(section, key, text)
+                yield text
+    
+    def iterSectionBlocks(self, section):
+        """
+        逐块生成文件的某一部分，返回 (块名, 文本)
+        块名为页面变量名，不属于页面的开头、结尾为 HEAD_BLOCK / TAIL_BLOCK
+        reused_blocks 中已有的页面块以及开头、结尾直接使用，不再生成
+        """
+        head, page_block, tail = self._sectionParts(section)
+        yield from self._reusedOr(section, HEAD_BLOCK, head)
+        if page_block is not None:
+            for page in self.pages:
+                text = self.reused_blocks.get((section, page.var_name))
+                yield page.var_name, page_block(page) if text is None else text
+        if tail is not None:
+            yield from self._reusedOr(section, TAIL_BLOCK, tail)
+    
+    def _reusedOr(self, section, key, generate):
+        text = self.reused_blocks.get((section, key))
+        if text is not None:
+            yield key, text
+            return
+        for text in generate():
+            yield key, text
+    
+    def fileSections(self):
+        """本文件包含的部分，根文件只有文件头、占位变量和系统初始化"""
+        return ROOT_SECTIONS if self.unit == ROOT_UNIT else SECTIONS
+    
+    def _sectionParts(self, section):
+        """返回某一部分的 (开头, 页面块, 结尾) 生成函数"""
+        if self.unit == ROOT_UNIT and section == "init":
+            return self._rootInitHead, None, self._initTail
+        return {
+            "header": (self._headerHead, None, None),
+            "variables": (self._variablesHead, None, None),
+            "definitions": (self._definitionsHead, self._definitionsBlock, None),
+            "enums": (self._enumsHead, self._enumsBlock, None),
+            "item_callbacks": (self._itemCallbacksHead, self._itemCallbacksBlock, None),
+            "page_callbacks": (self._pageCallbacksHead, self._pageCallbacksBlock, None),
+            "setup_lists": (self._setupListsHead, self._setupListsBlock, None),
+            "init": (self._initHead, self._initBlock, self._initTail),
+        }[section]
+    
+    def _sectionText(self, section):
+        for _, text in self.iterSectionBlocks(section):
+            yield text
+    
+    def generateFileHeader(self):
+        """生成文件头注释"""
+        return self._sectionText("header")
+    
+    def _headerHead(self):
+        if self.basename:
+            public_code = self.user_code.get(USER_PUBLIC)
+            public_body = f"{public_code}\n" if public_code and public_code.strip() else "\n"
+            yield f"""/* Easy Menu User Configuration File */
+/* This file is auto-generated by Easy Menu Builder */
+/* Configuration: {self.basename} */
+
+/* USER CODE PUBLIC BEGIN */
+{public_body}/* USER CODE PUBLIC END */
+
+"""
+        else:
+            yield """/* Easy Menu User Configuration File */
+/* This file is auto-generated by Easy Menu Builder */
+
+
+"""
+    
+    def collectCodeInfo(self, tree_data, parent_page_var=None, depth=0):
+        """收集代码生成所需的信息（调用前需先 reset），返回本层收集到的页面"""
+        collected = []
+        
+        for item_data in tree_data:
+            page = self.collectPage(item_data, parent_page_var, depth)
+            if page is None:
+                # 其他类型的处理
+                continue
+            collected.append(page)
+            children = item_data.get("children", [])
+            
+            if page.kind == PageKind.ORDINARY:
+                # 递归处理子页面
+                for child in children:
+                    if child.get("type") in ["普通页面", "展示页面"]:
+                        page.child_pages.extend(self.collectCodeInfo([child], page.var_name, depth + 1))
+            elif children:
+                # 递归处理子项目
+                page.child_pages.extend(self.collectCodeInfo(children, page.var_name, depth + 1))
+        
+        if parent_page_var is None:
+            self.root_pages.extend(collected)
+        return collected
+    
+    def collectPage(self, item_data, parent_page_var, depth):
+        """
+        收集一个页面节点本身及其条目（不含子页面）并加入 pages，返回 PageDef，不是页面的节点返回 None
+        增量生成时只对有变化的页面调用（见 SectionCache.patch）
+        """
+        item_type = item_data.get("type", "普通页面")
+        item_name = item_data.get("name", "")
+        properties = item_data.get("properties", {})
+        
+        if item_type == "普通页面":
+            page = PageDef(PageKind.ORDINARY, _page_var_name(item_name, properties),
+                           item_name, parent_page_var, depth)
+            page.node_id = _node_id(properties)
+            self.pages.append(page)
+            
+            # 收集子项信息
+            for child in item_data.get("children", []):
+                page.items.append(self._collectItem(page, child))
+            return page
+        
+        if item_type == "展示页面":
+            page = PageDef(PageKind.SHOW, _page_var_name(item_name, properties),
+                           item_name, parent_page_var, depth)
+            page.node_id = _node_id(properties)
+            page.period = properties.get("周期", "100")
+            
+            # 收集页面回调函数信息
+            formatted_page_name = snake_to_camel(page.var_name)
+            if properties.get("进入回调函数"):
+                page.enter_callback = f"{formatted_page_name}_Enter_Callback"
+            if properties.get("周期回调函数"):
+                page.period_callback = f"{formatted_page_name}_Period_Callback"
+            if properties.get("退出回调函数"):
+                page.exit_callback = f"{formatted_page_name}_Exit_Callback"
+            
+            self.pages.append(page)
+            return page
+        return None
+
+    def _collectItem(self, page, child):
+        """收集普通页面下的一个条目"""
+        child_type = child.get("type", "")
+        child_name = child.get("name", "")
+        child_props = child.get("properties", {})
+        
+        # 生成条目变量名
+        use_prefix = child_props.get("以父级作为前缀", True)
+        child_var_prop = child_props.get("变量名", "")
+        if not child_var_prop:
+            # Fallback if empty property
+            # Use display name as variable name base
+            child_var_prop = clean_var_name(child_name).lower()
+        else:
+            child_var_prop = clean_var_name(child_var_prop)
+        
+        if use_prefix:
+            # <所属页面>_<变量名属性中的值>
+            item_var = f"{page.var_name}__{child_var_prop}"
+        else:
+            # 否则直接采用属性中的变量名（全小写）
+            item_var = child_var_prop
+        
+        # 如果是跳转类条目（普通页面、展示页面、跳转条目），为了避免变量名冲突，添加 goto_ 前缀
+        if child_type in ["普通页面", "展示页面"]:
+            # 子页面，需要生成跳转条目
+            item = ItemDef(ItemKind.GOTO, f"goto__{item_var}", child_name, page.var_name)
+            item.target_page = _page_var_name(child_name, child_props)
+            return item
+        
+        kind = ITEM_KINDS.get(child_type, ItemKind.TEXT)
+        if kind == ItemKind.GOTO:
+            item = ItemDef(kind, f"goto__{item_var}", child_name, page.var_name)
+            target_page = child_props.get("目标页面", "NULL")
+            if target_page and target_page != "NULL":
+                item.target_page = clean_var_name(target_page)
+            return item
+        
+        item = ItemDef(kind, item_var, child_name, page.var_name)
+        item.node_id = _node_id(child_props)
+        
+        # 收集回调函数信息
+        if child_props.get("回调函数"):
+            # 回调函数为<页面/条目的变量名>_Callback（下划线分割的首字母大写）
+            item.callback = f"{snake_to_camel(item_var)}_Callback"
+            self.item_callbacks.append(item)
+        
+        # 收集枚举定义
+        if kind == ItemKind.ENUM:
+            item.enum_count = child_props.get("枚举数量", "1")
+            enum_strings = child_props.get("枚举字符串", [])
+            if enum_strings:
+                # 生成枚举数组名称
+                item.enum_array = f"{item_var}_enum_str"
+                item.enum_strings = enum_strings
+                self.enum_definitions.append(EnumDef(item.enum_array, enum_strings))
+        
+        # 收集变量信息
+        elif kind in (ItemKind.SWITCH, ItemKind.DATA, ItemKind.SHOW):
+            var_type_name = child_props.get("变量类型", "uint8_val")
+            item.var_type = VAR_TYPES.get(var_type_name, DEFAULT_VAR_TYPE)
+            data_var = child_props.get("数据变量名", "")
+            if data_var:
+                item.data_var = clean_var_name(data_var)
+                initial_value = _format_init_value(var_type_name, child_props.get("初始值", "0"))
+                self.variables[item.data_var] = DataVar(item.var_type.c_type, initial_value)
+            
+            if kind == ItemKind.DATA:
+                item.step = child_props.get("步进", "1")
+                item.min_val = child_props.get("最小值", "NULL")
+                item.max_val = child_props.get("最大值", "NULL")
+            elif kind == ItemKind.SHOW:
+                item.period = child_props.get("周期", "100")
+        
+        return item
+    
+    def generatePlaceholderVariables(self):
+        """生成占位变量部分"""
+        return self._sectionText("variables")
+    
+    def _variablesHead(self):
+        yield SECTION_TITLES["variables"]
+        if self.unit == ROOT_UNIT or (self.unit is None and self.options.user_header):
+            # 结构体类型在头文件中定义
+            yield "Easy_Menu_Ui_Data_Type Easy_Menu_Ui_Data = {\n"
+            yield from self._dataInitializerLines()
+            yield "};\n"
+            return
+        if self.unit is not None:
+            header_name = USER_HEADER_NAME if self.options.user_header else SPLIT_HEADER_NAME
+            yield f"/* Easy_Menu_Ui_Data 定义在 Easy_Menu_User.c 中，声明见 {header_name} */\n"
+            return
+        
+        yield "struct {\n"
+        yield from self._dataFieldLines()
+        yield "} Easy_Menu_Ui_Data = {\n"
+        yield from self._dataInitializerLines()
+        yield "};\n"
+        
+        if self.switch_bits:
+            yield from self._switchBitLines()
+    
+    def _dataFieldLines(self):
+        # 使用动态收集的变量
+        for var_name, var_info in self.dataFields():
+            yield f"    {var_info.c_type} {var_name};\n"
+        if self.switch_bits:
+            # 字节数组只需按字节对齐，放在最后不会产生填充
+            yield f"    unsigned char {SWITCH_BITS_FIELD}[{len(self.switchBitBytes())}];\n"
+    
+    def _dataInitializerLines(self):
+        # 添加变量初始化（指定初始化器与字段顺序无关，按字段顺序输出便于对照）
+        for var_name, var_info in self.dataFields():
+            yield f"    .{var_name} = {var_info.init_value},\n"
+        if self.switch_bits:
+            values = ", ".join(f"0x{value:02X}" for value in self.switchBitBytes())
+            yield f"    .{SWITCH_BITS_FIELD} = {{{values}}},\n"
+    
+    def iterSplitHeader(self):
+        """
+        split_pages 模式的共用头文件：占位变量结构体、所有页面的声明以及各页面文件的初始化函数
+        user_header 模式下结构体与页面的声明已在 Easy_Menu_User.h 中，这里只有初始化函数
+        """
+        guard = "__" + SPLIT_HEADER_NAME.replace(".", "_").upper() + "__"
+        yield f"#ifndef {guard}\n#define {guard}\n\n"
+        yield FILE_PREFIX
+        yield f"/* {GENERATED_MARK} */\n"
+        
+        if not self.options.user_header:
+            yield "\n"
+            yield from self._dataDeclarationLines()
+            # 跳转条目可以指向其他文件中的页面
+            yield "\n"
+            for page in self.pages:
+                yield f"extern {page.struct} {page.var_name};\n"
+        
+        if not self.options.const_init:
+            yield "\n"
+            for page in self.root_pages:
+                yield f"void {unit_init_function(page)}(void);\n"
+        yield f"\n#endif\n"
+    
+    def iterUserHeader(self, basename=None, public_code=""):
+        """
+        user_header 模式的 Easy_Menu_User.h：页面、条目数量宏，Easy_Menu_Ui_Data 的类型与声明，
+        所有页面和条目的 extern 声明；public_code 为已有头文件中 PUBLIC 块的用户代码
+        """
+        yield "#ifndef __EASY_MENU_USER_H__\n#define __EASY_MENU_USER_H__\n\n"
+        yield '#include "Easy_Menu_Core.h"\n\n'
+        yield "/* Easy Menu User Header File */\n"
+        yield f"/* {GENERATED_MARK} */\n"
+        if basename:
+            yield f"/* Configuration: {basename} */\n"
+        public_body = f"{public_code}\n" if public_code.strip() else "\n"
+        yield f"\n/* USER CODE PUBLIC BEGIN */\n{public_body}/* USER CODE PUBLIC END */\n\n"
+        
+        # 子页面在父页面中对应的跳转条目也计入条目数量
+        yield "/* 页面与条目数量 */\n"
+        yield f"#define {PAGE_NUM_MACRO} {len(self.pages)}\n"
+        yield f"#define {ITEM_NUM_MACRO} {sum(len(page.items) for page in self.pages)}\n"
+        for page in self.pages:
+            if page.kind == PageKind.ORDINARY:
+                yield f"#define {item_num_macro(page)} {len(page.items)}\n"
+        
+        if self.options.page_table and self.pages:
+            yield from self._pageIdLines()
+        
+        yield "\n/* 占位变量 */\n"
+        yield from self._dataDeclarationLines()
+        
+        yield "\n/* 页面与条目 */\n"
+        for page in self.pages:
+            indent_str = "    " * page.depth
+            yield f"{indent_str}extern {page.struct} {page.var_name};\n"
+            for item in page.items:
+                qualifier = "const " if self._isConstItem(item) else ""
+                yield f"{indent_str}    extern {qualifier}{item.struct} {item.var_name};\n"
+        yield "\n#endif\n"
+    
+    def _dataDeclarationLines(self):
+        """头文件中 Easy_Menu_Ui_Data 的结构体类型、extern 声明以及开关位序号"""
+        yield "typedef struct {\n"
+        yield from self._dataFieldLines()
+        yield "} Easy_Menu_Ui_Data_Type;\n\n"
+        yield "extern Easy_Menu_Ui_Data_Type Easy_Menu_Ui_Data;\n"
+        if self.switch_bits:
+            yield from self._switchBitLines()
+    
+    def _itemNum(self, page):
+        """普通页面的条目数量，user_header 模式下使用头文件中的宏"""
+        return item_num_macro(page) if self.options.user_header else str(len(page.items))
+    
+    def _switchBitLines(self):
+        """pack_switches 模式：各开关的位序号，以及在用户代码中读写开关状态的宏"""
+        yield "\n/* 开关状态按位存放：EASY_MENU_SWITCH_GET(数据变量名) 读取，EASY_MENU_SWITCH_SET(数据变量名, 0/1) 写入 */\n"
+        yield "#if !SWITCH_ITEM_BIT_PACK\n"
+        yield '#error "Easy_Menu_User.c uses bit-packed switches, set SWITCH_ITEM_BIT_PACK to 1 in Easy_Menu.h"\n'
+        yield "#endif\n\n"
+        yield "enum {\n"
+        for data_var, bit in self.switch_bits.items():
+            yield f"    {SWITCH_BIT_PREFIX}{data_var} = {bit},\n"
+        yield "};\n\n"
+        yield (f"#define EASY_MENU_SWITCH_GET(name) "
+               f"((Easy_Menu_Ui_Data.{SWITCH_BITS_FIELD}[{SWITCH_BIT_PREFIX}##name / 8] >> ({SWITCH_BIT_PREFIX}##name % 8)) & 1)\n")
+        yield (f"#define EASY_MENU_SWITCH_SET(name, value) "
+               f"((value) ? (Easy_Menu_Ui_Data.{SWITCH_BITS_FIELD}[{SWITCH_BIT_PREFIX}##name / 8] |= 1 << ({SWITCH_BIT_PREFIX}##name % 8)) "
+               f": (Easy_Menu_Ui_Data.{SWITCH_BITS_FIELD}[{SWITCH_BIT_PREFIX}##name / 8] &= ~(1 << ({SWITCH_BIT_PREFIX}##name % 8))))\n")
+    
+    def switchBitBytes(self):
+        """pack_switches 模式下开关字节数组的初始值"""
+        values = [0] * ((len(self.switch_bits) + 7) // 8)
+        for data_var, bit in self.switch_bits.items():
+            if _switch_initial_bit(self.variables[data_var].init_value):
+                values[bit // 8] |= 1 << (bit % 8)
+        return values
+    
+    def _switchRef(self, item):
+        """开关条目的 (数据地址, 位掩码)，不按位存放时位掩码为 None"""
+        bit = self.switch_bits.get(item.data_var)
+        if bit is None:
+            return f"&Easy_Menu_Ui_Data.{item.data_var}", None
+        return f"&Easy_Menu_Ui_Data.{SWITCH_BITS_FIELD}[{bit // 8}]", f"0x{1 << (bit % 8):02X}"
+    
+    def dataFields(self, abi=None):
+        """
+        Easy_Menu_Ui_Data 中单独存放的字段 [(变量名, DataVar)]，不含按位存放的开关
+        sort_data_fields 模式下按 abi（默认为 Cortex-M）的对齐从大到小稳定排序
+        """
+        fields = [(var_name, var_info) for var_name, var_info in self.variables.items()
+                  if var_name not in self.switch_bits]
+        if self.options.sort_data_fields:
+            from footprint import DEFAULT_ABI, type_layout
+            abi = abi or DEFAULT_ABI
+            fields.sort(key=lambda field: type_layout(field[1].c_type, abi)[1], reverse=True)
+        return fields
+    
+    def generatePageDefinitions(self):
+        """生成页面、条目定义部分"""
+        return self._sectionText("definitions")
+    
+    def _definitionsHead(self):
+        yield SECTION_TITLES["definitions"]
+        if not self.pages:
+            yield "/* No page definitions */\n"
+    
+    def _definitionsBlock(self, page):
+        # 页面按先序排列，即按照树形结构输出：页面 -> 页面下的条目 -> 子页面
+        indent_str = "    " * page.depth
+        lines = [f"{indent_str}{page.struct} {page.var_name};\n"]
+        for item in page.items:
+            if self._isConstItem(item):
+                lines.append(f"{indent_str}    extern const {item.struct} {item.var_name};\n")
+            else:
+                lines.append(f"{indent_str}    {item.struct} {item.var_name};\n")
+        return "".join(lines)
+    
+    def _isConstItem(self, item):
+        """const_init 模式下该条目是否以 const 定义（缺少数据变量等无法初始化的条目保持原样）"""
+        return (self.options.const_init and item.kind in CONST_ITEM_KINDS
+                and self._itemInitLine(item) is not None)
+    
+    def generateEnumLists(self):
+        """生成枚举列表部分"""
+        return self._sectionText("enums")
+    
+    def _enumsHead(self):
+        yield SECTION_TITLES["enums"]
+        if self.options.string_pool and self.strings:
+            yield from self._stringPoolLines()
+        elif not self.enum_definitions:
+            yield "/* No enum definitions */\n"
+    
+    def _stringPoolLines(self):
+        """
+        string_pool 模式：字符串池与共用的枚举数组
+        字符串池是由字符数组组成的 const 结构体，各字符串的长度由编译器按文件编码计算，引用时取成员地址
+        """
+        yield "/* 字符串池：所有显示名称与枚举字符串，相同的字符串只保存一次 */\n"
+        yield "static const struct {\n"
+        for string, index in self.strings.items():
+            yield f'    char s{index}[sizeof("{string}")];\n'
+        yield f"}} {STRING_POOL_NAME} = {{\n"
+        yield ",\n".join(f'    "{string}"' for string in self.strings)
+        yield "\n};\n\n"
+        
+        # 内容相同的枚举条目共用一个数组，数组不会被修改，放入 Flash
+        for strings, array_name in self.enum_arrays.items():
+            yield f"char *const {array_name}[{len(strings)}] = {{\n"
+            yield ",\n".join(f"    {self._string(string)}" for string in strings)
+            yield "\n};\n\n"
+    
+    def _string(self, text):
+        """显示名称、枚举字符串在生成代码中的写法"""
+        if self.options.string_pool:
+            return f"(char *){STRING_POOL_NAME}.s{self.strings[text]}"
+        return f'"{text}"'
+    
+    def _enumArray(self, item):
+        """条目引用的枚举数组"""
+        if self.options.string_pool:
+            return f"(char **){self.enum_arrays[tuple(item.enum_strings)]}"
+        return item.enum_array
+    
+    def _enumsBlock(self, page):
+        if self.options.string_pool:
+            # 枚举数组都在字符串池之后统一生成
+            return ""
+        chunks = []
+        for item in page.items:
+            if not item.enum_array:
+                continue
+            strings = item.enum_strings
+            
+            # 生成数组定义，字符串之间用逗号分隔
+            chunks.append(f'char *{item.enum_array}[{len(strings)}] = {{\n')
+            chunks.append(',\n'.join(f'    "{string}"' for string in strings))
+            chunks.append("\n};\n\n")  # 空行分隔
+        return "".join(chunks)
+    
+    def _function(self, signature, anchor=None):
+        """带 USER CODE 标记的函数，user_code 中有对应的用户代码时填回；anchors 模式下在 BEGIN 标记中写入锚点"""
+        code = self.user_code.get(f"{signature}\n{{")
+        body = f"{code}\n" if code else "\n"
+        begin = f"/* USER CODE BEGIN {anchor} */" if anchor and self.options.anchors else "/* USER CODE BEGIN */"
+        return f"{signature}\n{{\n    {begin}\n{body}    /* USER CODE END */\n}}\n\n"
+    
+    def _itemCallbackSignature(self, item):
+        """根据条目类型生成不同的函数签名"""
+        if item.kind == ItemKind.SWITCH:
+            return f"void {item.callback}(unsigned char data)"
+        if item.kind == ItemKind.DATA:
+            # 根据变量类型生成注释
+            return f"void {item.callback}(void *data) // *(({item.var_type.c_type}*)data)"
+        if item.kind == ItemKind.SHOW:
+            return f"void {item.callback}(void)"
+        # 文本条目、枚举条目
+        return f"void {item.callback}(char *str)"
+    
+    def _pageCallbacks(self, page):
+        """展示页面的回调函数：[(函数签名, 锚点)]，锚点为 <节点ID>.enter / .period / .exit"""
+        signatures = [
+            (page.enter_callback, f"void {page.enter_callback}(void)"),
+            (page.period_callback, f"void {page.period_callback}(void* temp, Easy_Menu_Input_TYPE user_input)"),
+            (page.exit_callback, f"void {page.exit_callback}(void)"),
+        ]
+        return [(signature, f"{page.node_id}.{role}" if page.node_id else None)
+                for (callback, signature), role in zip(signatures, PAGE_CALLBACK_ROLES) if callback]
+    
+    def _pageCallbackSignatures(self, page):
+        return [signature for signature, _ in self._pageCallbacks(page)]
+    
+    def iterCallbacks(self):
+        """按在文件中出现的顺序返回所有回调函数的 (所属页面变量名, 函数签名, 锚点)，节点没有节点ID时锚点为 None"""
+        for page in self.pages:
+            for item in page.items:
+                if item.callback:
+                    yield page.var_name, self._itemCallbackSignature(item), item.node_id
+        for page in self.pages:
+            for signature, anchor in self._pageCallbacks(page):
+                yield page.var_name, signature, anchor
+    
+    def iterCallbackSignatures(self):
+        """按在文件中出现的顺序返回所有回调函数的 (所属页面变量名, 函数签名)"""
+        for key, signature, _ in self.iterCallbacks():
+            yield key, signature
+    
+    def generateItemCallbacks(self):
+        """生成回调函数（条目）部分"""
+        return self._sectionText("item_callbacks")
+    
+    def _itemCallbacksHead(self):
+        yield SECTION_TITLES["item_callbacks"]
+        if not self.item_callbacks:
+            yield "/* No item callbacks */\n"
+    
+    def _itemCallbacksBlock(self, page):
+        return "".join(self._function(self._itemCallbackSignature(item), item.node_id)
+                       for item in page.items if item.callback)
+    
+    def generatePageCallbacks(self):
+        """生成回调函数（页面）部分"""
+        return self._sectionText("page_callbacks")
+    
+    def _pageCallbacksHead(self):
+        yield SECTION_TITLES["page_callbacks"]
+        if not any(page.enter_callback or page.period_callback or page.exit_callback
+                   for page in self.pages):
+            yield "/* No page callbacks */\n"
+            return
+        
+        # 添加私有变量部分（只有展示页面有回调函数）
+        yield "/* Private variables ---------------------------------------------------------*/\n"
+        yield self.valueRegion()
+        yield "/* Private function ----------------------------------------------------------*/\n"
+    
+    def valueRegion(self):
+        """页面回调函数部分开头的 VALUE 块，填回 user_code 中的用户代码"""
+        value_code = self.user_code.get(USER_VALUE)
+        value_body = f"{value_code}\n" if value_code and value_code.strip() else ""
+        return f"/* USER CODE VALUE BEGIN */\n{value_body}/* USER CODE VALUE END */\n"
+    
+    def _pageCallbacksBlock(self, page):
+        # 生成每个页面回调函数
+        return "".join(self._function(signature, anchor) for signature, anchor in self._pageCallbacks(page))
+    
+    def generateSetupLists(self):
+        """生成设置列表（普通页面）部分"""
+        return self._sectionText("setup_lists")
+    
+    def _setupListsHead(self):
+        yield SECTION_TITLES["setup_lists"]
+        if not any(page.items for page in self.pages):
+            yield "/* No setup lists */\n"
+    
+    def _setupListsBlock(self, page):
+        # 为每个有条目的普通页面生成设置列表
+        if not page.items:
+            return ""
+        if self.options.const_init:
+            # 数组本身不会被修改，放入 Flash；const 条目需要去掉 const 才能放进 Item* 数组
+            items = ",\n".join(f"    (Item *)ITEM({item.var_name})" if self._isConstItem(item)
+                               else f"    ITEM({item.var_name})" for item in page.items)
+            return f"Item *const {page.var_name}_items[{self._itemNum(page)}] = {{\n{items}\n}};\n\n"
+        items = ",\n".join(f"    ITEM({item.var_name})" for item in page.items)
+        return f"Item *{page.var_name}_items[{self._itemNum(page)}] = {{\n{items}\n}};\n\n"
+
+    def generateSystemInit(self):
+        """生成系统初始化部分"""
+        return self._sectionText("init")
+    
+    def _rootInitHead(self):
+        """split_pages 模式根文件的系统初始化：依次调用各页面文件的初始化函数"""
+        yield SECTION_TITLES["init"]
+        yield from self._valueFormatCheckLines()
+        yield from self._pageTableLines()
+        if self.options.const_init:
+            return
+        yield "void Easy_Menu_Ui_Init(void)\n"
+        yield "{\n"
+        for page in self.root_pages:
+            yield f"    {unit_init_function(page)}();\n"
+    
+    def _initHead(self):
+        yield SECTION_TITLES["init"]
+        if self.unit is None:
+            yield from self._valueFormatCheckLines()
+            yield from self._pageTableLines()
+        if self.options.const_init:
+            # 页面和条目都已静态初始化，Easy_Menu_Ui_Init 只需跳转到首页
+            if not self.options.pack_switches and any(
+                    item.kind == ItemKind.SWITCH for page in self.pages for item in page.items):
+                # 静态定义的开关条目没有初始化 mask，不能在按位存放的运行时中使用
+                yield "#if SWITCH_ITEM_BIT_PACK\n"
+                yield '#error "Easy_Menu_User.c was generated without bit-packed switches, set SWITCH_ITEM_BIT_PACK to 0 in Easy_Menu.h"\n'
+                yield "#endif\n"
+            yield from self._textLayoutCheckLines()
+            return
+        if self.unit is not None:
+            yield f"void {unit_init_function(self.unit)}(void)\n"
+        else:
+            yield "void Easy_Menu_Ui_Init(void)\n"
+        yield "{\n"
+    
+    def valueFormatTypes(self):
+        """数据、展示条目用到的数值类型对应的 VALUE_FORMAT_TYPES 位名"""
+        used = {item.var_type.menu_type for page in self.pages for item in page.items
+                if item.kind in (ItemKind.DATA, ItemKind.SHOW) and item.data_var}
+        return [group for group, menu_types in VALUE_FORMAT_GROUPS.items() if used.intersection(menu_types)]
+    
+    def _valueFormatCheckLines(self):
+        """value_format 模式：专用格式化函数须包含用到的数值类型"""
+        groups = self.valueFormatTypes()
+        if not self.options.value_format or not groups:
+            return
+        mask = value_format_types_expr(groups)
+        yield f"#if VALUE_FORMAT_MODE && (VALUE_FORMAT_TYPES & {mask}) != {mask}\n"
+        yield (f'#error "Easy_Menu_User.c shows values of types {" | ".join(groups)}, '
+               f'add them to VALUE_FORMAT_TYPES in Easy_Menu.h"\n')
+        yield "#endif\n"
+    
+    def pageTable(self):
+        """
+        page_table 模式的页面表：页面按配置顺序（先序）编号，返回 ([(页面, 上级页面序号, 子页面起始位置)], 子页面序号列表)
+        每个页面的子页面序号在列表中连续存放
+        """
+        ids = {page: index for index, page in enumerate(self.pages)}
+        entries = []
+        children = []
+        for page in self.pages:
+            parent = self.page_index.get(page.parent)
+            entries.append((page, PAGE_ID_NONE if parent is None else ids[parent], len(children)))
+            children.extend(ids[child] for child in page.child_pages)
+        return entries, children
+    
+    def _pageTableLines(self):
+        """page_table 模式：页面表、子页面序号和页面数量"""
+        if not self.options.page_table or not self.pages:
+            return
+        yield "#if !PAGE_TABLE_MODE\n"
+        yield '#error "Easy_Menu_User.c was generated with a page table, set PAGE_TABLE_MODE to 1 in Easy_Menu.h"\n'
+        yield "#endif\n\n"
+        
+        entries, children = self.pageTable()
+        page_num = PAGE_NUM_MACRO if self.options.user_header else str(len(self.pages))
+        yield f"const Page_Table_Entry Easy_Menu_Page_Table[{page_num}] = {{\n"
+        for index, (page, parent, child_index) in enumerate(entries):
+            parent = "PAGE_ID_NONE" if parent == PAGE_ID_NONE else parent
+            yield (f"    {{PAGE({page.var_name}), {parent}, {child_index}, {len(page.child_pages)}}}, "
+                   f"// {index} {page.var_name}\n")
+        yield "};\n\n"
+        if children:
+            values = ", ".join(str(child) for child in children)
+            yield f"const unsigned char Easy_Menu_Page_Children[{len(children)}] = {{{values}}};\n"
+        else:
+            # 没有子页面时数组中只有一个占位项
+            yield "const unsigned char Easy_Menu_Page_Children[1] = {PAGE_ID_NONE};\n"
+        yield f"const unsigned char Easy_Menu_Page_Num = {page_num};\n\n"
+    
+    def _pageIdLines(self):
+        """page_table 模式下 Easy_Menu_User.h 中各页面的序号"""
+        yield "\n/* 页面序号（PAGE_TABLE_MODE 为 1 时用于 Easy_Menu_Goto_Page_Id 等函数） */\n"
+        yield "enum {\n"
+        for index, page in enumerate(self.pages):
+            yield f"    {PAGE_ID_PREFIX}{page.var_name} = {index},\n"
+        yield "};\n"
+    
+    def _textLayoutCheckLines(self):
+        """const_init 模式：静态定义的页面和条目是否带有预先计算的文本布局，须与 TEXT_LAYOUT_PRECOMPUTE 和每行列数一致"""
+        if not self.pages:
+            return
+        columns = self.options.screen_columns
+        if self.options.text_layout:
+            yield f"#if !TEXT_LAYOUT_PRECOMPUTE || EASY_MENU_COL_MAX_NUM != {columns}\n"
+            yield (f'#error "Easy_Menu_User.c was generated with text layout for {columns} columns, '
+                   f'set TEXT_LAYOUT_PRECOMPUTE to 1 and SCREEN_WIDTH / CHAR_WIDTH to {columns} in Easy_Menu.h"\n')
+        else:
+            yield "#if TEXT_LAYOUT_PRECOMPUTE\n"
+            yield '#error "Easy_Menu_User.c was generated without text layout, set TEXT_LAYOUT_PRECOMPUTE to 0 in Easy_Menu.h"\n'
+        yield "#endif\n"
+    
+    def _initBlock(self, page):
+        if self.options.const_init:
+            return "".join(self._pageDefinitionLines(page))
+        # 按原始顺序处理所有页面和条目初始化（保持配置顺序）
+        return "".join(self._pageInitLines(page))
+    
+    def _initTail(self):
+        if self.unit not in (None, ROOT_UNIT):
+            # 页面文件只初始化本文件的页面，跳转到首页由根文件完成
+            if not self.options.const_init:
+                yield "}\n"
+            return
+        if self.options.const_init:
+            yield "\nvoid Easy_Menu_Ui_Init(void)\n"
+            yield "{\n"
+        
+        # 获取第一个页面变量作为首页
+        first_page_var = next((page.var_name for page in self.pages if page.var_name), None)
+        
+        # 添加跳转到首页的语句
+        if first_page_var:
+            yield "    \n"
+            yield f"    Easy_Menu_Goto_Page(PAGE({first_page_var}));\n"
+        
+        yield "}\n"
+
+    def _pageDefinitionLines(self, page):
+        """const_init 模式：用指定初始化器定义页面及其条目，字段取值与对应的 *_Init 函数一致"""
+        parent_page = f"PAGE({page.parent})" if page.parent else "NULL"
+        enter, display, input_handler, exit_handler = PAGE_HANDLERS[page.kind]
+        base = (f".page = {{.type = {PAGE_TYPE_NAMES[page.kind]}, .text = {self._string(page.display_name)}, "
+                f".prev_page = {parent_page}, {self._textLenField(page_text_len(encode_text(page.display_name)))}"
+                f".Enter = {enter}, .Display = {display}, "
+                f".Input = {input_handler}, .Exit = {exit_handler}}}")
+        
+        if page.kind == PageKind.SHOW:
+            enter_callback = page.enter_callback or "NULL"
+            period_callback = page.period_callback or "NULL"
+            exit_callback = page.exit_callback or "NULL"
+            yield (f"\nShow_Page {page.var_name} = {{{base}, .period = {page.period}, .last_tick = 0, "
+                   f".Enter_Callback = {enter_callback}, .Period_Callback = {period_callback}, "
+                   f".Exit_Callback = {exit_callback}}};\n")
+            return
+        
+        # 没有条目的页面不生成设置列表
+        items = f"(Item **){page.var_name}_items" if page.items else "NULL"
+        title_x = ""
+        if self.options.text_layout:
+            title_x = f".title_x = {title_offset(encode_text(page.display_name), self.options.screen_columns)}, "
+        yield (f"\nOrdinary_Page {page.var_name} = {{{base}, .items = {items}, .item_num = {self._itemNum(page)}, "
+               f".items_index = 0, .cursor = ORDINARY_PAGE_TITLE_DISPLAY, {title_x}.Refresh = Ordinary_Page_Refresh}};\n")
+        
+        for item in page.items:
+            fields = self._itemFields(item)
+            if fields is not None:
+                qualifier = "const " if self._isConstItem(item) else ""
+                yield f"{qualifier}{item.struct} {item.var_name} = {{{fields}}};\n"
+    
+    def _textLenField(self, text_len):
+        """text_layout 模式下页面初始化器中的 .text_len 字段"""
+        return f".text_len = {text_len}, " if self.options.text_layout else ""
+    
+    def _itemFields(self, item):
+        """条目的指定初始化器内容，缺少必要信息时返回 None（与 _itemInitLine 一致）"""
+        if self._itemInitLine(item) is None:
+            return None
+        fields = [f".type = {ITEM_TYPE_NAMES[item.kind]}", f".text = {self._string(item.display_name)}",
+                  f".parent_page = PAGE({item.parent})"]
+        if self.options.text_layout:
+            text_len = item_text_len(encode_text(item.display_name), self.options.screen_columns)
+            fields.append(f".text_len = {text_len}")
+        if item.kind in ITEM_INPUT_HANDLERS:
+            fields.append(f".Input = {ITEM_INPUT_HANDLERS[item.kind]}")
+        base = f".item = {{{', '.join(fields)}}}"
+        callback = item.callback or "NULL"
+        
+        if item.kind == ItemKind.GOTO:
+            target = f"PAGE({item.target_page})" if item.target_page else "NULL"
+            return f"{base}, .target_page = {target}"
+        if item.kind == ItemKind.TEXT:
+            return f"{base}, .Callback = {callback}"
+        if item.kind == ItemKind.ENUM:
+            return (f"{base}, .enum_str = {self._enumArray(item)}, .enum_num = {item.enum_count}, "
+                    f".enum_str_index = 0, .Callback = {callback}")
+        
+        data_ref = f"&Easy_Menu_Ui_Data.{item.data_var}"
+        menu_type = item.var_type.menu_type
+        if item.kind == ItemKind.SWITCH:
+            if self.options.pack_switches:
+                # SWITCH_ITEM_BIT_PACK 为 1 时每个开关条目都有 mask 字段，单独存放的开关为 0（按整个字节读取与翻转）
+                data_ref, mask = self._switchRef(item)
+                return f"{base}, .data = {data_ref}, .mask = {mask or '0'}, .Callback = {callback}"
+            return f"{base}, .data = {data_ref}, .Callback = {callback}"
+        if item.kind == ItemKind.DATA:
+            # 联合体用指定成员初始化（复合字面量不能用于静态初始化）
+            value_field = VALUE_FIELDS[menu_type]
+            min_val = item.min_val if item.min_val != "NULL" else "0"
+            max_val = item.max_val if item.max_val != "NULL" else "0"
+            return (f"{base}, .data_type = {menu_type}, .data = {data_ref}, "
+                    f".step = {{.{value_field} = {item.step}}}, .min = {{.{value_field} = {min_val}}}, "
+                    f".max = {{.{value_field} = {max_val}}}, .has_step = 1, "
+                    f".has_min = {1 if item.min_val != 'NULL' else 0}, "
+                    f".has_max = {1 if item.max_val != 'NULL' else 0}, .Callback = {callback}")
+        # 展示条目
+        return (f"{base}, .data_type = {menu_type}, .data = {data_ref}, .period = {item.period}, "
+                f".last_tick = 0, .Callback = {callback}")
+    
+    def _pageInitLines(self, page):
+        """生成页面及其条目的初始化语句"""
+        parent_page = f"PAGE({page.parent})" if page.parent else "NULL"
+        
+        if page.kind == PageKind.SHOW:
+            # 展示页面初始化
+            enter_callback = page.enter_callback or "NULL"
+            period_callback = page.period_callback or "NULL"
+            exit_callback = page.exit_callback or "NULL"
+            yield f"\n    Show_Page_Init({parent_page}, PAGE({page.var_name}), {self._string(page.display_name)}, {page.period}, {enter_callback}, {period_callback}, {exit_callback});\n"
+            return
+        
+        # 普通页面初始化
+        yield f"\n    Ordinary_Page_Init({parent_page}, PAGE({page.var_name}), {self._string(page.display_name)}, {page.var_name}_items, {self._itemNum(page)});\n"
+        
+        for item in page.items:
+            line = self._itemInitLine(item)
+            if line:
+                yield f"        {line}\n"
+
+    def _itemInitLine(self, item):
+        """生成条目的初始化语句，缺少必要信息（数据变量、枚举数组）时返回 None"""
+        head = f"PAGE({item.parent}), ITEM({item.var_name}), {self._string(item.display_name)}"
+        callback = item.callback or "NULL"
+        
+        if item.kind == ItemKind.GOTO:
+            # 当目标页面为 NULL 时，应使用 NULL 而不是 PAGE(NULL)
+            target = f"PAGE({item.target_page})" if item.target_page else "NULL"
+            return f"Goto_Item_Init({head}, {target});"
+        
+        if item.kind == ItemKind.TEXT:
+            return f"Text_Item_Init({head}, {callback});"
+        
+        if item.kind == ItemKind.ENUM:
+            if not item.enum_array:
+                return None
+            return f"Enum_Item_Init({head}, {self._enumArray(item)}, {item.enum_count}, {callback});"
+        
+        if not item.data_var:
+            return None
+        data_ref = f"&Easy_Menu_Ui_Data.{item.data_var}"
+        menu_type = item.var_type.menu_type
+        
+        if item.kind == ItemKind.SWITCH:
+            switch_ref, mask = self._switchRef(item)
+            if mask is not None:
+                return f"Switch_Item_Bit_Init({head}, {switch_ref}, {mask}, {callback});"
+            return f"Switch_Item_Init({head}, {data_ref}, {callback});"
+        
+        if item.kind == ItemKind.DATA:
+            # Format the min/max values according to reference file format
+            formatted_min_val = f"{menu_type}_VAL({item.min_val})" if item.min_val != "NULL" else f"{menu_type}_VAL(0)"
+            formatted_max_val = f"{menu_type}_VAL({item.max_val})" if item.max_val != "NULL" else f"{menu_type}_VAL(0)"
+            # Check if min/max values are set to determine enable flags
+            min_enable_flag = 1 if item.min_val != "NULL" else 0
+            max_enable_flag = 1 if item.max_val != "NULL" else 0
+            return f"Data_Item_Init({head}, {menu_type}, {data_ref}, {menu_type}_VAL({item.step}), 1, {formatted_min_val}, {min_enable_flag}, {formatted_max_val}, {max_enable_flag}, {callback});"
+        
+        # 展示条目
+        return f"Show_Item_Init({head}, {menu_type}, {data_ref}, {item.period}, {callback});"
+
+
+def _file_digest(file_path):
+    import hashlib
+    
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(WRITE_BUFFER_SIZE), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def same_file_content(path_a, path_b):
+    """两个文件内容是否相同：先比较大小，再比较哈希"""
+    try:
+        if os.path.getsize(path_a) != os.path.getsize(path_b):
+            return False
+    except OSError:
+        return False
+    return _file_digest(path_a) == _file_digest(path_b)
+
+
+def write_file_if_changed(file_path, chunks, encoding):
+    """
+    将文本块写入 file_path，返回文件是否被改写
+    内容先写到同目录下的临时文件，与已有文件相同时删除临时文件、原文件保持不动（修改时间不变，
+    不会触发固件重新编译）；不同时用临时文件原子替换原文件，写到一半出错也不会留下残缺的文件
+    """
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'w', encoding=encoding, buffering=WRITE_BUFFER_SIZE) as f:
+            f.writelines(chunks)
+        if same_file_content(temp_path, file_path):
+            os.remove(temp_path)
+            return False
+        if os.path.exists(file_path):
+            import shutil
+            shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return True
+
+
+def write_text_if_changed(file_path, text, encoding, existing=None):
+    """
+    write_file_if_changed 的整段文本版本，用于保存 JSON 配置
+    existing 为刚读取的该文件（ExistingFile）时先在内存中比较：文本相同、文件未再被修改，
+    且按 encoding 和本系统的换行符写出的大小与文件相同时，不再写出临时文件比较
+    """
+    if existing is not None and existing.content == text:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            stat = None
+        size = len(text.encode(encoding)) + text.count("\n") * (len(os.linesep) - 1)
+        if stat is not None and existing.stamp[:2] == (stat.st_size, stat.st_mtime_ns) and stat.st_size == size:
+            return False
+    return write_file_if_changed(file_path, [text], encoding)
+
+
+# 按字节判断编码时检查的非 ASCII 字节段数：只用于排除不可能的编码，最终以一次完整解码为准
+ENCODING_SAMPLE_RUNS = 64
+
+# 查找非 ASCII 字节段时只扫描文件开头的字节数，纯 ASCII 的大文件不必整个扫描一遍
+ENCODING_SAMPLE_BYTES = 1 << 16
+
+NON_ASCII_RUN = re.compile(rb'[\x80-\xff]+')
+
+# 各编码中非 ASCII 字节段的合法结构：GB2312 为 [A1-F7][A1-FE] 的双字节，UTF-8 按首字节确定后续字节
+ENCODING_RUNS = {
+    'gb2312': re.compile(rb'(?:[\xa1-\xf7][\xa1-\xfe])+'),
+    'utf-8': re.compile(rb'(?:[\xc2-\xdf][\x80-\xbf]|\xe0[\xa0-\xbf][\x80-\xbf]|[\xe1-\xec\xee\xef][\x80-\xbf]{2}'
+                        rb'|\xed[\x80-\x9f][\x80-\xbf]|\xf0[\x90-\xbf][\x80-\xbf]{2}|[\xf1-\xf3][\x80-\xbf]{3}'
+                        rb'|\xf4[\x80-\x8f][\x80-\xbf]{2})+'),
+}
+
+
+def detect_encodings(data, encoding):
+    """
+    按字节判断 data 可能的编码，按 所选编码 -> gb2312 -> utf-8 的顺序返回列表
+    只在前 ENCODING_SAMPLE_BYTES 字节中检查前 ENCODING_SAMPLE_RUNS 个非 ASCII 字节段，其中结构不合法的编码一定无法解码，直接排除；
+    整个文件都没有非 ASCII 字节时各编码的结果相同，只返回所选编码
+    """
+    candidates = [encoding] + [enc for enc in ('gb2312', 'utf-8') if enc != encoding]
+    limit = min(len(data), ENCODING_SAMPLE_BYTES)
+    runs = []
+    for match in NON_ASCII_RUN.finditer(data, 0, limit):
+        if match.end() == limit < len(data):
+            # 被截断的字节段可能只含半个字符，不能用来排除编码
+            break
+        runs.append(match.group())
+        if len(runs) == ENCODING_SAMPLE_RUNS:
+            break
+    if not runs:
+        return candidates if limit < len(data) else candidates[:1]
+    return [enc for enc in candidates
+            if enc not in ENCODING_RUNS or all(ENCODING_RUNS[enc].fullmatch(run) for run in runs)]
+
+
+def read_text_file(file_path, encoding):
+    """
+    读取文本文件，按 所选编码 -> gb2312 -> utf-8 的顺序解码，都失败时按所选编码忽略错误字节
+    文件经 mmap 只读取一次，先按字节排除不可能的编码（见 detect_encodings），通常只需解码一次；
+    换行符与文本模式读取时相同，统一为 '\\n'
+    """
+    import mmap
+    
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for enc in detect_encodings(data, encoding):
+                try:
+                    content = str(data, enc)
+                    break
+                except UnicodeDecodeError:
+                    continue
+            else:
+                content = str(data, encoding, 'ignore')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+class ExistingFile:
+    """已读取的已有文件：内容与按需解析的 USER CODE 块"""
+    __slots__ = ("stamp", "read_at", "content", "_blocks")
+    
+    def __init__(self, stamp, content):
+        import time
+        
+        self.stamp = stamp
+        self.read_at = time.time_ns()
+        self.content = content
+        self._blocks = None
+    
+    def settled(self, stamp):
+        """文件仍是读取时的状态：大小、修改时间与编码相同，且读取时修改时间已过去 RACY_WINDOW_NS"""
+        return stamp == self.stamp and stamp[1] + RACY_WINDOW_NS <= self.read_at
+    
+    def blocks(self):
+        """extract_blocks 的结果，只解析一次；函数列表每次复制一份（匹配时会改写其中的 used）"""
+        if self._blocks is None:
+            self._blocks = extract_blocks(self.content)
+        value_block, public_block, functions = self._blocks
+        return value_block, public_block, [dict(func) for func in functions]
+
+
+# 已读取的已有文件：绝对路径 -> ExistingFile
+_existing_files = {}
+
+# 修改时间距读取时不足该时长（纳秒）的文件每次重新读取：文件系统的时间精度较粗（例如 FAT 为 2 秒）时，
+# 同一时间单位内大小不变的再次修改无法从修改时间看出
+RACY_WINDOW_NS = 2 * 10**9
+
+
+def read_existing_file(file_path, encoding):
+    """
+    读取已有的生成文件，返回 ExistingFile；按路径、大小与修改时间缓存，文件未变化时不重新读取和解析，
+    配置器中反复生成时不必每次重新读取同一个文件；重新读取后内容相同时沿用已解析的 USER CODE 块
+    """
+    import time
+    
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    stamp = (stat.st_size, stat.st_mtime_ns, encoding)
+    existing = _existing_files.get(path)
+    if existing is not None and existing.settled(stamp):
+        return existing
+    
+    content = read_text_file(path, encoding)
+    if existing is not None and existing.content == content:
+        existing.stamp = stamp
+        existing.read_at = time.time_ns()
+    else:
+        existing = _existing_files[path] = ExistingFile(stamp, content)
+    return existing
+
+
+def load_config(file_path, encoding='gb2312'):
+    """读取 JSON 配置文件，返回树形结构数据"""
+    return json.loads(read_text_file(file_path, encoding))
+
+
+def default_cache_dir(c_file_path):
+    """输出文件对应的缓存目录"""
+    return os.path.join(os.path.dirname(os.path.abspath(c_file_path)), CACHE_DIR_NAME)
+
+
+def new_function_blocks(generator, skip_pages=()):
+    """按 extract_blocks 的格式列出生成器将要生成的所有回调函数，skip_pages 中页面（变量名）的回调函数除外"""
+    blocks = []
+    for key, signature, anchor in generator.iterCallbacks():
+        if key in skip_pages:
+            continue
+        full_sig = f"{signature}\n{{"
+        blocks.append({'signature': full_sig, 'type': get_function_type(full_sig), 'anchor': anchor or '',
+                       'used': False})
+    return blocks
+
+
+def match_user_code(generator, old_content, blocks=None):
+    """
+    从旧文件中取出用户代码并与将要生成的函数匹配（规则同 preserve_user_code），
+    返回可直接赋给 generator.user_code 的字典；blocks 为已解析的 extract_blocks(old_content)
+    """
+    old_value, old_public, old_funcs = blocks if blocks is not None else extract_blocks(old_content)
+    user_code = match_functions(old_funcs, new_function_blocks(generator))
+    user_code[USER_PUBLIC] = old_public
+    user_code[USER_VALUE] = old_value
+    return user_code
+
+
+def generate_c_file(tree_data, c_file_path, basename=None, encoding='gb2312', cache_dir=None, options=None):
+    """
+    生成 C 文件并写入 c_file_path，与配置器的“生成代码”按钮行为一致：
+    目标文件已存在时保留 /* USER CODE BEGIN */ 与 /* USER CODE END */ 之间的用户代码
+    生成的内容逐段写出，不会在内存中拼出整个文件
+    
+    指定 cache_dir 时启用增量生成（见 incremental.py）：只重新生成内容有变化的页面，
+    其余页面的代码块直接从已有文件中取出
+    
+    生成结果与已有文件相同时不改写文件，返回文件是否被改写
+    options 为 GenerateOptions，默认为原有的生成方式；split_pages 模式下 c_file_path 为根文件，
+    其余文件生成在同一目录中（见 generate_split_files），返回是否有文件被改写；
+    user_header 模式下同时生成同目录下的 Easy_Menu_User.h（见 write_user_header）
+    """
+    generator = MenuCodeGenerator(options)
+    if generator.options.split_pages:
+        generator.collect(tree_data)
+        return any(generate_split_files(generator, tree_data, c_file_path, basename, encoding, cache_dir).values())
+    
+    cache = _open_cache(cache_dir, c_file_path)
+    existing = read_existing_file(c_file_path, encoding) if os.path.exists(c_file_path) else None
+    # 有缓存时先在收集之前按配置树找出有变化的页面，只收集这些页面（见 SectionCache.patch），不能这样生成时完整收集
+    if existing is None or cache is None or not cache.patch(generator, tree_data, existing):
+        generator.collect(tree_data)
+        _load_user_code(generator, tree_data, c_file_path, encoding, cache, existing)
+    changed = _write_generated_file(generator, tree_data, c_file_path, basename, encoding, cache, existing)
+    if generator.options.user_header:
+        changed = write_user_header(generator, c_file_path, basename, encoding) or changed
+    return changed
+
+
+def _open_cache(cache_dir, c_file_path):
+    if not cache_dir:
+        return None
+    from incremental import SectionCache
+    return SectionCache(cache_dir, c_file_path)
+
+
+def _load_user_code(generator, tree_data, c_file_path, encoding, cache, existing=None):
+    """
+    从已有文件中取回用户代码设置到 generator.user_code（有缓存时优先增量复用），
+    返回读取的已有文件（ExistingFile），文件不存在时返回 None；existing 为已读取的已有文件时不再读取
+    """
+    if existing is None:
+        if not os.path.exists(c_file_path):
+            return None
+        existing = read_existing_file(c_file_path, encoding)
+    if cache is None or not cache.splice(generator, tree_data, existing):
+        generator.user_code = match_user_code(generator, existing.content, existing.blocks())
+    return existing
+
+
+def _write_generated_file(generator, tree_data, c_file_path, basename, encoding, cache, existing=None):
+    """
+    把已设置好用户代码的 generator 写入 c_file_path 并更新缓存，返回文件是否被改写
+    existing 为 _load_user_code 读取的已有文件，不再重新读取（刚写出的文件修改时间较近，按路径缓存的内容不会被沿用）
+    有缓存时，已有文件在 USER CODE 块之外被手工修改过（与缓存中上次生成的原始文件不同）才在内存中拼出整个文件，
+    与基准、已有文件做三方合并（见 merge3.py）；只收集了有变化的页面时也在内存中拼出整个文件；
+    其余情况与不使用缓存时一样逐段写出
+    """
+    if cache is None:
+        return write_file_if_changed(c_file_path, generator.iterCollectedContent(basename), encoding)
+    
+    chunks = generator.iterCollectedContent(basename, cache.recordBlock)
+    original = None
+    # 用户只改动过 USER CODE 块内的代码（块外与基准相同）或不是由配置器生成的文件（例如新建的空文件）时不需要合并；
+    # 先比较文件的大小和修改时间，再比较缓存中记录的摘要，都不读取基准
+    needs_merge = (cache.hasBase() and existing is not None and GENERATED_MARK in existing.content
+                   and not cache.matchesBase(existing))
+    
+    if cache.patched:
+        # 只收集了有变化的页面（此时已有文件与基准相同，不需要合并）：其余内容都截取自已有文件，
+        # 在内存中拼出整个文件与已有文件比较，不必写出临时文件再比较
+        content = "".join(chunks)
+        changed = write_text_if_changed(c_file_path, content, encoding, existing)
+        cache.saveBase(c_file_path)
+    elif not needs_merge:
+        # 通常的情况：边生成边写出，不在内存中拼出整个文件；写出的文件即为新的基准
+        changed = write_file_if_changed(c_file_path, chunks, encoding)
+        cache.saveBase(c_file_path)
+    else:
+        from merge3 import merge_three_way
+        base = cache.loadBase(encoding)
+        new_content = "".join(chunks)
+        content = new_content
+        if base is not None:
+            content, conflicts = merge_three_way(base, existing.content, new_content)
+            if conflicts:
+                original = existing.content
+        changed = write_text_if_changed(c_file_path, content, encoding)
+        cache.saveBase(c_file_path, new_content, encoding)
+    
+    cache.saveOriginal(original)
+    cache.save(generator, tree_data)
+    return changed
+
+
+def merge_conflict_files(generator, c_file_path, cache_dir):
+    """
+    本次生成中三方合并有冲突的文件：[(文件路径, 合并前的文件另存的路径)]
+    冲突处的手工修改按生成的代码处理，合并前的文件保存在缓存目录中以便找回；
+    split_pages 模式下根文件不使用缓存，只检查各页面文件
+    """
+    if not cache_dir:
+        return []
+    from incremental import SectionCache
+    paths = split_file_paths(generator, c_file_path)[1] if generator.options.split_pages else [c_file_path]
+    conflicts = []
+    for path in paths:
+        orig_path = SectionCache(cache_dir, path).orig_path
+        if os.path.exists(orig_path):
+            conflicts.append((path, orig_path))
+    return conflicts
+
+
+def user_header_path(c_file_path):
+    """user_header 模式下生成的头文件路径（与 C 文件同目录）"""
+    return os.path.join(os.path.dirname(os.path.abspath(c_file_path)), USER_HEADER_NAME)
+
+
+def write_user_header(generator, c_file_path, basename=None, encoding='gb2312'):
+    """
+    user_header 模式：按已收集信息的 generator 生成 Easy_Menu_User.h，保留其中 PUBLIC 块的用户代码，返回是否改写
+    已有的头文件不是由配置器生成时（例如 menu_core 中手写的版本），先另存为 Easy_Menu_User.h.bak 再覆盖
+    """
+    header_path = user_header_path(c_file_path)
+    public_code = ""
+    if os.path.exists(header_path):
+        existing = read_existing_file(header_path, encoding)
+        if GENERATED_MARK in existing.content:
+            public_code = existing.blocks()[1]
+        elif not os.path.exists(header_path + ".bak"):
+            import shutil
+            shutil.copyfile(header_path, header_path + ".bak")
+    return write_file_if_changed(header_path, generator.iterUserHeader(basename, public_code), encoding)
+
+
+def split_file_paths(generator, c_file_path):
+    """split_pages 模式下共用头文件与各顶层页面文件的路径：(头文件, [页面文件])"""
+    output_dir = os.path.dirname(os.path.abspath(c_file_path))
+    return (os.path.join(output_dir, SPLIT_HEADER_NAME),
+            [os.path.join(output_dir, unit_file_name(page)) for page in generator.root_pages])
+
+
+def find_stale_unit_files(c_file_path, unit_paths):
+    """输出目录中不再对应任何顶层页面的页面文件（顶层页面被删除或改名后留下），不会自动删除"""
+    import glob
+    
+    output_dir = os.path.dirname(os.path.abspath(c_file_path))
+    generated = set(unit_paths)
+    return sorted(path for path in glob.glob(os.path.join(output_dir, f"{UNIT_FILE_PREFIX}*.c"))
+                  if path not in generated)
+
+
+def adopt_moved_user_code(units, own_functions, other_functions):
+    """
+    split_pages 模式下找回移到其他文件中的回调函数的用户代码（各文件已分别完成本文件内的匹配）
+    units 为生成器列表，own_functions 为各生成器对应的已有文件中的函数，other_functions 为根文件等其余已有文件中的函数
+    
+    1. 本文件中原本没有的函数，按锚点、签名在其他文件中查找（条目移到其他顶层页面下，或由单个文件改为拆分）
+    2. 仍没有用户代码的新函数，与各文件中没有被任何文件用到的旧函数按类型依次匹配（规则同 match_functions）
+    """
+    all_functions = [func for functions in own_functions for func in functions] + other_functions
+    by_signature = {}
+    by_anchor = {}
+    for func in all_functions:
+        by_signature.setdefault(func['signature'], func)
+        if func.get('anchor'):
+            by_anchor.setdefault(func['anchor'], func)
+    new_signatures = set()
+    new_anchors = set()
+    for unit in units:
+        for _, signature, anchor in unit.iterCallbacks():
+            new_signatures.add(f"{signature}\n{{")
+            if anchor:
+                new_anchors.add(anchor)
+    
+    newcomers = []
+    for unit, functions in zip(units, own_functions):
+        own_signatures = {func['signature'] for func in functions}
+        for func in functions:
+            if (func['signature'] in new_signatures or func.get('anchor') in new_anchors
+                    or func['code'] in unit.user_code.values()):
+                func['used'] = True
+        for block in new_function_blocks(unit):
+            signature = block['signature']
+            if signature in own_signatures:
+                continue
+            moved = by_anchor.get(block['anchor']) if block['anchor'] else None
+            if moved is None:
+                moved = by_signature.get(signature)
+            if moved is not None:
+                unit.user_code[signature] = moved['code']
+                moved['used'] = True
+            elif not (unit.user_code.get(signature) or "").strip():
+                block['unit'] = unit
+                newcomers.append(block)
+    
+    orphans = [func for func in all_functions
+               if not func['used'] and func['signature'] not in new_signatures
+               and func.get('anchor') not in new_anchors and func['code'].strip()]
+    for signature, code in match_functions(orphans, newcomers).items():
+        for block in newcomers:
+            if block['signature'] == signature:
+                block['unit'].user_code[signature] = code
+                break
+
+
+def generate_split_files(generator, tree_data, c_file_path, basename=None, encoding='gb2312', cache_dir=None):
+    """
+    split_pages 模式：c_file_path 为根文件（占位变量与 Easy_Menu_Ui_Init），同目录下生成共用头文件，
+    每个顶层页面子树生成一个 Easy_Menu_User_<页面变量名>.c；内容未变化的文件不改写，
+    修改菜单后只有变化的页面文件需要重新编译
+    
+    每个文件各自保留其中的用户代码（有缓存时各自增量生成）；回调函数所在的条目移到其他顶层页面下，
+    或由单个文件改为拆分时，由 adopt_moved_user_code 从原来的文件中取回用户代码
+    返回 {文件路径: 是否改写}
+    """
+    header_path, unit_paths = split_file_paths(generator, c_file_path)
+    if len(set(unit_paths)) != len(unit_paths):
+        raise ValueError("顶层页面的变量名重复，无法按页面拆分文件")
+    
+    generator.unit = ROOT_UNIT
+    units = [unit for _, unit in generator.splitUnits()]
+    root_nodes = [node for node in tree_data if node.get("type", "普通页面") in ("普通页面", "展示页面")]
+    
+    caches = [_open_cache(cache_dir, path) for path in unit_paths]
+    own_files = [_load_user_code(unit, [node], path, encoding, cache)
+                 for unit, node, path, cache in zip(units, root_nodes, unit_paths, caches)]
+    own_functions = [existing.blocks()[2] if existing is not None else [] for existing in own_files]
+    
+    # 根文件很小，不使用增量缓存
+    root_file = _load_user_code(generator, tree_data, c_file_path, encoding, None)
+    
+    # 根文件（由单个文件改为拆分时含有所有回调函数）和已不对应顶层页面的文件
+    other_functions = []
+    old_value = ""
+    if root_file is not None:
+        old_value, _, other_functions = root_file.blocks()
+    for path in find_stale_unit_files(c_file_path, unit_paths):
+        other_functions.extend(read_existing_file(path, encoding).blocks()[2])
+    adopt_moved_user_code(units, own_functions, other_functions)
+    
+    if old_value.strip():
+        # 由单个文件改为拆分时，原来的 VALUE 用户代码交给第一个含页面回调函数的新文件
+        for unit, path in zip(units, unit_paths):
+            if not os.path.exists(path) and any(
+                    page.enter_callback or page.period_callback or page.exit_callback for page in unit.pages):
+                unit.user_code[USER_VALUE] = old_value
+                break
+    
+    results = {}
+    results[c_file_path] = _write_generated_file(generator, tree_data, c_file_path, basename, encoding, None, root_file)
+    results[header_path] = write_file_if_changed(header_path, generator.iterSplitHeader(), encoding)
+    if generator.options.user_header:
+        results[user_header_path(c_file_path)] = write_user_header(generator, c_file_path, basename, encoding)
+    for unit, node, path, cache, existing in zip(units, root_nodes, unit_paths, caches, own_files):
+        results[path] = _write_generated_file(unit, [node], path, basename, encoding, cache, existing)
+    return results
+
+
+def add_generate_option_arguments(parser):
+    """向 argparse 解析器添加 GenerateOptions 对应的命令行选项，命令行与批量生成共用"""
+    parser.add_argument("--const-init", action="store_true",
+                        help="用 const 指定初始化器静态定义页面和条目，代替 Easy_Menu_Ui_Init 中的初始化调用，并输出节省的空间")
+    parser.add_argument("--string-pool", action="store_true",
+                        help="显示名称与枚举字符串去重后放入字符串池，相同的枚举数组共用，并输出节省的 Flash")
+    parser.add_argument("--sort-data-fields", action="store_true",
+                        help="Easy_Menu_Ui_Data 的字段按对齐排序以减少填充，并输出排序前后的结构体大小")
+    parser.add_argument("--pack-switches", action="store_true",
+                        help="开关条目的数据按位存放（需要在 Easy_Menu.h 中将 SWITCH_ITEM_BIT_PACK 设为 1），并输出 RAM 的变化")
+    parser.add_argument("--split-pages", action="store_true",
+                        help=f"每个顶层页面生成一个 {UNIT_FILE_PREFIX}<页面>.c，另外生成 {SPLIT_HEADER_NAME}，"
+                             "Easy_Menu_User.c 中只保留占位变量和 Easy_Menu_Ui_Init")
+    parser.add_argument("--user-header", action="store_true",
+                        help=f"同时生成 {USER_HEADER_NAME}：Easy_Menu_Ui_Data、页面和条目的 extern 声明以及条目数量宏")
+    parser.add_argument("--text-layout", action="store_true",
+                        help="与 --const-init 一起使用时在初始化器中写入预先计算的名称长度与标题位置"
+                             "（需要在 Easy_Menu.h 中将 TEXT_LAYOUT_PRECOMPUTE 设为 1），并输出文本布局检查的结果")
+    parser.add_argument("--value-format", action="store_true",
+                        help="检查 Easy_Menu.h 的 VALUE_FORMAT_TYPES 是否包含用到的数值类型（VALUE_FORMAT_MODE 为 1 时），"
+                             "并输出只含这些类型的设置")
+    parser.add_argument("--page-table", action="store_true",
+                        help="生成页面表，可以按序号跳转页面、查找上级和子页面（需要在 Easy_Menu.h 中将 PAGE_TABLE_MODE 设为 1），"
+                             f"与 --user-header 一起使用时在 {USER_HEADER_NAME} 中给出各页面的序号")
+    parser.add_argument("--anchors", action="store_true",
+                        help=f"在回调函数的 USER CODE BEGIN 标记中写入节点ID，改名、调整顺序或移动条目后仍能找回用户代码；"
+                             f"配置中缺少节点ID（属性“{NODE_ID_KEY}”）时自动分配并写回配置文件")
+    parser.add_argument("--columns", type=int, default=DEFAULT_SCREEN_COLUMNS,
+                        help=f"每行列数，即 Easy_Menu.h 中的 SCREEN_WIDTH / CHAR_WIDTH（默认 {DEFAULT_SCREEN_COLUMNS}），"
+                             "用于预计算文本布局和检查会被截断的名称")
+
+
+def generate_options_from_args(parser, args):
+    """由 add_generate_option_arguments 添加的选项构造 GenerateOptions，取值无效时由 parser 报错退出"""
+    if not 2 <= args.columns <= 255:
+        parser.error("每行列数须在 2 到 255 之间")
+    return GenerateOptions(const_init=args.const_init, string_pool=args.string_pool,
+                           sort_data_fields=args.sort_data_fields, pack_switches=args.pack_switches,
+                           split_pages=args.split_pages, user_header=args.user_header,
+                           text_layout=args.text_layout, screen_columns=args.columns,
+                           value_format=args.value_format, page_table=args.page_table, anchors=args.anchors)
+
+
+def main(argv=None):
+    """命令行入口"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        prog="easy-menu-gen",
+        description="根据 Easy Menu Builder 的 JSON 配置生成 Easy_Menu_User.c（无需启动图形界面）")
+    parser.add_argument("config", help="JSON 配置文件路径")
+    parser.add_argument("-o", "--output-dir", default=None,
+                        help="输出目录，默认为配置文件所在目录")
+    parser.add_argument("-e", "--encoding", default="gb2312", choices=["gb2312", "utf-8"],
+                        help="文件编码（默认 gb2312）")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"不使用增量生成缓存（{CACHE_DIR_NAME}），每次完整重新生成")
+    add_generate_option_arguments(parser)
+    parser.add_argument("--footprint", action="store_true",
+                        help="输出按页面子树统计的 Flash / RAM 占用估算")
+    parser.add_argument("--abi", default="",
+                        help="估算使用的类型大小，如 pointer=8,enum=1 或 Data_Item=40（默认按 32 位 Cortex-M）")
+    parser.add_argument("--periods", action="store_true",
+                        help="分析展示页面与展示条目的周期：超周期、同一 tick 最多刷新的条目数、CPU 负载估算与建议周期")
+    parser.add_argument("--lines", type=int, default=2,
+                        help="每屏显示的条目行数，即 Easy_Menu.h 中的 EASY_MENU_LINE_MAX_NUM（开启标题显示时减 1，默认 2）")
+    parser.add_argument("--period-costs", default="",
+                        help="周期分析使用的代价（微秒），如 tick=1000,callback=20,line=30,update=500")
+    parser.add_argument("--period-budget", type=float, default=10.0,
+                        help="周期分析的 CPU 负载预算（百分比，默认 10），超出时在报告中标出")
+    parser.add_argument("--font", default=None,
+                        help="HZK 或 BDF 中文字库，只取出菜单用到的字符生成 Easy_Menu_Glyphs.c / .h")
+    parser.add_argument("--glyph-size", default="16x16",
+                        help="中文字符的点阵大小，宽x高（默认 16x16）")
+    args = parser.parse_args(argv)
+    from footprint import estimate_footprint, format_footprint_report, generation_reports, parse_abi, text_layout_report
+    try:
+        abi = parse_abi(args.abi)
+        if args.font:
+            from glyphs import parse_glyph_size
+            glyph_width, glyph_height = parse_glyph_size(args.glyph_size)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.lines < 1:
+        parser.error("每屏条目行数须大于 0")
+    if args.periods:
+        from periods import parse_costs
+        try:
+            period_costs = parse_costs(args.period_costs)
+        except ValueError as e:
+            parser.error(str(e))
+    options = generate_options_from_args(parser, args)
+    
+    config_path = os.path.abspath(args.config)
+    output_dir = args.output_dir or os.path.dirname(config_path)
+    basename = os.path.splitext(os.path.basename(config_path))[0]
+    
+    try:
+        tree_data = load_config(config_path, args.encoding)
+        if options.anchors:
+            assigned = assign_node_ids(tree_data)
+            if assigned:
+                # 节点ID必须保存在配置中，下次生成时才能对应
+                write_text_if_changed(config_path, json.dumps(tree_data, ensure_ascii=False, indent=2), args.encoding)
+                print(f"已为 {assigned} 个节点分配节点ID，并写回配置文件: {config_path}")
+        os.makedirs(output_dir, exist_ok=True)
+        c_file_path = os.path.join(output_dir, "Easy_Menu_User.c")
+        cache_dir = None if args.no_cache else default_cache_dir(c_file_path)
+        changed = generate_c_file(tree_data, c_file_path, basename, args.encoding, cache_dir, options)
+    except (OSError, ValueError) as e:
+        print(f"生成失败: {e}", file=sys.stderr)
+        return 1
+    
+    if changed:
+        print(f"C代码已生成到: {c_file_path}")
+    else:
+        print(f"C代码未变化: {c_file_path}")
+    
+    generator = MenuCodeGenerator(options)
+    generator.collect(tree_data)
+    if options.split_pages:
+        for path in find_stale_unit_files(c_file_path, split_file_paths(generator, c_file_path)[1]):
+            print(f"注意: {path} 已不对应任何顶层页面，请确认其中的代码后手动删除", file=sys.stderr)
+    for path, orig_path in merge_conflict_files(generator, c_file_path, cache_dir):
+        print(f"注意: {path} 中有手工修改与新生成的代码冲突，已按生成的代码处理，合并前的文件保存在 {orig_path}",
+              file=sys.stderr)
+    for report in generation_reports(generator, args.encoding):
+        print(report)
+    layout_report = text_layout_report(generator, args.encoding)
+    if layout_report is not None:
+        print(layout_report, file=sys.stderr)
+    if options.text_layout and options.const_init and args.encoding != 'gb2312':
+        print("注意: 预计算的文本布局按 GB2312 编码计算，菜单字符串需要以 GB2312 编码生成", file=sys.stderr)
+    if args.footprint:
+        print(format_footprint_report(estimate_footprint(generator, args.encoding, abi)))
+    if args.periods:
+        from periods import analyze_periods, format_period_report
+        schedules = analyze_periods(generator, args.lines, period_costs, args.period_budget)
+        print(format_period_report(schedules, args.lines, period_costs, args.period_budget))
+    if args.font:
+        from glyphs import build_glyph_table, format_glyph_report, write_glyph_files
+        try:
+            table = build_glyph_table(generator, args.font, glyph_width, glyph_height)
+            write_glyph_files(table, output_dir, args.encoding)
+        except (OSError, ValueError) as e:
+            print(f"字库裁剪失败: {e}", file=sys.stderr)
+            return 1
+        print(format_glyph_report(table))
+        if args.encoding != 'gb2312':
+            print("注意: 字形表按 GB2312 编码查找，菜单字符串需要以 GB2312 编码生成", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,647 @@
+"""
+Easy Menu - 占用空间估算
+按目标平台的基本类型大小与对齐规则计算菜单运行时（menu_core）各结构体的大小，
+用于估算生成代码的 RAM / Flash 占用。默认按 Cortex-M（ARM EABI）计算
+
+同时提供各生成选项（const_init、string_pool 等）的空间估算与生成后输出的报告
+"""
+
+import unicodedata
+from collections import Counter
+from typing import NamedTuple
+
+from codegen import VAR_TYPES, ItemKind, MenuCodeGenerator, iter_subtree, value_format_types_expr
+from text_layout import check_text_layout, format_text_layout_report
+
+
+class Abi(NamedTuple):
+    """目标平台基本类型的大小（字节），对齐与大小相同"""
+    char: int = 1
+    short: int = 2
+    int: int = 4
+    float: int = 4
+    pointer: int = 4
+    enum: int = 4       # 未使用 -fshort-enums 时枚举与 int 相同
+    structs: tuple = () # 直接指定大小的结构体：((结构体名, 大小), ...)，对齐仍按字段计算
+
+
+DEFAULT_ABI = Abi()
+
+# 运行时结构体的字段，须与 menu_core 中的定义保持一致：(字段名, 基本类型 / 结构体名 / 联合体名)
+STRUCT_FIELDS = {
+    "Page": [("type", "enum"), ("text", "pointer"), ("prev_page", "pointer"),
+             ("Enter", "pointer"), ("Display", "pointer"), ("Input", "pointer"), ("Exit", "pointer")],
+    "Item": [("type", "enum"), ("text", "pointer"), ("parent_page", "pointer"), ("Input", "pointer")],
+    "Ordinary_Page": [("page", "Page"), ("items", "pointer"), ("item_num", "char"), ("items_index", "char"),
+                      ("cursor", "char"), ("Refresh", "pointer")],
+    "Show_Page": [("page", "Page"), ("period", "short"), ("last_tick", "int"), ("Enter_Callback", "pointer"),
+                  ("Period_Callback", "pointer"), ("Exit_Callback", "pointer")],
+    "Text_Item": [("item", "Item"), ("Callback", "pointer")],
+    "Switch_Item": [("item", "Item"), ("data", "pointer"), ("Callback", "pointer")],
+    # SWITCH_ITEM_BIT_PACK 为 1 时的 Switch_Item
+    "Switch_Item_Bit": [("item", "Item"), ("data", "pointer"), ("mask", "char"), ("Callback", "pointer")],
+    # has_step / has_min / has_max 三个位域共用一个 unsigned char
+    "Data_Item": [("item", "Item"), ("data_type", "enum"), ("data", "pointer"), ("step", "Data_Item_Value"),
+                  ("min", "Data_Item_Value"), ("max", "Data_Item_Value"), ("flags", "char"),
+                  ("Callback", "pointer")],
+    "Enum_Item": [("item", "Item"), ("enum_str", "pointer"), ("enum_num", "char"), ("enum_str_index", "char"),
+                  ("Callback", "pointer")],
+    "Show_Item": [("item", "Item"), ("data_type", "enum"), ("data", "pointer"), ("period", "short"),
+                  ("last_tick", "int"), ("Callback", "pointer")],
+    "Goto_Item": [("item", "Item"), ("target_page", "pointer")],
+    # PAGE_TABLE_MODE 为 1 时页面表的一项
+    "Page_Table_Entry": [("page", "pointer"), ("parent", "char"), ("child_index", "char"), ("child_num", "char")],
+}
+
+UNION_MEMBERS = {
+    "Data_Item_Value": ["char", "short", "int", "float"],
+}
+
+# 占位变量的 C 类型对应的基本类型
+C_TYPE_BASES = {
+    "unsigned char": "char",
+    "signed char": "char",
+    "unsigned short int": "short",
+    "signed short int": "short",
+    "unsigned int": "int",
+    "signed int": "int",
+    "float": "float",
+}
+
+
+BASE_TYPES = Abi._fields[:-1]
+
+
+def parse_abi(spec, base=DEFAULT_ABI):
+    """
+    解析 "pointer=8,enum=1,Data_Item=40" 形式的目标平台描述，未给出的项取 base 中的值
+    键为基本类型时指定其大小，为结构体名时直接指定该结构体的大小（例如按 map 文件中的实际大小）
+    """
+    sizes = {}
+    structs = dict(base.structs)
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, value = part.partition("=")
+        name = name.strip()
+        try:
+            size = int(value, 0)
+        except ValueError:
+            raise ValueError(f"ABI 描述中 {name} 的大小不是整数: {value.strip()!r}") from None
+        if size <= 0:
+            raise ValueError(f"ABI 描述中 {name} 的大小必须为正数")
+        if name in BASE_TYPES:
+            sizes[name] = size
+        elif name in STRUCT_FIELDS:
+            structs[name] = size
+        else:
+            raise ValueError(f"ABI 描述中有未知的类型: {name}（可选: {', '.join(BASE_TYPES + tuple(STRUCT_FIELDS))}）")
+    return base._replace(structs=tuple(sorted(structs.items())), **sizes)
+
+
+def describe_abi(abi):
+    """报告中使用的目标平台说明"""
+    if abi == DEFAULT_ABI:
+        return "32 位 Cortex-M"
+    changed = [f"{name}={getattr(abi, name)}" for name in BASE_TYPES if getattr(abi, name) != getattr(DEFAULT_ABI, name)]
+    changed += [f"{name}={size}" for name, size in abi.structs]
+    return ", ".join(changed)
+
+
+def align_up(offset, alignment):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def type_layout(type_name, abi=DEFAULT_ABI):
+    """返回 (大小, 对齐)，type_name 可以是基本类型、C 类型、结构体名或联合体名"""
+    type_name = C_TYPE_BASES.get(type_name, type_name)
+    if type_name in BASE_TYPES:
+        size = getattr(abi, type_name)
+        return size, size
+    if type_name in UNION_MEMBERS:
+        layouts = [type_layout(member, abi) for member in UNION_MEMBERS[type_name]]
+        alignment = max(align for _, align in layouts)
+        return align_up(max(size for size, _ in layouts), alignment), alignment
+    size, alignment = fields_layout([field_type for _, field_type in STRUCT_FIELDS[type_name]], abi)
+    return dict(abi.structs).get(type_name, size), alignment
+
+
+def fields_layout(field_types, abi=DEFAULT_ABI):
+    """按给定顺序排列字段时结构体的 (大小, 对齐)，包括字段间与结尾的填充"""
+    offset = 0
+    alignment = 1
+    for field_type in field_types:
+        size, align = type_layout(field_type, abi)
+        offset = align_up(offset, align) + size
+        alignment = max(alignment, align)
+    return align_up(offset, alignment), alignment
+
+
+def struct_size(type_name, abi=DEFAULT_ABI):
+    return type_layout(type_name, abi)[0]
+
+
+# TEXT_LAYOUT_PRECOMPUTE 为 1 时增加的字段：结构体名 -> (前一个字段名, 增加的字段)
+TEXT_LAYOUT_FIELDS = {
+    "Page": ("prev_page", ("text_len", "char")),
+    "Item": ("parent_page", ("text_len", "char")),
+    "Ordinary_Page": ("cursor", ("title_x", "char")),
+}
+
+# PAGE_TABLE_MODE 为 1 时增加的字段
+PAGE_TABLE_FIELDS = {
+    "Page": ("prev_page", ("id", "char")),
+}
+
+
+def optional_fields_abi(abi=DEFAULT_ABI, *field_sets):
+    """
+    开启可选字段后的结构体大小：把增加字段后的大小作为结构体大小写入 abi（已指定大小的结构体不变）
+    field_sets 按字段在结构体中的先后顺序给出，插入同一位置的字段依次排在前面加入的字段之后
+    """
+    fields = {}
+    inserted = set()
+    for field_set in field_sets:
+        for type_name, (after, field) in field_set.items():
+            if type_name in dict(abi.structs):
+                continue
+            type_fields = fields.setdefault(type_name, list(STRUCT_FIELDS[type_name]))
+            index = [name for name, _ in type_fields].index(after) + 1
+            while index < len(type_fields) and (type_name, type_fields[index][0]) in inserted:
+                index += 1
+            type_fields.insert(index, field)
+            inserted.add((type_name, field[0]))
+    
+    # STRUCT_FIELDS 中基类在前，派生结构体按更新后的基类大小计算
+    structs = dict(abi.structs)
+    for type_name in STRUCT_FIELDS:
+        if type_name in fields:
+            layout_abi = abi._replace(structs=tuple(structs.items()))
+            structs[type_name] = fields_layout([field_type for _, field_type in fields[type_name]], layout_abi)[0]
+    return abi._replace(structs=tuple(sorted(structs.items())))
+
+
+# ---------------------------------------------------------------- 初始化代码估算 ----------------------------------------------------------------
+# 各 *_Init 函数的参数个数
+INIT_FUNCTION_ARGS = {
+    "Ordinary_Page_Init": 5,
+    "Show_Page_Init": 7,
+    "Text_Item_Init": 4,
+    "Switch_Item_Init": 5,
+    "Switch_Item_Bit_Init": 6,
+    "Data_Item_Init": 12,
+    "Enum_Item_Init": 6,
+    "Show_Item_Init": 7,
+    "Goto_Item_Init": 4,
+}
+
+# Thumb-2 下一次调用的粗略代价：BL 指令 4 字节；前 4 个参数用寄存器传递，每个约为一条装载指令加一个文字池项，
+# 其余参数经栈传递，还需要一条存储指令
+CALL_BYTES = 4
+REGISTER_ARG_BYTES = 6
+STACK_ARG_BYTES = 8
+
+
+def init_call_bytes(function_name):
+    """估算一次 *_Init 调用在调用处占用的代码字节数"""
+    args = INIT_FUNCTION_ARGS[function_name]
+    register_args = min(args, 4)
+    return CALL_BYTES + register_args * REGISTER_ARG_BYTES + (args - register_args) * STACK_ARG_BYTES
+
+
+# ---------------------------------------------------------------- 按类别统计 ----------------------------------------------------------------
+class Footprint:
+    """一部分代码或数据按类别统计的 Flash / RAM 占用（字节数为估算值）"""
+    __slots__ = ("flash", "ram")
+
+    def __init__(self):
+        self.flash = Counter()
+        self.ram = Counter()
+
+    def add(self, category, flash=0, ram=0):
+        self.flash[category] += flash
+        self.ram[category] += ram
+
+    def addInitialized(self, category, size):
+        """有初值的可写数据：运行时位于 RAM，初值在 Flash 中另占同样大小，启动时复制"""
+        self.add(category, size, size)
+
+    def merge(self, other):
+        self.flash.update(other.flash)
+        self.ram.update(other.ram)
+        return self
+
+    @property
+    def flash_bytes(self):
+        return sum(self.flash.values())
+
+    @property
+    def ram_bytes(self):
+        return sum(self.ram.values())
+
+
+# ----------------------------------------------------------- 生成选项的估算与报告 -----------------------------------------------------------
+def data_field_types(generator, abi=DEFAULT_ABI):
+    """Easy_Menu_Ui_Data 各字段的类型（按输出顺序，开关字节数组按字节展开），用于计算结构体大小"""
+    return ([var_info.c_type for _, var_info in generator.dataFields(abi)]
+            + ["char"] * len(generator.switchBitBytes()))
+
+
+class ConstInitSavings(NamedTuple):
+    """const_init 模式相对于 *_Init 调用的节省（字节数为估算值）"""
+    init_calls: int         # 不再需要的 *_Init 调用次数
+    init_code_bytes: int    # 这些调用占用的代码
+    const_bytes: int        # 从 RAM 移入 Flash 的 const 条目与设置列表
+    data_bytes: int         # 仍在 RAM 中的页面与枚举、展示条目（其初值另在 Flash 中占用同样大小）
+
+
+def estimate_const_init_savings(generator, abi=DEFAULT_ABI):
+    """按已收集的信息估算 const_init 模式的节省，与 generator 当前的生成选项无关"""
+    # 只用于判断条目能否初始化、是否为 const，与字符串的写法无关
+    const_generator = MenuCodeGenerator(generator.options._replace(const_init=True, string_pool=False))
+    init_calls = init_code_bytes = const_bytes = data_bytes = 0
+    
+    for page in generator.pages:
+        init_calls += 1
+        init_code_bytes += init_call_bytes(f"{page.struct}_Init")
+        data_bytes += struct_size(page.struct, abi)
+        if page.items:
+            const_bytes += abi.pointer * len(page.items)
+        
+        for item in page.items:
+            if const_generator._itemInitLine(item) is None:
+                continue
+            init_calls += 1
+            init_code_bytes += init_call_bytes(f"{item.struct}_Init")
+            if const_generator._isConstItem(item):
+                const_bytes += struct_size(item.struct, abi)
+            else:
+                data_bytes += struct_size(item.struct, abi)
+    
+    return ConstInitSavings(init_calls, init_code_bytes, const_bytes, data_bytes)
+
+
+def format_const_init_report(savings):
+    """把 ConstInitSavings 整理成可读的报告"""
+    flash_delta = savings.const_bytes + savings.data_bytes - savings.init_code_bytes
+    return "\n".join([
+        "ROM 常量初始化（按 32 位 Cortex-M 估算）:",
+        f"  去掉 {savings.init_calls} 次 *_Init 调用，初始化代码约减少 {savings.init_code_bytes} 字节",
+        f"  const 条目与设置列表共 {savings.const_bytes} 字节从 RAM 移入 Flash",
+        f"  页面与枚举/展示条目共 {savings.data_bytes} 字节运行时会被修改，仍在 RAM 中，初值在 Flash 中另占同样大小",
+        f"  合计: RAM 减少 {savings.const_bytes} 字节，Flash 约 {flash_delta:+d} 字节，启动时不再执行初始化调用",
+    ])
+
+
+class StringPoolSavings(NamedTuple):
+    """string_pool 模式相对于逐处写字符串字面量的节省（按字面量不被编译器合并计算）"""
+    strings: int            # 字符串出现次数
+    unique_strings: int     # 去重后的字符串数
+    string_bytes: int       # 去重节省的字符串字节数
+    enum_arrays: int        # 枚举数组个数
+    shared_arrays: int      # 共用后的枚举数组个数
+    array_bytes: int        # 共用枚举数组节省的指针字节数
+    ram_bytes: int          # 原来位于 RAM 中的枚举数组字节数（共用后的数组为 const，放入 Flash）
+
+
+def _encoded_size(text, encoding):
+    """字符串在目标文件编码下占用的字节数（含结尾的 0），无法编码时按 UTF-8 计算"""
+    try:
+        return len(text.encode(encoding)) + 1
+    except UnicodeEncodeError:
+        return len(text.encode('utf-8')) + 1
+
+
+def estimate_string_pool_savings(generator, encoding='gb2312', abi=DEFAULT_ABI):
+    """按已收集的信息估算 string_pool 模式的节省，与 generator 当前的生成选项无关"""
+    strings = []
+    arrays = []
+    for page in generator.pages:
+        strings.append(page.display_name)
+        for item in page.items:
+            strings.append(item.display_name)
+            if item.enum_array:
+                strings.extend(item.enum_strings)
+                arrays.append(tuple(item.enum_strings))
+    unique = set(strings)
+    shared = set(arrays)
+    
+    string_bytes = (sum(_encoded_size(text, encoding) for text in strings)
+                    - sum(_encoded_size(text, encoding) for text in unique))
+    array_pointers = sum(len(array) for array in arrays)
+    array_bytes = (array_pointers - sum(len(array) for array in shared)) * abi.pointer
+    return StringPoolSavings(len(strings), len(unique), string_bytes, len(arrays), len(shared),
+                             array_bytes, array_pointers * abi.pointer)
+
+
+def format_string_pool_report(savings):
+    """把 StringPoolSavings 整理成可读的报告"""
+    return "\n".join([
+        "字符串池（按 32 位 Cortex-M 估算）:",
+        f"  {savings.strings} 处字符串去重为 {savings.unique_strings} 个，节省 {savings.string_bytes} 字节",
+        f"  {savings.enum_arrays} 个枚举数组共用为 {savings.shared_arrays} 个，节省 {savings.array_bytes} 字节",
+        f"  枚举数组改为 const，RAM 减少 {savings.ram_bytes} 字节",
+        f"  合计: Flash 约减少 {savings.string_bytes + savings.array_bytes} 字节"
+        f"（编译器本身会合并同一文件中相同的字面量时，字符串部分的实际节省更少）",
+    ])
+
+
+class DataLayoutSavings(NamedTuple):
+    """sort_data_fields 模式前后 Easy_Menu_Ui_Data 的大小"""
+    fields: int
+    size_before: int
+    size_after: int
+
+
+def estimate_data_layout_savings(generator, abi=DEFAULT_ABI):
+    """按已收集的信息计算 Easy_Menu_Ui_Data 按配置顺序与按对齐排序时的大小"""
+    layouts = []
+    for sort_data_fields in (False, True):
+        layout_generator = MenuCodeGenerator(generator.options._replace(sort_data_fields=sort_data_fields))
+        layout_generator.variables = generator.variables
+        layout_generator.switch_bits = generator.switch_bits
+        layouts.append(fields_layout(data_field_types(layout_generator, abi), abi)[0])
+    return DataLayoutSavings(len(generator.variables), *layouts)
+
+
+def format_data_layout_report(savings):
+    """把 DataLayoutSavings 整理成可读的报告"""
+    return "\n".join([
+        "数据字段排序（按 32 位 Cortex-M 估算）:",
+        f"  Easy_Menu_Ui_Data 共 {savings.fields} 个字段，按配置顺序 {savings.size_before} 字节，"
+        f"按对齐排序后 {savings.size_after} 字节，RAM 减少 {savings.size_before - savings.size_after} 字节",
+    ])
+
+
+class SwitchPackSavings(NamedTuple):
+    """pack_switches 模式的 RAM 变化"""
+    switches: int           # 开关条目数
+    packed: int             # 按位存放的数据变量数
+    data_before: int        # Easy_Menu_Ui_Data 原来的大小
+    data_after: int         # 按位存放后的大小
+    struct_bytes: int       # Switch_Item 增加 mask 字段后多占用的字节数
+    struct_in_ram: int      # 其中仍位于 RAM 的部分（const 条目位于 Flash）
+    unpacked: list          # 只由开关条目使用、但初始值不是 0 或 1 而仍按字节存放的数据变量
+
+
+def estimate_switch_pack_savings(generator, abi=DEFAULT_ABI):
+    """按已收集的信息估算 pack_switches 模式的 RAM 变化，与 generator 当前的生成选项无关"""
+    # 只用于判断条目是否为 const，与字符串的写法无关（没有收集字符串池）
+    pack_generator = MenuCodeGenerator(generator.options._replace(pack_switches=True, string_pool=False))
+    pack_generator.pages = generator.pages
+    pack_generator.variables = generator.variables
+    pack_generator.buildSwitchBits()
+    plain_generator = MenuCodeGenerator(generator.options._replace(pack_switches=False))
+    plain_generator.variables = generator.variables
+    
+    switches = [item for page in generator.pages for item in page.items if item.kind == ItemKind.SWITCH]
+    growth = struct_size("Switch_Item_Bit", abi) - struct_size("Switch_Item", abi)
+    in_ram = sum(1 for item in switches if not pack_generator._isConstItem(item))
+    shared = {item.data_var for page in generator.pages for item in page.items if item.kind != ItemKind.SWITCH}
+    unpacked = [data_var for data_var in dict.fromkeys(item.data_var for item in switches if item.data_var)
+                if data_var not in pack_generator.switch_bits and data_var not in shared]
+    return SwitchPackSavings(len(switches), len(pack_generator.switch_bits),
+                             fields_layout(data_field_types(plain_generator, abi), abi)[0],
+                             fields_layout(data_field_types(pack_generator, abi), abi)[0],
+                             growth * len(switches), growth * in_ram, unpacked)
+
+
+def format_switch_pack_report(savings):
+    """把 SwitchPackSavings 整理成可读的报告"""
+    ram_delta = savings.data_before - savings.data_after - savings.struct_in_ram
+    lines = [
+        "开关按位存放（按 32 位 Cortex-M 估算）:",
+        f"  {savings.switches} 个开关条目中 {savings.packed} 个的数据按位存放，"
+        f"Easy_Menu_Ui_Data 从 {savings.data_before} 字节减少到 {savings.data_after} 字节",
+        f"  Switch_Item 增加 mask 字段，共多占用 {savings.struct_bytes} 字节，"
+        f"其中 {savings.struct_in_ram} 字节位于 RAM（其余为 Flash 中的 const 条目）",
+        f"  合计: RAM {-ram_delta:+d} 字节",
+    ]
+    if savings.struct_in_ram:
+        lines.append("  与 ROM 常量初始化一起使用时，Switch_Item 位于 Flash，不再占用 RAM")
+    if savings.unpacked:
+        lines.append(f"  注意: {len(savings.unpacked)} 个开关数据的初始值不是 0 或 1，按位存放会改变开关的行为，"
+                     f"仍按字节存放: {', '.join(savings.unpacked)}")
+    return "\n".join(lines)
+
+
+# 空间估算的类别
+FOOTPRINT_CATEGORIES = {
+    "pages": "页面",
+    "items": "条目",
+    "setup_lists": "设置列表",
+    "strings": "字符串",
+    "enum_arrays": "枚举数组",
+    "data": "占位变量",
+    "init_code": "初始化代码",
+    "page_table": "页面表",
+}
+
+
+class FootprintEstimate(NamedTuple):
+    """按页面统计的空间估算"""
+    abi: object             # 估算使用的 Abi
+    roots: list             # 顶层页面（PageDef）
+    pages: dict             # PageDef -> Footprint，只含页面本身及其条目，不含子页面
+    shared: Footprint       # 不属于任何页面的部分：Easy_Menu_Ui_Data 的填充与开关字节数组
+
+
+def estimate_footprint(generator, encoding='gb2312', abi=DEFAULT_ABI):
+    """
+    按已收集的信息和 generator 的生成选项估算生成代码占用的 Flash / RAM，按页面分别统计
+    字符串池中的字符串、共用的枚举数组与占位变量计入第一个使用它的页面（split_pages 模式下各文件单独建立字符串池）；
+    不含菜单框架与回调函数的代码
+    """
+    options = generator.options
+    report_abi = abi
+    abi = optional_fields_abi(abi, *(fields for enabled, fields in ((options.text_layout, TEXT_LAYOUT_FIELDS),
+                                                                    (options.page_table, PAGE_TABLE_FIELDS))
+                                     if enabled))
+    seen_strings = set()
+    seen_arrays = set()
+    seen_variables = set()
+    pages = {}
+    data_bytes = 0
+    
+    def add_string(footprint, text):
+        if options.string_pool:
+            if text in seen_strings:
+                return
+            seen_strings.add(text)
+        footprint.add("strings", flash=_encoded_size(text, encoding))
+    
+    for page in generator.pages:
+        if options.split_pages and page.parent is None:
+            seen_strings.clear()
+            seen_arrays.clear()
+        footprint = pages[page] = Footprint()
+        if options.const_init:
+            footprint.addInitialized("pages", struct_size(page.struct, abi))
+        else:
+            footprint.add("pages", ram=struct_size(page.struct, abi))
+            footprint.add("init_code", flash=init_call_bytes(f"{page.struct}_Init"))
+        add_string(footprint, page.display_name)
+        if options.page_table:
+            # 页面表中的一项，以及在上级页面子页面序号中的一项
+            footprint.add("page_table", flash=struct_size("Page_Table_Entry", abi) + (page.parent is not None))
+        
+        if page.items:
+            list_bytes = abi.pointer * len(page.items)
+            if options.const_init:
+                footprint.add("setup_lists", flash=list_bytes)
+            else:
+                footprint.addInitialized("setup_lists", list_bytes)
+        
+        for item in page.items:
+            add_string(footprint, item.display_name)
+            # SWITCH_ITEM_BIT_PACK 为 1 时所有开关条目都带 mask 字段
+            struct = "Switch_Item_Bit" if options.pack_switches and item.kind == ItemKind.SWITCH else item.struct
+            size = struct_size(struct, abi)
+            init_line = generator._itemInitLine(item)
+            if init_line is None:
+                footprint.add("items", ram=size)
+            elif not options.const_init:
+                footprint.add("items", ram=size)
+                footprint.add("init_code", flash=init_call_bytes(init_line[:init_line.index("(")]))
+            elif generator._isConstItem(item):
+                footprint.add("items", flash=size)
+            else:
+                footprint.addInitialized("items", size)
+            
+            if item.enum_array:
+                for string in item.enum_strings:
+                    add_string(footprint, string)
+                array_bytes = abi.pointer * len(item.enum_strings)
+                if not options.string_pool:
+                    footprint.addInitialized("enum_arrays", array_bytes)
+                elif tuple(item.enum_strings) not in seen_arrays:
+                    seen_arrays.add(tuple(item.enum_strings))
+                    footprint.add("enum_arrays", flash=array_bytes)
+            
+            if item.data_var in generator.variables and item.data_var not in generator.switch_bits \
+                    and item.data_var not in seen_variables:
+                seen_variables.add(item.data_var)
+                size = type_layout(generator.variables[item.data_var].c_type, abi)[0]
+                footprint.addInitialized("data", size)
+                data_bytes += size
+    
+    # 没有条目使用的占位变量不会出现（变量只由条目收集），剩下的是字段间的填充与开关字节数组
+    shared = Footprint()
+    shared.addInitialized("data", fields_layout(data_field_types(generator, abi), abi)[0] - data_bytes)
+    if options.page_table and generator.pages:
+        # Easy_Menu_Page_Num，没有子页面时子页面序号数组中的占位项
+        shared.add("page_table", flash=1 + (not any(page.child_pages for page in generator.pages)))
+    return FootprintEstimate(report_abi, list(generator.root_pages), pages, shared)
+
+
+def subtree_footprint(estimate, page):
+    """页面及其所有子页面的占用之和"""
+    total = Footprint()
+    for child in iter_subtree(page):
+        total.merge(estimate.pages[child])
+    return total
+
+
+def total_footprint(estimate):
+    """所有页面与共用部分的占用之和"""
+    total = Footprint().merge(estimate.shared)
+    for footprint in estimate.pages.values():
+        total.merge(footprint)
+    return total
+
+
+def _text_width(text):
+    """文本的显示宽度（中文字符占两列）"""
+    return sum(2 if unicodedata.east_asian_width(char) in "WF" else 1 for char in text)
+
+
+def _ljust(text, width):
+    return text + " " * max(width - _text_width(text), 0)
+
+
+def _rjust(text, width):
+    return " " * max(width - _text_width(text), 0) + text
+
+
+def format_footprint_report(estimate):
+    """把 FootprintEstimate 整理成可读的报告：每个页面自身与所在子树的占用，以及按类别的合计"""
+    lines = [f"空间估算（按 {describe_abi(estimate.abi)} 估算，不含菜单框架与回调函数的代码）:",
+             f"  {_ljust('页面', 40)}{'Flash':>8}{'RAM':>8}{_rjust('子树Flash', 12)}{_rjust('子树RAM', 10)}"]
+    
+    def add_page(page, depth):
+        own = estimate.pages[page]
+        subtree = subtree_footprint(estimate, page)
+        lines.append(f"  {_ljust('  ' * depth + page.var_name, 40)}{own.flash_bytes:>8}{own.ram_bytes:>8}"
+                     f"{subtree.flash_bytes:>12}{subtree.ram_bytes:>10}")
+        for child in page.child_pages:
+            add_page(child, depth + 1)
+    
+    for root in estimate.roots:
+        add_page(root, 0)
+    shared = estimate.shared
+    lines.append(f"  {_ljust('(Easy_Menu_Ui_Data 填充与开关字节)', 40)}{shared.flash_bytes:>8}{shared.ram_bytes:>8}")
+    
+    total = total_footprint(estimate)
+    lines.append("  按类别:")
+    for category, name in FOOTPRINT_CATEGORIES.items():
+        lines.append(f"    {_ljust(name, 12)}Flash {total.flash[category]:>7}  RAM {total.ram[category]:>7}")
+    lines.append(f"  合计: Flash 约 {total.flash_bytes} 字节，RAM 约 {total.ram_bytes} 字节"
+                 "（有初值的 RAM 数据在 Flash 中另有一份初值，已计入 Flash）")
+    return "\n".join(lines)
+
+
+def format_value_format_report(generator):
+    """value_format 模式：数据、展示条目用到的数值类型以及 VALUE_FORMAT_TYPES 的建议设置"""
+    groups = generator.valueFormatTypes()
+    used = {item.var_type.c_type for page in generator.pages for item in page.items
+            if item.kind in (ItemKind.DATA, ItemKind.SHOW) and item.data_var}
+    c_types = [var_type.c_type for var_type in VAR_TYPES.values() if var_type.c_type in used]
+    lines = ["数值格式化（VALUE_FORMAT_MODE 为 1 时）:",
+             f"  数据、展示条目用到的类型: {'、'.join(c_types) or '无'}",
+             f"  在 Easy_Menu.h 中设置: #define VALUE_FORMAT_TYPES  {value_format_types_expr(groups)}"]
+    if "VALUE_FORMAT_FLOAT" not in groups:
+        lines.append("  没有 float 数值，不会编译浮点格式化函数")
+    return "\n".join(lines)
+
+
+def format_page_table_report(generator, abi=DEFAULT_ABI):
+    """page_table 模式：页面表的大小"""
+    entries, children = generator.pageTable()
+    table_bytes = len(entries) * struct_size("Page_Table_Entry", abi) + max(len(children), 1) + 1
+    # 序号字段可能与 TEXT_LAYOUT_PRECOMPUTE 的字段共用填充
+    field_sets = [TEXT_LAYOUT_FIELDS] if generator.options.text_layout else []
+    page_bytes = (struct_size("Page", optional_fields_abi(abi, *field_sets, PAGE_TABLE_FIELDS))
+                  - struct_size("Page", optional_fields_abi(abi, *field_sets)))
+    return "\n".join([
+        f"页面表（PAGE_TABLE_MODE 为 1 时，按 {describe_abi(abi)} 估算）:",
+        f"  {len(entries)} 个页面，{len(children)} 个子页面序号，页面表约占 {table_bytes} 字节 Flash",
+        f"  页面增加序号字段后每个页面多占 {page_bytes} 字节，共 {page_bytes * len(entries)} 字节",
+    ])
+
+
+def generation_reports(generator, encoding='gb2312'):
+    """按 generator 的生成选项返回各项空间报告（文本列表），没有开启相关选项时为空列表"""
+    options = generator.options
+    reports = []
+    if options.const_init:
+        reports.append(format_const_init_report(estimate_const_init_savings(generator)))
+    if options.string_pool:
+        reports.append(format_string_pool_report(estimate_string_pool_savings(generator, encoding)))
+    if options.sort_data_fields:
+        reports.append(format_data_layout_report(estimate_data_layout_savings(generator)))
+    if options.pack_switches:
+        reports.append(format_switch_pack_report(estimate_switch_pack_savings(generator)))
+    if options.value_format:
+        reports.append(format_value_format_report(generator))
+    if options.page_table:
+        reports.append(format_page_table_report(generator))
+    return reports
+
+
+def text_layout_report(generator, encoding='gb2312'):
+    """开启 text_layout 时文本布局检查的结果，未开启时不做检查，返回 None"""
+    options = generator.options
+    if not options.text_layout:
+        return None
+    return format_text_layout_report(check_text_layout(generator, options.screen_columns, encoding),
+                                     options.screen_columns)
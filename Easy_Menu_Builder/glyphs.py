@@ -0,0 +1,271 @@
+"""
+Easy Menu - 中文字库裁剪
+收集菜单中所有显示名称与枚举字符串用到的 GB2312 双字节字符，从完整的 HZK 点阵字库或 BDF 字库中
+只取出这些字符的点阵，生成 Easy_Menu_Glyphs.c / Easy_Menu_Glyphs.h：按 GB2312 编码排序的字形表和查找函数
+Easy_Menu_Find_Glyph()，供 Display_Chinese_Char 使用，不必再把整个字库放进 Flash
+
+点阵格式与 HZK 相同：逐行存放，每行 (宽度 + 7) / 8 个字节，高位在左
+"""
+
+import os
+from typing import NamedTuple
+
+from codegen import GENERATED_MARK, write_file_if_changed
+
+GLYPH_FILE_NAME = "Easy_Menu_Glyphs"
+
+# GB2312 分区：区码、位码都从 0xA1 到 0xFE，每区 94 个字符
+GB2312_FIRST = 0xA1
+GB2312_ROW_SIZE = 94
+
+# 常见的中文点阵大小（宽x高），配置器中可选，也可以输入其他大小
+GLYPH_SIZES = ("12x12", "16x16", "24x24", "32x32")
+DEFAULT_GLYPH_SIZE = "16x16"
+
+
+class GlyphTable(NamedTuple):
+    """裁剪后的字形表"""
+    width: int
+    height: int
+    codes: list             # 按编码排序的 GB2312 编码（区码 << 8 | 位码）
+    bitmaps: dict           # 编码 -> 点阵字节
+    missing: list           # 字库中找不到的字符
+    font_bytes: int         # 完整字库的点阵大小（字节）
+
+    @property
+    def glyph_bytes(self):
+        return (self.width + 7) // 8 * self.height
+
+    @property
+    def table_bytes(self):
+        """字形表占用的 Flash：点阵加上 2 字节的编码"""
+        return len(self.codes) * (self.glyph_bytes + 2)
+
+
+def collect_chinese_chars(generator):
+    """已收集信息的 generator 中所有显示名称与枚举字符串用到的非 ASCII 字符，按 GB2312 编码排序"""
+    chars = set()
+    for page in generator.pages:
+        texts = [page.display_name]
+        for item in page.items:
+            texts.append(item.display_name)
+            if item.enum_array:
+                texts.extend(item.enum_strings)
+        for text in texts:
+            chars.update(char for char in text if ord(char) > 0x7F)
+    return sorted(chars, key=lambda char: (gb2312_code(char) or 0x10000, char))
+
+
+def gb2312_code(char):
+    """字符的 GB2312 编码（区码 << 8 | 位码），不在 GB2312 中时返回 None"""
+    try:
+        encoded = char.encode('gb2312')
+    except UnicodeEncodeError:
+        return None
+    return encoded[0] << 8 | encoded[1]
+
+
+def parse_glyph_size(text):
+    """解析 "宽x高" 格式的点阵大小，返回 (宽, 高)，格式不对时抛出 ValueError"""
+    parts = text.strip().lower().split("x")
+    if len(parts) != 2 or not all(part.strip().isdigit() and int(part) > 0 for part in parts):
+        raise ValueError(f"点阵大小须为 宽x高，例如 {DEFAULT_GLYPH_SIZE}：{text}")
+    return int(parts[0]), int(parts[1])
+
+
+def load_hzk(font_path, width=16, height=16):
+    """
+    读取 HZK 点阵字库，返回 (按编码查找点阵的函数, 字库点阵大小)
+    HZK 按 GB2312 分区顺序存放从 A1A1 开始的所有字符，每个字符 (宽度 + 7) / 8 * 高度 字节
+    """
+    glyph_bytes = (width + 7) // 8 * height
+    with open(font_path, 'rb') as f:
+        data = f.read()
+    if len(data) % glyph_bytes:
+        raise ValueError(f"{font_path} 的大小不是 {width}x{height} 点阵（每字 {glyph_bytes} 字节）的整数倍")
+
+    def lookup(code):
+        area, position = code >> 8, code & 0xFF
+        if area < GB2312_FIRST or position < GB2312_FIRST:
+            return None
+        offset = ((area - GB2312_FIRST) * GB2312_ROW_SIZE + position - GB2312_FIRST) * glyph_bytes
+        bitmap = data[offset:offset + glyph_bytes]
+        return bitmap if len(bitmap) == glyph_bytes else None
+
+    return lookup, len(data)
+
+
+def load_bdf(font_path, width=16, height=16):
+    """
+    读取 BDF 字库，返回 (按编码查找点阵的函数, 字库点阵大小)
+    CHARSET_REGISTRY 为 GB2312 时 ENCODING 为去掉最高位的区位码，否则按 Unicode 码位查找；
+    各字符按 BBX 偏移放到 width x height 的点阵中（基线取 FONTBOUNDINGBOX），超出部分裁掉
+    """
+    glyphs = {}
+    registry = ""
+    font_box = (width, height, 0, 0)
+    encoding = None
+    box = None
+    rows = None
+    with open(font_path, 'r', encoding='latin-1') as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            keyword = parts[0]
+            if rows is not None:
+                if keyword == "ENDCHAR":
+                    if encoding is not None and encoding >= 0:
+                        glyphs[encoding] = (box or font_box, rows)
+                    rows = None
+                else:
+                    rows.append(parts[0])
+            elif keyword == "CHARSET_REGISTRY":
+                registry = line.split(None, 1)[1].strip().strip('"').upper()
+            elif keyword == "FONTBOUNDINGBOX":
+                font_box = tuple(int(value) for value in parts[1:5])
+            elif keyword == "STARTCHAR":
+                encoding = box = None
+            elif keyword == "ENCODING":
+                encoding = int(parts[1])
+            elif keyword == "BBX":
+                box = tuple(int(value) for value in parts[1:5])
+            elif keyword == "BITMAP":
+                rows = []
+
+    row_bytes = (width + 7) // 8
+    # 字库基线距点阵顶部的行数
+    baseline = font_box[1] + font_box[3]
+
+    def lookup(code):
+        if registry.startswith("GB2312"):
+            key = code & 0x7F7F
+        else:
+            key = ord(bytes([code >> 8, code & 0xFF]).decode('gb2312'))
+        glyph = glyphs.get(key)
+        if glyph is None:
+            return None
+        (glyph_width, glyph_height, x_offset, y_offset), hex_rows = glyph
+        bitmap = bytearray(row_bytes * height)
+        top = baseline - (glyph_height + y_offset)
+        for row_index, hex_row in enumerate(hex_rows[:glyph_height]):
+            y = top + row_index
+            if not 0 <= y < height:
+                continue
+            bits = int(hex_row, 16)
+            row_width = len(hex_row) * 4
+            for column in range(glyph_width):
+                x = x_offset - font_box[2] + column
+                if 0 <= x < width and bits >> (row_width - 1 - column) & 1:
+                    bitmap[y * row_bytes + x // 8] |= 0x80 >> (x % 8)
+        return bytes(bitmap)
+
+    return lookup, len(glyphs) * row_bytes * height
+
+
+def load_font(font_path, width=16, height=16):
+    """按扩展名读取字库：.bdf 为 BDF，其余按 HZK 点阵处理"""
+    if os.path.splitext(font_path)[1].lower() == ".bdf":
+        return load_bdf(font_path, width, height)
+    return load_hzk(font_path, width, height)
+
+
+def build_glyph_table(generator, font_path, width=16, height=16):
+    """从字库中取出 generator 用到的所有中文字符的点阵"""
+    lookup, font_bytes = load_font(font_path, width, height)
+    codes = []
+    bitmaps = {}
+    missing = []
+    for char in collect_chinese_chars(generator):
+        code = gb2312_code(char)
+        bitmap = lookup(code) if code is not None else None
+        if bitmap is None:
+            missing.append(char)
+            continue
+        codes.append(code)
+        bitmaps[code] = bitmap
+    return GlyphTable(width, height, codes, bitmaps, missing, font_bytes)
+
+
+def iter_glyph_header(table):
+    """Easy_Menu_Glyphs.h 的内容"""
+    guard = f"__{GLYPH_FILE_NAME.upper()}_H__"
+    yield f"#ifndef {guard}\n#define {guard}\n\n"
+    yield f"/* {GENERATED_MARK} */\n\n"
+    yield f"#define EASY_MENU_GLYPH_WIDTH   {table.width}\n"
+    yield f"#define EASY_MENU_GLYPH_HEIGHT  {table.height}\n"
+    yield f"#define EASY_MENU_GLYPH_BYTES   {table.glyph_bytes}     // 每个字符的点阵字节数，逐行存放，高位在左\n"
+    yield f"#define EASY_MENU_GLYPH_NUM     {len(table.codes)}\n\n"
+    yield "/* 查找 GB2312 双字节字符 ch[0]、ch[1] 的点阵，菜单中没有用到的字符返回 NULL */\n"
+    yield "const unsigned char *Easy_Menu_Find_Glyph(const char *ch);\n"
+    yield "\n#endif\n"
+
+
+def iter_glyph_source(table):
+    """Easy_Menu_Glyphs.c 的内容：按编码排序的编码表、点阵表和二分查找函数"""
+    yield f'#include <stddef.h>\n#include "{GLYPH_FILE_NAME}.h"\n\n'
+    yield f"/* {GENERATED_MARK} */\n\n"
+    if not table.codes:
+        yield "const unsigned char *Easy_Menu_Find_Glyph(const char *ch)\n{\n    (void)ch;\n    return NULL;\n}\n"
+        return
+
+    yield "static const unsigned short Easy_Menu_Glyph_Codes[EASY_MENU_GLYPH_NUM] = {\n"
+    for start in range(0, len(table.codes), 8):
+        yield "    " + ", ".join(f"0x{code:04X}" for code in table.codes[start:start + 8]) + ",\n"
+    yield "};\n\n"
+
+    yield "static const unsigned char Easy_Menu_Glyph_Data[EASY_MENU_GLYPH_NUM][EASY_MENU_GLYPH_BYTES] = {\n"
+    for code in table.codes:
+        char = bytes([code >> 8, code & 0xFF]).decode('gb2312')
+        values = ", ".join(f"0x{value:02X}" for value in table.bitmaps[code])
+        yield f"    {{{values}}}, /* {char} */\n"
+    yield "};\n\n"
+
+    yield """const unsigned char *Easy_Menu_Find_Glyph(const char *ch)
+{
+    unsigned short code = (unsigned short)((unsigned char)ch[0] << 8 | (unsigned char)ch[1]);
+    unsigned short low = 0;
+    unsigned short high = EASY_MENU_GLYPH_NUM;
+
+    while(low < high)
+    {
+        unsigned short middle = (unsigned short)((low + high) / 2);
+
+        if(Easy_Menu_Glyph_Codes[middle] == code)
+        {
+            return Easy_Menu_Glyph_Data[middle];
+        }
+        else if(Easy_Menu_Glyph_Codes[middle] < code)
+        {
+            low = middle + 1;
+        }
+        else
+        {
+            high = middle;
+        }
+    }
+    return NULL;
+}
+"""
+
+
+def write_glyph_files(table, output_dir, encoding='gb2312'):
+    """在 output_dir 中写入 Easy_Menu_Glyphs.h / .c，内容未变化的文件不改写，返回 {文件路径: 是否改写}"""
+    header_path = os.path.join(output_dir, f"{GLYPH_FILE_NAME}.h")
+    source_path = os.path.join(output_dir, f"{GLYPH_FILE_NAME}.c")
+    return {
+        header_path: write_file_if_changed(header_path, iter_glyph_header(table), encoding),
+        source_path: write_file_if_changed(source_path, iter_glyph_source(table), encoding),
+    }
+
+
+def format_glyph_report(table):
+    """字库裁剪的结果"""
+    lines = [
+        f"中文字库裁剪（{table.width}x{table.height} 点阵）:",
+        f"  菜单中用到 {len(table.codes) + len(table.missing)} 个中文字符，字形表 {table.table_bytes} 字节，"
+        f"完整字库 {table.font_bytes} 字节",
+    ]
+    if table.missing:
+        lines.append(f"  字库中没有（或不在 GB2312 中）的字符，Easy_Menu_Find_Glyph 返回 NULL: {''.join(table.missing)}")
+    return "\n".join(lines)
@@ -0,0 +1,587 @@
+"""
+Easy Menu - 增量生成
+在输出文件旁的缓存目录中记录每个页面的内容摘要、各部分中每个页面块的长度以及回调函数列表。
+再次生成时在收集（collect）之前直接按配置树计算页面摘要，只收集和重新生成内容有变化的页面，
+未变化页面的代码块以及各部分的开头、结尾直接从已有文件中截取，用户代码也只需要在有变化的页面之间重新匹配。
+有变化的页面影响到其他内容（例如改动了数据变量、回调函数）时完整收集，只按页面复用代码块。
+
+已有文件与缓存对不上（被手工修改、由别的配置生成等）时按部分退回完整生成，结果与完整生成一致。
+
+缓存目录中还保存上次生成的原始文件（基准），写出前与已有文件、新生成的文件做三方合并（见 merge3.py），
+保留 USER CODE 块之外的手工修改。
+"""
+
+import bisect
+import hashlib
+import itertools
+import json
+import marshal
+import os
+import re
+import shutil
+import time
+
+from codegen import (HEAD_BLOCK, RACY_WINDOW_NS, SECTIONS, SECTION_TITLES, TAIL_BLOCK, USER_PUBLIC, USER_VALUE,
+                     PageDef, PageKind, _page_var_name, extract_blocks, match_functions, new_function_blocks,
+                     read_text_file)
+
+# 缓存格式或生成结果变化时递增，旧缓存随之失效
+CACHE_VERSION = 4
+
+# 计算摘要时 marshal 的格式版本：版本 3 起按对象的引用计数决定是否写出引用，同样的内容可能得到不同的结果
+MARSHAL_VERSION = 2
+
+# 不含用户代码、可以按页面块直接截取复用的部分
+SPLICE_SECTIONS = ("definitions", "enums", "setup_lists", "init")
+
+# 含有回调函数（用户代码）的部分：已有文件在 USER CODE 块之外与基准相同时按页面块原样复用
+CALLBACK_SECTIONS = ("item_callbacks", "page_callbacks")
+
+
+def iter_page_nodes(tree_data, parent_page_var=None, depth=0):
+    """
+    按 collectCodeInfo 收集页面的顺序（先序）遍历配置树中的页面节点，
+    返回 (节点, 页面变量名, 上级页面变量名, 层级)，与收集到的 PageDef 一一对应
+    """
+    for node in tree_data:
+        node_type = node.get("type", "普通页面")
+        if node_type not in ("普通页面", "展示页面"):
+            continue
+        var_name = _page_var_name(node.get("name", ""), node.get("properties", {}))
+        yield node, var_name, parent_page_var, depth
+        children = node.get("children", [])
+        if node_type == "普通页面":
+            children = [child for child in children if child.get("type") in ("普通页面", "展示页面")]
+        yield from iter_page_nodes(children, var_name, depth + 1)
+
+
+def page_digests(tree_data):
+    """
+    不经过收集，直接按配置树计算每个页面的内容摘要，返回 [(页面变量名, 上级页面变量名, 层级, 节点, 摘要)]
+    摘要只覆盖页面本身及其直接子项，子页面内容的变化不会影响上级页面；
+    配置树只含 JSON 的类型，用 marshal 序列化（比 JSON 快数倍），其中有不能序列化的值时返回 None
+    """
+    pages = []
+    for node, var_name, parent, depth in iter_page_nodes(tree_data):
+        children = [[child.get("name"), child.get("type"), child.get("properties")]
+                    for child in node.get("children", [])]
+        shallow = [parent, depth, node.get("name"), node.get("type"), node.get("properties"), children]
+        try:
+            data = marshal.dumps(shallow, MARSHAL_VERSION)
+        except ValueError:
+            return None
+        pages.append((var_name, parent, depth, node, hashlib.sha1(data).hexdigest()))
+    return pages
+
+
+def page_contribution(generator, page):
+    """
+    页面对本页面块以外内容的影响的摘要：各部分的开头、结尾（占位变量、页面表等）、其他页面的块以及回调函数列表
+    只与页面和条目的类型、变量名、回调函数、跳转目标、数据变量及其初始值、有无枚举数组和节点ID有关，
+    显示名称、步进、周期、枚举字符串等只影响本页面的块
+    """
+    items = [[int(item.kind), item.var_name, item.callback, item.target_page, item.data_var,
+              item.var_type and tuple(item.var_type),
+              item.data_var and tuple(generator.variables[item.data_var]),
+              item.enum_array, item.node_id]
+             for item in page.items]
+    shallow = [int(page.kind), page.var_name, page.parent, page.node_id,
+               page.enter_callback, page.period_callback, page.exit_callback, items]
+    return hashlib.sha1(marshal.dumps(shallow, MARSHAL_VERSION)).hexdigest()
+
+
+def _digest_map(pages):
+    """page_digests 的结果转为 页面变量名 -> 摘要，不能计算或页面变量名重复（无法区分页面）时返回 None"""
+    if pages is None:
+        return None
+    digests = {var_name: digest for var_name, _, _, _, digest in pages}
+    return digests if len(digests) == len(pages) else None
+
+
+def split_sections(content):
+    """按各部分标题把已生成的文件切分为 部分 -> 文本，找不到某个标题时返回 None"""
+    starts = [0]
+    pos = 0
+    for section in SECTIONS[1:]:
+        pos = content.find(SECTION_TITLES[section], pos)
+        if pos < 0:
+            return None
+        starts.append(pos)
+    ends = starts[1:] + [len(content)]
+    return {section: content[start:end] for section, start, end in zip(SECTIONS, starts, ends)}
+
+
+def _text_hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+# USER CODE 块：group 2 为块的内容，即 BEGIN 标记所在行之后到同类 END 标记所在行之前，与 index_regions 的划分相同；
+# 整个匹配在 C 中完成，不必像 index_regions 那样逐个标记处理和查找函数签名；内容按整行匹配，只在行首查找 END 标记
+REGION_BODY = re.compile(r'/\* USER CODE (VALUE |PUBLIC |)BEGIN(?: [\w.-]+)? \*/[^\n]*\n((?:[^\n]*\n)*?)'
+                         r'(?=[^\n]*/\* USER CODE \1END \*/)')
+
+
+def region_bodies(text):
+    """text 中各 USER CODE 块内容的 (开始, 结束) 位置"""
+    if "USER CODE" not in text:
+        return []
+    return [match.span(2) for match in REGION_BODY.finditer(text)]
+
+
+def outside_text(text, bodies):
+    """text 去掉 bodies 中各 USER CODE 块的内容后剩下的部分"""
+    if not bodies:
+        return text
+    parts = []
+    pos = 0
+    for start, end in bodies:
+        parts.append(text[pos:start])
+        pos = end
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def _signatures_hash(signatures):
+    return _text_hash("\0".join(signatures))
+
+
+def _callback_record(generator):
+    """
+    缓存中回调函数的记录：pages 为按文件中的顺序连续属于同一页面的函数个数 [[页面变量名, 个数], ...]，
+    hash 为全部函数签名（extract_blocks 的格式）的摘要，unique 为签名是否没有重复
+    """
+    pages = []
+    signatures = []
+    for key, signature in generator.iterCallbackSignatures():
+        signatures.append(f"{signature}\n{{")
+        if pages and pages[-1][0] == key:
+            pages[-1][1] += 1
+        else:
+            pages.append([key, 1])
+    return {"pages": pages, "hash": _signatures_hash(signatures), "unique": len(set(signatures)) == len(signatures)}
+
+
+def _unreusable_pages(located):
+    """_locate_blocks 切分出的回调函数部分中，块内用户代码不能原样复用的页面"""
+    return {key for blocks in located.values() for key, _, _, reusable in blocks
+            if not reusable and key != HEAD_BLOCK and key != TAIL_BLOCK}
+
+
+def _locate_blocks(text, bodies, cached_blocks):
+    """
+    按记录的各块在 USER CODE 块之外的长度把某一部分切分为块，返回 [(块名, 文本, 块外内容的摘要, 能否原样复用)]
+    块内的用户代码都以换行结尾时才能原样复用（重新生成时用户代码之后总有一个换行）；与记录对不上时返回 None
+    块外的内容一次拼出，各块的边界按块外位置二分查找，不必逐个 USER CODE 块处理
+    """
+    outside = outside_text(text, bodies)
+    if len(outside) != sum(record[1] for record in cached_blocks):
+        return None
+    # 第 i 个 USER CODE 块之前的块外长度，以及之前各块内容的总长度
+    removed = [0]
+    removed.extend(itertools.accumulate(end - start for start, end in bodies))
+    outside_starts = [start - before for (start, _), before in zip(bodies, removed)]
+    # 之前不能原样复用的 USER CODE 块个数
+    unusable = [0]
+    unusable.extend(itertools.accumulate(end == start or text[end - 1] != '\n' for start, end in bodies))
+
+    blocks = []
+    index = 0
+    outside_pos = 0
+    pos = 0
+    for key, length, _ in cached_blocks:
+        outside_end = outside_pos + length
+        # 块中的 USER CODE 块在块外位置上都在块的结尾之前
+        end_index = bisect.bisect_left(outside_starts, outside_end, index)
+        end = outside_end + removed[end_index]
+        blocks.append((key, text[pos:end], _text_hash(outside[outside_pos:outside_end]),
+                       unusable[end_index] == unusable[index]))
+        index = end_index
+        outside_pos = outside_end
+        pos = end
+    if index != len(bodies):
+        return None
+    return blocks
+
+
+class SectionCache:
+    """某个输出文件的增量生成缓存"""
+
+    def __init__(self, cache_dir, c_file_path):
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, os.path.basename(c_file_path) + ".json")
+        self.base_path = os.path.join(cache_dir, os.path.basename(c_file_path) + ".base")
+        self.orig_path = os.path.join(cache_dir, os.path.basename(c_file_path) + ".orig")
+        self.state = self._load()
+        self.digests = None         # 本次的页面摘要：页面变量名 -> 摘要
+        self.changed_pages = None   # 本次重新生成的页面数，未能增量生成时为 None
+        self.patched = False        # 本次是否只收集了有变化的页面（见 patch）
+        self._blocks = {}           # 本次生成记录：部分 -> [[块名, 长度], ...]
+        self._hashes = {}           # 部分 -> sha1
+        self._callback_blocks = {}  # 回调函数部分 -> [[块名, USER CODE 块之外的长度, 块外内容的摘要], ...]
+        self._outside = {}          # 其余部分 -> 本次生成的内容（基准）在 USER CODE 块之外内容的 sha1
+        self._reused = {}           # (部分, 块名) -> (原样复用的回调函数块, 其记录)，写出时不必重新计算记录
+        self._stamp = None          # 输出文件与基准相同时其 [大小, 修改时间, 记录时间]（纳秒）
+        self._matched = None        # matchesBase 的结果：(ExistingFile, 是否相同)
+        self._parsed = (None, {})   # (ExistingFile, {(部分, 'blocks' / 'hash'): ...})，splice 与 matchesBase 共用
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(state, dict) or state.get("version") != CACHE_VERSION:
+            return None
+        return state
+
+    def splice(self, generator, tree_data, existing):
+        """
+        根据缓存和已有文件（ExistingFile）设置 generator 的 user_code 与 reused_blocks
+        缓存不可用时返回 False，由调用方按完整流程匹配用户代码
+        """
+        # 生成选项不同时生成结果整体不同，缓存不可用
+        if self.state is None or self.state.get("options") != list(generator.options):
+            return False
+        self.digests = _digest_map(page_digests(tree_data))
+        sections = split_sections(existing.content)
+        if self.digests is None or sections is None:
+            return False
+
+        old_digests = self.state["pages"]
+        unchanged = {key for key, digest in self.digests.items() if old_digests.get(key) == digest}
+
+        # 已有文件在 USER CODE 块之外与基准相同时，未变化页面的回调函数块连同其中的用户代码直接截取，只解析有变化的页面块
+        reused = self._reuseCallbacks(generator, existing, sections, unchanged)
+        if reused is not None:
+            user_code, reused_blocks = reused
+        else:
+            user_code = self._matchCallbacks(generator, sections, unchanged)
+            if user_code is None:
+                return False
+            reused_blocks = {}
+
+        # 未被改动过的部分按记录的块长度截取未变化页面的代码块
+        non_local = generator.nonLocalSections()
+        for section in SPLICE_SECTIONS:
+            if section in non_local:
+                continue
+            cached_section = self.state["sections"].get(section)
+            old_text = sections[section]
+            if cached_section is None or self._sectionHash(existing, section, old_text) != cached_section["hash"]:
+                continue
+            pos = 0
+            for key, length in cached_section["blocks"]:
+                if key in unchanged:
+                    reused_blocks[(section, key)] = old_text[pos:pos + length]
+                pos += length
+
+        generator.user_code = user_code
+        generator.reused_blocks = reused_blocks
+        self.changed_pages = len(self.digests) - len(unchanged)
+        return True
+
+    def patch(self, generator, tree_data, existing):
+        """
+        不完整收集配置树，只收集内容有变化的页面：在收集之前直接按配置树计算页面摘要与缓存比较，
+        页面结构（各页面的变量名与上级页面）不变、已有文件在 USER CODE 块之外与基准相同，
+        且有变化的页面对其他内容的影响（page_contribution）都不变时，其余页面的块和各部分的开头、结尾都原样取自已有文件，
+        generator.pages 中未变化的页面只有变量名等占位信息；文件头（其中只有 PUBLIC 块）总是重新生成
+        设置好 generator 的 pages、user_code 与 reused_blocks 后返回 True；
+        不能这样生成时返回 False，由调用方重新完整收集后按 splice 生成
+        """
+        options = generator.options
+        # 头文件、字符串池序号和开关位序号与所有页面有关，只能完整收集
+        if (self.state is None or self.state.get("options") != list(options) or options.user_header
+                or generator.nonLocalSections() or not self.state["callbacks"]["unique"]
+                or any(section not in self.state["sections"] for section in SPLICE_SECTIONS)):
+            return False
+        pages = page_digests(tree_data)
+        tree = self.state["tree"]
+        if pages is None or len(pages) != len(tree) or any(
+                var_name != cached[0] or parent != cached[1]
+                for (var_name, parent, _, _, _), cached in zip(pages, tree)):
+            return False
+        sections = split_sections(existing.content)
+        if sections is None or not self.matchesBase(existing, sections):
+            return False
+
+        # 有变化的页面，以及块内用户代码不能原样复用的页面重新收集、生成
+        old_digests = self.state["pages"]
+        located = self._locateCallbacks(existing, sections)
+        collect = _unreusable_pages(located)
+        collect.update(var_name for var_name, _, _, _, digest in pages if old_digests.get(var_name) != digest)
+        generator.reset()
+        page_list = []
+        collected = []
+        for index, (var_name, parent, depth, node, _) in enumerate(pages):
+            if var_name in collect:
+                page = generator.collectPage(node, parent, depth)
+                collected.append((index, page))
+            else:
+                kind = PageKind.ORDINARY if node.get("type", "普通页面") == "普通页面" else PageKind.SHOW
+                page = PageDef(kind, var_name, None, parent, depth)
+            page_list.append(page)
+        # 多个页面共用的数据变量取最后一个页面的初始值，全部收集后再比较
+        if any(page_contribution(generator, page) != tree[index][2] for index, page in collected):
+            return False
+        generator.pages = page_list
+        generator.root_pages = [page for page in page_list if page.parent is None]
+
+        reused_pages = {var_name for var_name, _, _, _, _ in pages}.difference(collect)
+        user_code, reused_blocks, heads = self._takeCallbacks(generator, sections, located, reused_pages)
+        generator.user_code = user_code
+        # VALUE 块中的用户代码与重新生成的结果相同时才能原样复用页面回调函数部分的开头
+        callbacks_head = heads.get(("page_callbacks", HEAD_BLOCK), "")
+        if "USER CODE VALUE" in callbacks_head and generator.valueRegion() not in callbacks_head:
+            return False
+        reused_blocks.update(heads)
+        reused_blocks[("variables", HEAD_BLOCK)] = sections["variables"]
+        for section in SPLICE_SECTIONS:
+            text = sections[section]
+            pos = 0
+            for key, length in self.state["sections"][section]["blocks"]:
+                block = text[pos:pos + length]
+                pos += length
+                if key == HEAD_BLOCK or key == TAIL_BLOCK:
+                    reused_blocks[(section, key)] = reused_blocks.get((section, key), "") + block
+                elif key in reused_pages:
+                    reused_blocks[(section, key)] = block
+
+        generator.reused_blocks = reused_blocks
+        self.digests = _digest_map(pages)
+        self.changed_pages = len(collect)
+        self.patched = True
+        return True
+
+    def _matchCallbacks(self, generator, sections, unchanged):
+        """
+        解析已有文件中的所有回调函数，未变化页面的用户代码按签名直接取回，其余页面之间再按常规规则匹配
+        返回 user_code，已有文件中的回调函数与上次生成时对不上时返回 None
+        """
+        # 已有文件中的回调函数必须与上次生成时逐一对应，才能按位置确定所属页面
+        cached_callbacks = self.state["callbacks"]
+        keys = [key for key, count in cached_callbacks["pages"] for _ in range(count)]
+        old_value, old_public, old_funcs = extract_blocks(
+            sections["header"] + sections["item_callbacks"] + sections["page_callbacks"])
+        if len(old_funcs) != len(keys) or _signatures_hash(func['signature'] for func in old_funcs) != cached_callbacks["hash"]:
+            return None
+
+        # 未变化页面的函数签名与上次完全相同，直接取回用户代码；其余页面之间再按常规规则匹配
+        user_code = {}
+        changed_old = []
+        for func, key in zip(old_funcs, keys):
+            if key in unchanged:
+                user_code.setdefault(func['signature'], func['code'])
+            else:
+                changed_old.append(func)
+        user_code.update(match_functions(changed_old, new_function_blocks(generator, unchanged)))
+        user_code[USER_PUBLIC] = old_public
+        user_code[USER_VALUE] = old_value
+        return user_code
+
+    def _reuseCallbacks(self, generator, existing, sections, unchanged):
+        """
+        已有文件在 USER CODE 块之外与基准相同时，按记录的各块在块外的长度找出回调函数部分中每个页面块的位置，
+        未变化页面的块原样复用（与按其中的用户代码重新生成的结果相同），只解析有变化的页面块和各部分的开头
+        返回 (user_code, reused_blocks)，不能这样复用时返回 None
+        """
+        # 签名重复时生成的函数共用同一段用户代码，与原样复用的结果不同
+        if not self.state["callbacks"]["unique"] or not self.matchesBase(existing, sections):
+            return None
+
+        located = self._locateCallbacks(existing, sections)
+        # 页面在各部分中的块都能原样复用时才复用，否则该页面的回调函数都重新匹配
+        reused_pages = set(unchanged).difference(_unreusable_pages(located))
+        user_code, reused_blocks, _ = self._takeCallbacks(generator, sections, located, reused_pages)
+        return user_code, reused_blocks
+
+    def _locateCallbacks(self, existing, sections):
+        return {section: self._locateBlocks(existing, section, sections[section]) for section in CALLBACK_SECTIONS}
+
+    def _takeCallbacks(self, generator, sections, located, reused_pages):
+        """
+        回调函数部分中 reused_pages 的页面块原样复用，其余页面块中的函数与将要生成的函数匹配
+        返回 (user_code, reused_blocks, 各部分的开头与结尾 {(部分, HEAD_BLOCK / TAIL_BLOCK): 文本})
+        """
+        reused_blocks = {}
+        heads = {}
+        head_text = sections["header"]
+        changed_old = []
+        for section, blocks in located.items():
+            for (key, text, _, _), record in zip(blocks, self.state["callback_blocks"][section]):
+                if key == HEAD_BLOCK or key == TAIL_BLOCK:
+                    heads[(section, key)] = heads.get((section, key), "") + text
+                    head_text += text
+                elif key in reused_pages:
+                    reused_blocks[(section, key)] = text
+                    self._reused[(section, key)] = (text, record)
+                else:
+                    changed_old.extend(extract_blocks(text)[2])
+
+        old_value, old_public, _ = extract_blocks(head_text)
+        user_code = match_functions(changed_old, new_function_blocks(generator, reused_pages))
+        user_code[USER_PUBLIC] = old_public
+        user_code[USER_VALUE] = old_value
+        return user_code, reused_blocks, heads
+
+    def recordBlock(self, section, key, text):
+        """
+        记录写出的每一块（作为 iterCollectedContent 的 on_block）
+        SPLICE_SECTIONS 记录各块的长度和整个部分的摘要；回调函数部分记录各块在 USER CODE 块之外的长度和摘要，
+        原样复用的块沿用上次的记录；其余部分记录 USER CODE 块之外内容的摘要
+        """
+        if section in SPLICE_SECTIONS:
+            blocks = self._blocks.get(section)
+            if blocks is None:
+                blocks = self._blocks[section] = []
+                self._hashes[section] = hashlib.sha1()
+            blocks.append([key, len(text)])
+            self._hashes[section].update(text.encode('utf-8'))
+            return
+        if section in CALLBACK_SECTIONS:
+            reused = self._reused.get((section, key))
+            if reused is not None and reused[0] is text:
+                record = reused[1]
+            else:
+                outside = outside_text(text, region_bodies(text))
+                record = [key, len(outside), _text_hash(outside)]
+            self._callback_blocks.setdefault(section, []).append(record)
+            return
+        outside = outside_text(text, region_bodies(text))
+        digest = self._outside.get(section)
+        if digest is None:
+            digest = self._outside[section] = hashlib.sha1()
+        digest.update(outside.encode('utf-8'))
+
+    def save(self, generator, tree_data):
+        """写出本次生成的缓存"""
+        digests = self.digests if self.digests is not None else _digest_map(page_digests(tree_data))
+        if digests is None:
+            # 不能缓存时删除旧的记录，以免其中基准的摘要与本次写出的基准不符
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        if self.patched:
+            # 只收集了有变化的页面，它们对其他内容的影响都没有变化，页面结构和回调函数列表沿用上次的记录
+            tree, callbacks = self.state["tree"], self.state["callbacks"]
+        else:
+            tree = [[page.var_name, page.parent, page_contribution(generator, page)] for page in generator.pages]
+            callbacks = _callback_record(generator)
+        state = {
+            "version": CACHE_VERSION,
+            "options": list(generator.options),
+            "pages": digests,
+            "tree": tree,
+            "callbacks": callbacks,
+            "sections": {section: {"hash": self._hashes[section].hexdigest(), "blocks": blocks}
+                         for section, blocks in self._blocks.items()},
+            "callback_blocks": self._callback_blocks,
+            "base": {section: digest.hexdigest() for section, digest in self._outside.items()},
+            "stamp": self._stamp,
+        }
+        self._write(self.path, json.dumps(state, ensure_ascii=False, separators=(',', ':')))
+
+    def loadBase(self, encoding):
+        """上次生成的原始文件内容（三方合并的基准，与输出文件编码相同），没有时返回 None"""
+        try:
+            return read_text_file(self.base_path, encoding)
+        except OSError:
+            return None
+
+    def hasBase(self):
+        return os.path.exists(self.base_path)
+
+    def matchesBase(self, existing, sections=None):
+        """
+        已有文件（ExistingFile）在 USER CODE 块之外是否与上次生成的原始文件相同（块内的修改已由用户代码匹配带入新文件，不需要合并）
+        文件的大小和修改时间与写出基准时记录的相同时直接认为相同，否则按缓存中记录的摘要比较，都不读取基准：
+        SPLICE_SECTIONS 中没有用户代码，比较整个部分的摘要；回调函数部分按记录的长度切分为块，逐块比较 USER CODE 块之外内容的摘要；
+        其余部分比较 USER CODE 块之外内容的摘要
+        sections 为已切分好的 split_sections(existing.content)
+        """
+        if self._matched is not None and self._matched[0] is existing:
+            return self._matched[1]
+        if self.state is None or not self.state.get("base") or not os.path.exists(self.base_path):
+            return False
+        if sections is None:
+            sections = split_sections(existing.content)
+        # 回调函数部分总要按块切分，原样复用其中的块
+        if sections is None or any(self._locateBlocks(existing, section, sections[section]) is None
+                                   for section in CALLBACK_SECTIONS):
+            matched = False
+        else:
+            stamp = self.state.get("stamp")
+            # 记录时修改时间已过去 RACY_WINDOW_NS 才可信，刚写出的文件在同一时间单位内再次修改无法从修改时间看出
+            if stamp and existing.stamp[:2] == tuple(stamp[:2]) and stamp[1] + RACY_WINDOW_NS <= stamp[2]:
+                matched = True
+            else:
+                matched = all(self._sectionMatches(existing, section, text) for section, text in sections.items())
+        self._matched = (existing, matched)
+        return matched
+
+    def _sectionMatches(self, existing, section, text):
+        """已有文件中的某一部分是否与上次生成的内容相同（USER CODE 块之外）"""
+        if section in CALLBACK_SECTIONS:
+            return all(digest == record[2] for (_, _, digest, _), record
+                       in zip(self._locateBlocks(existing, section, text), self.state["callback_blocks"][section]))
+        return self._sectionHash(existing, section, text) == self._baseHash(section)
+
+    def _locateBlocks(self, existing, section, text):
+        """已有文件中回调函数部分的 _locate_blocks，缓存中没有该部分的记录时返回 None"""
+        cached_blocks = self.state.get("callback_blocks", {}).get(section)
+        if cached_blocks is None:
+            return None
+        return self._parse(existing, section, 'blocks',
+                           lambda: _locate_blocks(text, region_bodies(text), cached_blocks))
+
+    def _baseHash(self, section):
+        """上次生成的内容中某一部分的摘要（与 _sectionHash 对应）"""
+        if section in SPLICE_SECTIONS:
+            cached_section = self.state["sections"].get(section)
+            return cached_section and cached_section["hash"]
+        return self.state["base"].get(section)
+
+    def _sectionHash(self, existing, section, text):
+        """已有文件中某一部分的摘要：SPLICE_SECTIONS 为整个部分的摘要，其余部分为 USER CODE 块之外内容的摘要"""
+        if section in SPLICE_SECTIONS:
+            return self._parse(existing, section, 'hash', lambda: _text_hash(text))
+        return _text_hash(outside_text(text, region_bodies(text)))
+
+    def _parse(self, existing, section, kind, compute):
+        """同一个已有文件的每一部分只计算一次"""
+        if self._parsed[0] is not existing:
+            self._parsed = (existing, {})
+        results = self._parsed[1]
+        if (section, kind) not in results:
+            results[(section, kind)] = compute()
+        return results[(section, kind)]
+
+    def saveBase(self, c_file_path, text=None, encoding='utf-8'):
+        """
+        保存本次生成的内容作为下次三方合并的基准（未合并用户修改的原始文件）
+        text 为 None 时输出文件就是生成的内容：直接复制输出文件（比先比较两个文件的内容更快），
+        并记录输出文件的大小和修改时间供 matchesBase 使用；三方合并后 text 为生成的内容，按输出文件的编码写出
+        """
+        if text is not None:
+            self._write(self.base_path, text, encoding)
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = self.base_path + ".tmp"
+        shutil.copyfile(c_file_path, temp_path)
+        os.replace(temp_path, self.base_path)
+        stat = os.stat(c_file_path)
+        self._stamp = [stat.st_size, stat.st_mtime_ns, time.time_ns()]
+
+    def saveOriginal(self, text):
+        """三方合并有冲突时保存合并前的已有文件，没有冲突时删除上次保存的文件"""
+        if text is not None:
+            self._write(self.orig_path, text)
+        elif os.path.exists(self.orig_path):
+            os.remove(self.orig_path)
+
+    def _write(self, path, text, encoding='utf-8'):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w', encoding=encoding, newline='') as f:
+            f.write(text)
+        os.replace(temp_path, path)
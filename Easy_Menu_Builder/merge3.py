@@ -0,0 +1,248 @@
+"""
+Easy Menu - 三方合并
+增量缓存目录中保存上次生成的原始文件（基准），再次生成时以基准、用户修改后的已有文件和新生成的文件做三方合并，
+保留用户在 USER CODE 块之外的手工修改（例如增加的 #include、辅助函数、注释）
+
+文件先按空行切分为段落（USER CODE 块内的空行不切分），比较时忽略块内的用户代码（块内代码已由用户代码匹配带入新文件）：
+只有用户修改过的段落取用户的版本，只有生成结果变化的段落取新生成的版本，两边都没变的段落整段沿用新生成的文本；
+两边都修改过的段落再逐行合并，同一行两边改得不同时以新生成的代码为准，并记录为冲突
+"""
+
+import bisect
+import difflib
+import re
+from typing import NamedTuple
+
+from codegen import index_regions
+
+# 段落之间的分隔：连续两个换行，其后为下一段落的开始
+PARAGRAPH_BREAK = re.compile(r'\n\n')
+
+# 冲突记录中用户修改的摘要长度
+SNIPPET_LENGTH = 60
+
+
+class MergeResult(NamedTuple):
+    """三方合并的结果"""
+    text: str           # 合并后的文件内容
+    conflicts: list     # 与生成的代码冲突、未能保留的用户修改（每处的第一行非空文本）
+
+
+def split_paragraphs(content):
+    """把文件切分为段落，返回 [(比较用的键, 原文)]；键为去掉 USER CODE 块内代码后的段落文本"""
+    regions = index_regions(content)
+    paragraphs = []
+    start = 0
+    region_index = 0    # 当前段落中的第一个块
+    inner_index = 0     # 结束位置不在当前切分点之前的第一个块
+
+    def add(end):
+        nonlocal region_index
+        pieces = []
+        pos = start
+        while region_index < len(regions) and regions[region_index].start < end:
+            region = regions[region_index]
+            pieces.append(content[pos:region.start])
+            pos = region.end
+            region_index += 1
+        pieces.append(content[pos:end])
+        paragraphs.append(("".join(pieces), content[start:end]))
+
+    for match in PARAGRAPH_BREAK.finditer(content):
+        end = match.end()
+        # 块内的空行属于用户代码，不在此处切分
+        while inner_index < len(regions) and regions[inner_index].end < end:
+            inner_index += 1
+        if inner_index < len(regions) and regions[inner_index].start < end:
+            continue
+        add(end)
+        start = end
+    if start < len(content):
+        add(len(content))
+    return paragraphs
+
+
+def split_lines(content):
+    """逐行合并使用的单元：每一行既是键也是原文"""
+    return [(line, line) for line in content.splitlines(keepends=True)]
+
+
+def _unique_anchors(a, alo, ahi, b, blo, bhi):
+    """a[alo:ahi] 与 b[blo:bhi] 中都只出现一次的单元，取两边顺序一致的最长序列（最长递增子序列），返回 [(i, j)]"""
+    counts = {}
+    for i in range(alo, ahi):
+        entry = counts.get(a[i])
+        counts[a[i]] = [i, -1, 1] if entry is None else [entry[0], -1, entry[2] + 1]
+    for j in range(blo, bhi):
+        entry = counts.get(b[j])
+        if entry is not None and entry[2] == 1:
+            entry[1] = j if entry[1] == -1 else -2
+    pairs = sorted((i, j) for i, j, count in counts.values() if count == 1 and j >= 0)
+
+    tails = []          # tails[k]: 长度为 k + 1 的递增子序列末尾在 pairs 中的序号
+    tail_values = []    # 对应的 j，单调递增
+    previous = []
+    for index, (_, j) in enumerate(pairs):
+        k = bisect.bisect_left(tail_values, j)
+        previous.append(tails[k - 1] if k else -1)
+        if k == len(tails):
+            tails.append(index)
+            tail_values.append(j)
+        else:
+            tails[k] = index
+            tail_values[k] = j
+    anchors = []
+    index = tails[-1] if tails else -1
+    while index >= 0:
+        anchors.append(pairs[index])
+        index = previous[index]
+    return anchors[::-1]
+
+
+def _match(a, b, alo, ahi, blo, bhi, matches):
+    """
+    把 a[alo:ahi] 与 b[blo:bhi] 中相同的单元按顺序加入 matches：[(i, j)]
+    先去掉相同的首尾，再以两边都只出现一次的单元为锚点分段递归（patience diff），
+    没有锚点的小段用 difflib 比较；生成的文件中段落多数各不相同，耗时近似线性
+    """
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        matches.append((alo, blo))
+        alo += 1
+        blo += 1
+    tail = []
+    while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+        tail.append((ahi, bhi))
+    if alo < ahi and blo < bhi:
+        anchors = _unique_anchors(a, alo, ahi, b, blo, bhi)
+        if anchors:
+            for i, j in anchors:
+                _match(a, b, alo, i, blo, j, matches)
+                matches.append((i, j))
+                alo, blo = i + 1, j + 1
+            _match(a, b, alo, ahi, blo, bhi, matches)
+        else:
+            matcher = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+            for i, j, size in matcher.get_matching_blocks():
+                matches.extend((alo + i + k, blo + j + k) for k in range(size))
+    matches.extend(reversed(tail))
+
+
+def _changes(a, b):
+    """a 到 b 的修改：[(i1, i2, j1, j2)]，a[i1:i2] 被替换为 b[j1:j2]"""
+    matches = []
+    _match(a, b, 0, len(a), 0, len(b), matches)
+    changes = []
+    i, j = 0, 0
+    for next_i, next_j in matches + [(len(a), len(b))]:
+        if next_i > i or next_j > j:
+            changes.append((i, next_i, j, next_j))
+        i, j = next_i + 1, next_j + 1
+    return changes
+
+
+def _overlaps(hunk, group_start, group_end):
+    """基准中的修改范围 hunk 是否与已归组的范围 [group_start, group_end) 相交（同一位置的插入也算相交）"""
+    start, end = hunk[0], hunk[1]
+    if start == end and group_start == group_end:
+        return start == group_start
+    if start == end:
+        return group_start < start < group_end
+    if group_start == group_end:
+        return start < group_start < end
+    return start < group_end and group_start < end
+
+
+def _side_span(hunks, side, group_start, group_end):
+    """一侧在 [group_start, group_end) 对应的单元：组内修改之外的部分与基准相同，按首尾修改换算位置"""
+    first, last = hunks[0], hunks[-1]
+    return side[first[2] - (first[0] - group_start):last[3] + (group_end - last[1])]
+
+
+def _merge(base, user, new, resolve):
+    """
+    按单元列表做三方合并，返回合并后的文本块列表
+    两边修改了同一范围且结果不同时调用 resolve(基准单元, 用户单元, 新单元) 取得该范围的文本块
+    """
+    base_keys = [key for key, _ in base]
+    hunks = sorted([hunk + ('user',) for hunk in _changes(base_keys, [key for key, _ in user])] +
+                   [hunk + ('new',) for hunk in _changes(base_keys, [key for key, _ in new])],
+                   key=lambda hunk: (hunk[0], hunk[1]))
+    output = []
+    pos = 0
+    shift = 0       # 未修改范围中 新单元序号 - 基准单元序号
+    index = 0
+    while index < len(hunks):
+        group = [hunks[index]]
+        group_start, group_end = hunks[index][0], hunks[index][1]
+        index += 1
+        while index < len(hunks) and _overlaps(hunks[index], group_start, group_end):
+            group_end = max(group_end, hunks[index][1])
+            group.append(hunks[index])
+            index += 1
+
+        # 两次修改之间沿用新生成的文本（其中带有已匹配的用户代码）
+        output.extend(text for _, text in new[pos + shift:group_start + shift])
+        user_hunks = [hunk for hunk in group if hunk[4] == 'user']
+        new_hunks = [hunk for hunk in group if hunk[4] == 'new']
+        if new_hunks:
+            new_span = _side_span(new_hunks, new, group_start, group_end)
+        else:
+            new_span = new[group_start + shift:group_end + shift]
+
+        if not user_hunks:
+            output.extend(text for _, text in new_span)
+        elif not new_hunks:
+            output.extend(text for _, text in _side_span(user_hunks, user, group_start, group_end))
+        else:
+            user_span = _side_span(user_hunks, user, group_start, group_end)
+            if [key for key, _ in user_span] == [key for key, _ in new_span]:
+                output.extend(text for _, text in new_span)
+            elif group_start == group_end:
+                # 同一位置两边各自插入了内容：都保留，用户插入的在前（仍紧接在其前面的代码之后）
+                output.extend(text for _, text in user_span)
+                output.extend(text for _, text in new_span)
+            else:
+                output.extend(resolve(base[group_start:group_end], user_span, new_span))
+
+        if new_hunks:
+            shift = new_hunks[-1][3] - new_hunks[-1][1]
+        pos = group_end
+    output.extend(text for _, text in new[pos + shift:])
+    return output
+
+
+def _snippet(units):
+    for _, text in units:
+        for line in text.splitlines():
+            if line.strip():
+                return line.strip()[:SNIPPET_LENGTH]
+    return "（删除）"
+
+
+def merge_three_way(base, user, new):
+    """
+    三方合并：base 为上次生成的原始文件，user 为用户修改后的已有文件，new 为本次生成的文件，返回 MergeResult
+    用户没有修改过文件，或只修改了 USER CODE 块内的代码时，结果就是 new
+    """
+    if user == base:
+        return MergeResult(new, [])
+    base_paragraphs = split_paragraphs(base)
+    user_paragraphs = split_paragraphs(user)
+    if [key for key, _ in base_paragraphs] == [key for key, _ in user_paragraphs]:
+        return MergeResult(new, [])
+
+    conflicts = []
+
+    def resolve_lines(base_lines, user_lines, new_lines):
+        conflicts.append(_snippet(user_lines))
+        return [text for _, text in new_lines]
+
+    def resolve_paragraphs(base_span, user_span, new_span):
+        return _merge(split_lines("".join(text for _, text in base_span)),
+                      split_lines("".join(text for _, text in user_span)),
+                      split_lines("".join(text for _, text in new_span)), resolve_lines)
+
+    text = "".join(_merge(base_paragraphs, user_paragraphs, split_paragraphs(new), resolve_paragraphs))
+    return MergeResult(text, conflicts)
@@ -0,0 +1,223 @@
+"""
+Easy Menu - 周期分析
+按运行时（menu_core）的刷新规则分析展示页面与展示条目的周期：Easy_Menu_Display 每个 tick 调用一次时，
+普通页面中当前屏幕上的展示条目在 tick - last_tick >= 周期 时调用回调函数并重绘所在行，同一次调用中有条目刷新时
+更新一次屏幕；展示页面在 tick - last_tick > 周期 时调用周期回调函数
+
+对每个普通页面，按屏幕能显示的条目行数取出所有可能同时显示的条目（翻页时的每个窗口），计算其中展示条目周期的
+超周期、同一 tick 中最多刷新的条目数、每秒的刷新次数，按给定的代价估算 CPU 负载，并给出成倍数关系的建议周期
+"""
+
+import math
+from itertools import combinations
+from typing import NamedTuple
+
+from codegen import ItemKind, PageKind
+
+# 默认每屏显示的条目行数：Easy_Menu.h 中 SCREEN_HEIGHT / CHAR_HEIGHT 的默认值 32 / 16（开启标题显示时少一行）
+DEFAULT_SCREEN_LINES = 2
+
+# 默认的 CPU 负载预算（百分比）
+DEFAULT_BUDGET = 10.0
+
+
+class PeriodCosts(NamedTuple):
+    """估算 CPU 负载使用的代价（微秒），默认值只是量级参考，应按目标平台实测填写"""
+    tick: int = 1000        # 一个 tick 的长度（Easy_Menu_Display 每个 tick 调用一次）
+    callback: int = 20      # 一次展示条目回调函数或展示页面周期回调函数
+    line: int = 30          # 重绘一行（清除、名称、数值格式化）
+    update: int = 500       # 一次屏幕更新（Easy_Menu_All_Update 把变化的字符写到屏幕）
+
+
+DEFAULT_COSTS = PeriodCosts()
+
+
+def parse_costs(spec, base=DEFAULT_COSTS):
+    """解析 "tick=1000,callback=20,line=30,update=500" 形式的代价描述，未给出的项取 base 中的值"""
+    values = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name not in PeriodCosts._fields:
+            raise ValueError(f"代价描述中有未知的项: {name}（可选: {', '.join(PeriodCosts._fields)}）")
+        try:
+            values[name] = int(value, 0)
+        except ValueError:
+            raise ValueError(f"代价描述中 {name} 的值不是整数: {value.strip()!r}") from None
+        if values[name] < 0 or (name == "tick" and values[name] == 0):
+            raise ValueError(f"代价描述中 {name} 的值必须为正数")
+    return base._replace(**values)
+
+
+def parse_period(period):
+    """配置中的周期（tick 数），不是整数（例如宏）时返回 None"""
+    try:
+        return max(int(str(period), 0), 0)
+    except ValueError:
+        return None
+
+
+def lcm(values):
+    result = 1
+    for value in values:
+        result = result * value // math.gcd(result, value)
+    return result
+
+
+def firing_ticks(intervals, hyperperiod):
+    """一个超周期内至少有一个条目刷新的 tick 数（容斥计算，intervals 为各条目的刷新间隔）"""
+    distinct = sorted(set(intervals))
+    total = 0
+    for size in range(1, len(distinct) + 1):
+        for subset in combinations(distinct, size):
+            total += (-1) ** (size + 1) * (hyperperiod // lcm(subset))
+    return total
+
+
+def harmonize(periods):
+    """
+    建议周期：每个周期取到以某个原有周期为基准、按 2 的幂次倍增（或整除减半）的数列中最接近的值，
+    选择最大相对偏差最小的基准（相同时取超周期较小的）；返回与 periods 一一对应的建议周期
+    """
+    distinct = sorted(set(periods))
+    best = None
+    for base in distinct:
+        chain = [base << shift for shift in range(32) if base << shift <= distinct[-1] * 2]
+        divisor = base
+        while divisor % 2 == 0 and divisor // 2 >= 1:
+            divisor //= 2
+            chain.append(divisor)
+        mapping = {period: min(chain, key=lambda value: abs(math.log(value / period))) for period in distinct}
+        deviation = max(abs(math.log(mapping[period] / period)) for period in distinct)
+        key = (round(deviation, 9), lcm(mapping.values()))
+        if best is None or key < best[0]:
+            best = (key, mapping)
+    return [best[1][period] for period in periods]
+
+
+class WindowLoad(NamedTuple):
+    """同时显示的一组展示条目的刷新情况"""
+    items: list             # 带回调函数的展示条目（ItemDef）
+    intervals: list         # 各条目的刷新间隔（tick）
+    hyperperiod: int        # 超周期（tick）
+    peak: int               # 同一 tick 中最多刷新的条目数
+    fires: float            # 每秒的回调次数
+    updates: float          # 每秒的屏幕更新次数
+    load: float             # CPU 负载（百分比）
+    peak_us: int            # 刷新最多的一次 Easy_Menu_Display 的耗时（微秒）
+
+
+class PageSchedule(NamedTuple):
+    """一个页面的周期分析结果"""
+    page: object            # PageDef
+    window: WindowLoad      # 负载最高的窗口（展示页面为其周期回调函数），没有周期刷新时为 None
+    suggested: list         # 负载最高的窗口的建议周期，与 window.intervals 一一对应，无需调整时为 None
+    suggested_window: WindowLoad   # 使用建议周期后的刷新情况
+    skipped: list           # 没有回调函数（不会周期刷新）或周期不是整数的条目（ItemDef）
+    over_budget: bool       # CPU 负载超出预算，或一次 Easy_Menu_Display 超过一个 tick
+
+
+def window_load(items, intervals, costs=DEFAULT_COSTS):
+    """展示条目的刷新间隔为 intervals 时的负载：每次刷新调用回调并重绘一行，同一 tick 中的刷新共用一次屏幕更新"""
+    hyperperiod = lcm(intervals)
+    ticks_per_second = 1e6 / costs.tick
+    fires = sum(ticks_per_second / interval for interval in intervals)
+    updates = ticks_per_second * firing_ticks(intervals, hyperperiod) / hyperperiod
+    load = (fires * (costs.callback + costs.line) + updates * costs.update) / 1e4
+    peak_us = len(intervals) * (costs.callback + costs.line) + costs.update
+    return WindowLoad(list(items), list(intervals), hyperperiod, len(intervals), fires, updates, load, peak_us)
+
+
+def show_page_load(period, costs=DEFAULT_COSTS):
+    """展示页面的周期回调函数：tick - last_tick > 周期 时调用，间隔为周期 + 1 个 tick，页面的绘制由回调函数完成"""
+    interval = period + 1
+    fires = 1e6 / costs.tick / interval
+    return WindowLoad([], [interval], interval, 1, fires, 0.0, fires * costs.callback / 1e4, costs.callback)
+
+
+def analyze_page(page, lines=DEFAULT_SCREEN_LINES, costs=DEFAULT_COSTS, budget=DEFAULT_BUDGET):
+    """分析一个页面，普通页面取每屏 lines 行条目中负载最高的窗口"""
+    if page.kind == PageKind.SHOW:
+        period = parse_period(page.period)
+        if not page.period_callback or period is None:
+            return PageSchedule(page, None, None, None, [], False)
+        window = show_page_load(period, costs)
+        return PageSchedule(page, window, None, None, [], window.load > budget or window.peak_us > costs.tick)
+
+    intervals = {}
+    skipped = []
+    for item in page.items:
+        if item.kind != ItemKind.SHOW:
+            continue
+        period = parse_period(item.period)
+        if not item.callback or period is None:
+            skipped.append(item)
+        else:
+            # 周期为 0 时每次 Easy_Menu_Display 都刷新
+            intervals[item] = max(period, 1)
+    if not intervals:
+        return PageSchedule(page, None, None, None, skipped, False)
+
+    worst = None
+    for start in range(max(len(page.items) - lines, 0) + 1):
+        shown = [item for item in page.items[start:start + lines] if item in intervals]
+        if not shown:
+            continue
+        window = window_load(shown, [intervals[item] for item in shown], costs)
+        if worst is None or (window.load, window.peak) > (worst.load, worst.peak):
+            worst = window
+
+    suggested = suggested_window = None
+    if len(set(worst.intervals)) > 1:
+        candidate = harmonize(worst.intervals)
+        if lcm(candidate) < worst.hyperperiod:
+            suggested = candidate
+            suggested_window = window_load(worst.items, candidate, costs)
+    over_budget = worst.load > budget or worst.peak_us > costs.tick
+    return PageSchedule(page, worst, suggested, suggested_window, skipped, over_budget)
+
+
+def analyze_periods(generator, lines=DEFAULT_SCREEN_LINES, costs=DEFAULT_COSTS, budget=DEFAULT_BUDGET):
+    """分析已收集信息的 generator 中所有有周期刷新的页面，返回 PageSchedule 列表（按页面顺序）"""
+    schedules = []
+    for page in generator.pages:
+        schedule = analyze_page(page, lines, costs, budget)
+        if schedule.window is not None or schedule.skipped:
+            schedules.append(schedule)
+    return schedules
+
+
+def format_period_report(schedules, lines=DEFAULT_SCREEN_LINES, costs=DEFAULT_COSTS, budget=DEFAULT_BUDGET):
+    """周期分析的结果"""
+    report = [f"周期分析（每屏 {lines} 行条目，tick {costs.tick} us，回调 {costs.callback} us，"
+              f"重绘一行 {costs.line} us，屏幕更新 {costs.update} us，预算 {budget:g}%）:"]
+    if not schedules:
+        report.append("  没有周期刷新的展示页面或展示条目")
+    for schedule in schedules:
+        page, window = schedule.page, schedule.window
+        mark = "  [超出预算]" if schedule.over_budget else ""
+        if window is None:
+            report.append(f"  {page.var_name}: 没有周期刷新的展示条目")
+        elif page.kind == PageKind.SHOW:
+            report.append(f"  {page.var_name}（展示页面）: 每 {window.intervals[0]} tick 调用一次周期回调函数，"
+                          f"每秒 {window.fires:.1f} 次，CPU {window.load:.2f}%{mark}")
+        else:
+            names = ", ".join(f"{item.var_name}={interval}" for item, interval in zip(window.items, window.intervals))
+            report.append(f"  {page.var_name}: {names}{mark}")
+            report.append(f"    超周期 {window.hyperperiod} tick，同一 tick 最多刷新 {window.peak} 个条目"
+                          f"（约 {window.peak_us} us），每秒回调 {window.fires:.1f} 次、"
+                          f"屏幕更新 {window.updates:.1f} 次，CPU {window.load:.2f}%")
+            if schedule.suggested is not None:
+                suggested = schedule.suggested_window
+                changes = ", ".join(f"{item.var_name} {old}->{new}" for item, old, new
+                                    in zip(window.items, window.intervals, schedule.suggested) if old != new)
+                report.append(f"    建议周期: {changes}（超周期 {suggested.hyperperiod} tick，"
+                              f"每秒屏幕更新 {suggested.updates:.1f} 次，CPU {suggested.load:.2f}%）")
+        if schedule.skipped:
+            names = ", ".join(item.var_name for item in schedule.skipped)
+            report.append(f"    没有回调函数或周期不是整数，不参与分析: {names}")
+        if window is not None and window.peak_us > costs.tick:
+            report.append("    刷新最多的一次 Easy_Menu_Display 超过一个 tick，主循环会出现抖动")
+    return "\n".join(report)
@@ -0,0 +1,128 @@
+"""
+Easy Menu - 文本布局预计算
+按运行时（menu_core）的显示规则计算静态字符串在一行中的布局：每个字节占一列，相邻两个大于 128 的字节组成一个
+GB2312 双字节字符（占两列），行尾放不下的双字节字符在刷新时被清成空格。
+生成代码时用这些结果填写 TEXT_LAYOUT_PRECOMPUTE 模式下页面与条目的 text_len / title_x，并检查会被截断、
+被拆开或被右侧数值覆盖的名称
+"""
+
+from typing import NamedTuple
+
+# 默认每行列数：Easy_Menu.h 中 SCREEN_WIDTH / CHAR_WIDTH 的默认值 128 / 8
+DEFAULT_SCREEN_COLUMNS = 16
+
+# 条目名称从第 1 列开始显示，第 0 列是光标指示符
+ITEM_TEXT_COL = 1
+
+# 页面名称的字节数保存在 unsigned char 中
+MAX_TEXT_LEN = 255
+
+# 普通页面中各类条目显示在行尾的固定内容的最大宽度（SWITCH_ITEM_MODE 为 1 时的 "[OFF]"、跳转条目的指示符），
+# 枚举条目的宽度取决于枚举字符串，数据、展示条目的宽度随数值变化，不做检查
+ITEM_VALUE_WIDTHS = {
+    "Switch_Item": 5,
+    "Goto_Item": 1,
+}
+
+
+class TextFit(NamedTuple):
+    """字符串在给定列数内的显示结果"""
+    length: int             # 显示的字节数（不会拆开双字节字符）
+    total: int              # 字符串的字节数
+    split: bool             # 是否有一个双字节字符跨过了最后一列
+
+
+def encode_text(text, encoding='gb2312'):
+    """字符串在目标文件编码下的字节，无法编码时按 UTF-8 计算"""
+    try:
+        return text.encode(encoding)
+    except UnicodeEncodeError:
+        return text.encode('utf-8')
+
+
+def fit_text(data, columns):
+    """data 从一行的某一列开始显示时，columns 列内能完整显示的字节数，与运行时的 Easy_Menu_Text_Fit 一致"""
+    index = 0
+    while index < len(data):
+        size = 2 if data[index] > 128 and index + 1 < len(data) and data[index + 1] > 128 else 1
+        if index + size > columns:
+            return TextFit(index, len(data), size == 2 and index + 1 == columns)
+        index += size
+    return TextFit(index, len(data), False)
+
+
+def item_text_len(data, screen_columns=DEFAULT_SCREEN_COLUMNS):
+    """条目名称的 text_len：从第 1 列到行尾能完整显示的字节数"""
+    return fit_text(data, screen_columns - ITEM_TEXT_COL).length
+
+
+def page_text_len(data):
+    """页面名称的 text_len：名称的字节数（最多 255）"""
+    return fit_text(data, MAX_TEXT_LEN).length
+
+
+def title_offset(data, screen_columns=DEFAULT_SCREEN_COLUMNS):
+    """居中显示的标题起始列，按运行时的 unsigned char 运算取值"""
+    return (screen_columns // 2 - page_text_len(data) // 2) & 0xFF
+
+
+class TextWarning(NamedTuple):
+    """一条文本布局警告"""
+    var_name: str
+    text: str
+    message: str
+
+
+def check_text_layout(generator, screen_columns=DEFAULT_SCREEN_COLUMNS, encoding='gb2312'):
+    """检查已收集信息的 generator 中的页面标题、条目名称和枚举字符串，返回 TextWarning 列表"""
+    warnings = []
+    item_columns = screen_columns - ITEM_TEXT_COL
+
+    def warn(node, text, message):
+        warnings.append(TextWarning(node.var_name, text, message))
+
+    def check_fit(node, text, columns, what):
+        data = encode_text(text, encoding)
+        fit = fit_text(data, columns)
+        if fit.length < fit.total:
+            shown = data[:fit.length].decode(encoding, errors='replace')
+            split = "，行尾的双字节字符被拆开" if fit.split else ""
+            warn(node, text, f"{what}超出 {columns} 列，只显示「{shown}」{split}")
+        return fit
+
+    for page in generator.pages:
+        if page.struct == "Ordinary_Page":
+            # 标题只在 TITLE_DISPLAY 为 1 时显示，两侧各有一个指示符
+            data = encode_text(page.display_name, encoding)
+            title_x = title_offset(data, screen_columns)
+            title_end = title_x + page_text_len(data)
+            if title_x == 0 or title_end > screen_columns:
+                warn(page, page.display_name, f"标题（TITLE_DISPLAY 为 1 时）超出 {screen_columns} 列，不能完整显示")
+            elif title_end == screen_columns:
+                warn(page, page.display_name, "标题（TITLE_DISPLAY 为 1 时）右侧的指示符超出屏幕")
+
+        for item in page.items:
+            fit = check_fit(item, item.display_name, item_columns, "名称")
+
+            value_width = ITEM_VALUE_WIDTHS.get(item.struct)
+            if item.enum_array:
+                value_width = 0
+                for string in item.enum_strings:
+                    # 枚举值按 "[%s]" 格式化到 EASY_MENU_COL_MAX_NUM 字节的缓冲区中
+                    value = check_fit(item, string, screen_columns - 3, "枚举字符串")
+                    value_width = max(value_width, value.length + 2)
+            if value_width:
+                covered = ITEM_TEXT_COL + fit.length - (screen_columns - value_width)
+                if covered > 0:
+                    warn(item, item.display_name, f"名称的最后 {covered} 列被行尾 {value_width} 列宽的数值覆盖")
+    return warnings
+
+
+def format_text_layout_report(warnings, screen_columns=DEFAULT_SCREEN_COLUMNS):
+    """文本布局检查的结果"""
+    lines = [f"文本布局检查（每行 {screen_columns} 列）:"]
+    if not warnings:
+        lines.append("  所有名称都能完整显示")
+    for warning in warnings:
+        lines.append(f"  {warning.var_name}「{warning.text}」: {warning.message}")
+    return "\n".join(lines)
@@ -220,6 +220,28 @@ void Easy_Menu_Display_String(int col, unsigned char line, char* str)
     }
 }
 
+void Easy_Menu_Display_Text(unsigned char col, unsigned char line, const char *str, unsigned char len)
+{
+    for(unsigned char i = 0; i < len; i++)
+    {
+        Easy_Menu_Display_Char(col + i, line, str[i]);
+    }
+}
+
+unsigned char Easy_Menu_Text_Fit(const char *str, unsigned char max_cols)
+{
+    unsigned char len = 0;
+    while(str[len] != '\0')
+    {
+        /* 相邻两个大于 128 的字节是一个双字节字符，放不下时整个字符都不显示 */
+        unsigned char size = ((unsigned char)str[len] > 128 && (unsigned char)str[len + 1] > 128) ? 2 : 1;
+        if(len + size > max_cols)
+            break;
+        len += size;
+    }
+    return len;
+}
+
 void Easy_Menu_Printf(int col, unsigned char line, const char *format, ...)
 {
 	char temp_buffer[EASY_MENU_COL_MAX_NUM]; // 临时存储格式化后的字符串
@@ -28,6 +28,15 @@
 
 #define SWITCH_ITEM_MODE    1          // 开关条目显示模式：0->显示 0 / 1，1->显示 OFF / ON
 
+#define SWITCH_ITEM_BIT_PACK    0      // 开关条目数据存放方式：0->每个开关一个 unsigned char，1->按位存放（配置器开启“开关按位存放”时使用）
+
+#define TEXT_LAYOUT_PRECOMPUTE  0    // 名称的显示长度与标题位置：0->每次刷新时用 strlen 计算，1->保存在页面和条目中（配置器开启“预计算文本布局”时使用）
+
+#define VALUE_FORMAT_MODE   0        // 数据、展示、枚举条目数值的显示方式：0->Easy_Menu_Printf（vsnprintf），1->按类型的专用格式化函数（不使用 vsnprintf）
+#define VALUE_FORMAT_TYPES  (VALUE_FORMAT_UNSIGNED | VALUE_FORMAT_SIGNED | VALUE_FORMAT_FLOAT)    // VALUE_FORMAT_MODE 为 1 时编译的数值类型，配置器生成代码时会给出实际用到的类型
+
+#define PAGE_TABLE_MODE     0        // 页面表：0->不使用，1->使用配置器生成的页面表，可以按序号跳转页面、查找上级和子页面（配置器开启“页面表”时使用）
+
 #define ENUM_ITEM_MODE  0              // 枚举条目操作模式：0-普通队列，1-循环队列（从第 0 个往上会回到结尾，从结尾往下会回到第 0 个）
 
 //#define EASY_MENU_CHINESE_CODING  1  // 使用的中文编码：0-UTF-8, 1-GB2312          留作拓展使用，目前只支持 GB2312 编码
@@ -75,6 +84,12 @@ typedef struct Page {
 	PAGE_TYPE type;             // 页面类型
 	char *text;                 // 页面名称
     struct Page *prev_page;     // 上级页面
+#if TEXT_LAYOUT_PRECOMPUTE
+    unsigned char text_len;     // 页面名称的字节数
+#endif
+#if PAGE_TABLE_MODE
+    unsigned char id;           // 页面在页面表中的序号
+#endif
     
     void (*Enter)(void);
     void (*Display)(void);
@@ -98,6 +113,9 @@ typedef struct Item {
 	ITEM_TYPE type;     // 条目类型
 	char *text;         // 条目名称
 	Page *parent_page;  // 父页面
+#if TEXT_LAYOUT_PRECOMPUTE
+    unsigned char text_len;     // 条目名称从第 1 列到行尾能完整显示的字节数（不拆开双字节字符）
+#endif
     
     void (*Input)(struct Item *item, Easy_Menu_Input_TYPE user_input);
 } Item;
@@ -106,6 +124,11 @@ typedef struct Item {
 #define EASY_MENU_LINE_MAX_NUM (SCREEN_HEIGHT / CHAR_HEIGHT)
 #define EASY_MENU_COL_MAX_NUM  (SCREEN_WIDTH / CHAR_WIDTH)
 
+/* VALUE_FORMAT_TYPES 中的数值类型 */
+#define VALUE_FORMAT_UNSIGNED   0x01    // unsigned char / unsigned short int / unsigned int
+#define VALUE_FORMAT_SIGNED     0x02    // signed char / signed short int / signed int
+#define VALUE_FORMAT_FLOAT      0x04    // float
+
 #define EASY_MENU_FREE_CHAR ((unsigned char)USER_FREE_CHAR < 128 ? USER_FREE_CHAR : '>')
 #define EASY_MENU_FIX_CHAR  ((unsigned char)USER_FIX_CHAR < 128 ? USER_FIX_CHAR : '&')
 
@@ -119,6 +142,22 @@ typedef struct Item {
 #define PAGE(user_page) &(user_page.page)
 #define ITEM(user_item) &(user_item.item)
 
+#if PAGE_TABLE_MODE
+/* 页面表：由配置器生成，页面按配置顺序（先序）编号，子页面序号按顺序存放在 Easy_Menu_Page_Children 中 */
+#define PAGE_ID_NONE    0xFF    // 没有对应的页面（顶层页面的上级页面、无效的序号）
+
+typedef struct Page_Table_Entry {
+    Page *page;                 // 页面
+    unsigned char parent;       // 上级页面的序号，顶层页面为 PAGE_ID_NONE
+    unsigned char child_index;  // 第一个子页面的序号在 Easy_Menu_Page_Children 中的位置
+    unsigned char child_num;    // 子页面数量
+} Page_Table_Entry;
+
+extern const Page_Table_Entry Easy_Menu_Page_Table[];
+extern const unsigned char Easy_Menu_Page_Children[];
+extern const unsigned char Easy_Menu_Page_Num;
+#endif
+
 /* 系统结构体 */
 typedef struct Easy_Menu {
     char buffer[EASY_MENU_LINE_MAX_NUM][EASY_MENU_COL_MAX_NUM];                                                             // 实际缓冲区
@@ -153,6 +192,8 @@ void Easy_Menu_Area_Clear(unsigned char col_start, unsigned char col_end, unsign
 
 void Easy_Menu_Display_Char(unsigned char col, unsigned char line, char ch);
 void Easy_Menu_Display_String(int col, unsigned char line, char* str);
+void Easy_Menu_Display_Text(unsigned char col, unsigned char line, const char *str, unsigned char len);
+unsigned char Easy_Menu_Text_Fit(const char *str, unsigned char max_cols);
 
 void Easy_Menu_Printf(int col, unsigned char line, const char *format, ...);
 
@@ -202,4 +243,34 @@ void Easy_Menu_Get_Current_Page_Text(char* str);
   */
 void Easy_Menu_Goto_Page(Page *target_page);
 
+#if PAGE_TABLE_MODE
+/**
+    * @brief  按序号跳转页面
+    * @param  id: 目标页面在页面表中的序号
+    * @retval 1-跳转成功，0-序号无效（未跳转）
+    * @notes  序号按配置顺序编号，生成 Easy_Menu_User.h 时可以使用其中的 PAGE_ID_<页面变量名>
+  */
+unsigned char Easy_Menu_Goto_Page_Id(unsigned char id);
+
+/**
+    * @brief  获取当前页面的序号
+  */
+unsigned char Easy_Menu_Get_Current_Page_Id(void);
+
+/**
+    * @brief  获取上级页面的序号
+    * @param  id: 页面序号
+    * @retval 上级页面的序号，顶层页面或序号无效时为 PAGE_ID_NONE
+  */
+unsigned char Easy_Menu_Get_Parent_Page_Id(unsigned char id);
+
+/**
+    * @brief  获取第 index 个子页面的序号
+    * @param  id: 页面序号
+    * @param  index: 子页面在该页面中的顺序（从 0 开始）
+    * @retval 子页面的序号，没有对应的子页面时为 PAGE_ID_NONE
+  */
+unsigned char Easy_Menu_Get_Child_Page_Id(unsigned char id, unsigned char index);
+#endif
+
 #endif 
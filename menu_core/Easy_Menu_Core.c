@@ -19,6 +19,12 @@ void Easy_Menu_Init(void (*Display_Char)(unsigned short int x, unsigned short in
     
     /* UI 初始化 */
     Easy_Menu_Ui_Init();
+    
+#if PAGE_TABLE_MODE
+    /* 页面记录自己在页面表中的序号 */
+    for(unsigned char i = 0; i < Easy_Menu_Page_Num; i++)
+        Easy_Menu_Page_Table[i].page->id = i;
+#endif
 }
 
 void Easy_Menu_Display(unsigned int Easy_Menu_Tick)
@@ -90,3 +96,31 @@ void Easy_Menu_Goto_Page(Page *target_page)
         easy_menu.current_page->Enter();
 }
 
+#if PAGE_TABLE_MODE
+unsigned char Easy_Menu_Goto_Page_Id(unsigned char id)
+{
+    if(id >= Easy_Menu_Page_Num) return 0;
+    
+    Easy_Menu_Goto_Page(Easy_Menu_Page_Table[id].page);
+    return 1;
+}
+
+unsigned char Easy_Menu_Get_Current_Page_Id(void)
+{
+    return easy_menu.current_page->id;
+}
+
+unsigned char Easy_Menu_Get_Parent_Page_Id(unsigned char id)
+{
+    if(id >= Easy_Menu_Page_Num) return PAGE_ID_NONE;
+    
+    return Easy_Menu_Page_Table[id].parent;
+}
+
+unsigned char Easy_Menu_Get_Child_Page_Id(unsigned char id, unsigned char index)
+{
+    if(id >= Easy_Menu_Page_Num || index >= Easy_Menu_Page_Table[id].child_num) return PAGE_ID_NONE;
+    
+    return Easy_Menu_Page_Children[Easy_Menu_Page_Table[id].child_index + index];
+}
+#endif
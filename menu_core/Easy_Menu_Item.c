@@ -1,11 +1,16 @@
 #include "Easy_Menu_Item.h"
 
+#include <stdint.h>
+
 /* ================================================================= 文本条目 ================================================================= */
 void Text_Item_Init(Page *parent_page, Item *item, char *text, void (*Callback)(char *str))
 {
     item->parent_page = parent_page;
     item->type = TEXT_ITEM;
     item->text = text;
+#if TEXT_LAYOUT_PRECOMPUTE
+    item->text_len = Easy_Menu_Text_Fit(text, EASY_MENU_COL_MAX_NUM - 1);
+#endif
     
     item->Input = Text_Item_Input;
     
@@ -28,14 +33,30 @@ void Switch_Item_Init(Page *parent_page, Item *item, char *text, unsigned char *
     item->parent_page = parent_page;
     item->type = SWITCH_ITEM;
     item->text = text;
+#if TEXT_LAYOUT_PRECOMPUTE
+    item->text_len = Easy_Menu_Text_Fit(text, EASY_MENU_COL_MAX_NUM - 1);
+#endif
     
     item->Input = Switch_Item_Input;
     
     Switch_Item *switch_item = (Switch_Item*)item;
     switch_item->data = data;
+#if SWITCH_ITEM_BIT_PACK
+    switch_item->mask = 0;      // 不按位存放的开关，按整个字节读取与翻转
+#endif
     switch_item->Callback = Callback;
 }
 
+#if SWITCH_ITEM_BIT_PACK
+void Switch_Item_Bit_Init(Page *parent_page, Item *item, char *text, unsigned char *data, unsigned char mask, void (*Callback)(unsigned char data))
+{
+    Switch_Item_Init(parent_page, item, text, data, Callback);
+    
+    Switch_Item *switch_item = (Switch_Item*)item;
+    switch_item->mask = mask;
+}
+#endif
+
 void Switch_Item_Input(Item *item, Easy_Menu_Input_TYPE user_input)
 {
     Switch_Item *switch_item = (Switch_Item*)item;
@@ -43,17 +64,17 @@ void Switch_Item_Input(Item *item, Easy_Menu_Input_TYPE user_input)
     switch(user_input)
     {
         case EASY_MENU_UP:
-            *(switch_item->data) ^= 1;
+            SWITCH_ITEM_TOGGLE(switch_item);
             break;
         case EASY_MENU_DOWN:
-            *(switch_item->data) ^= 1;
+            SWITCH_ITEM_TOGGLE(switch_item);
             break;
         default:
             break;
     }
     
     if(switch_item->Callback != NULL)
-        switch_item->Callback(*(switch_item->data));
+        switch_item->Callback(SWITCH_ITEM_STATE(switch_item));
 }
 /* ================================================================= 数值条目 ================================================================= */
 void Data_Item_Init(Page *parent_page, Item *item, char *text, DATA_TYPE data_type, void *data, Data_Item_Value step, unsigned char use_step, Data_Item_Value min, unsigned char use_min,  Data_Item_Value max, unsigned char use_max, void (*Callback)(void *data))
@@ -61,6 +82,9 @@ void Data_Item_Init(Page *parent_page, Item *item, char *text, DATA_TYPE data_ty
     item->parent_page = parent_page;
     item->type = DATA_ITEM;
     item->text = text;
+#if TEXT_LAYOUT_PRECOMPUTE
+    item->text_len = Easy_Menu_Text_Fit(text, EASY_MENU_COL_MAX_NUM - 1);
+#endif
     
     item->Input = Data_Item_Input;
     
@@ -320,6 +344,9 @@ void Enum_Item_Init(Page *parent_page, Item *item, char *text, char **enum_str,
     item->parent_page = parent_page;
     item->type = ENUM_ITEM;
     item->text = text;
+#if TEXT_LAYOUT_PRECOMPUTE
+    item->text_len = Easy_Menu_Text_Fit(text, EASY_MENU_COL_MAX_NUM - 1);
+#endif
     
     item->Input = Enum_Item_Input;
     
@@ -369,6 +396,9 @@ void Show_Item_Init(Page *parent_page, Item *item, char *text, DATA_TYPE data_ty
     item->parent_page = parent_page;
     item->type = SHOW_ITEM;
     item->text = text;
+#if TEXT_LAYOUT_PRECOMPUTE
+    item->text_len = Easy_Menu_Text_Fit(text, EASY_MENU_COL_MAX_NUM - 1);
+#endif
     
     Show_Item *show_item = (Show_Item*)item;
 
@@ -386,6 +416,9 @@ void Goto_Item_Init(Page *parent_page, Item *item, char *text, Page *target_page
     item->parent_page = parent_page;
     item->type = GOTO_ITEM;
     item->text = text;
+#if TEXT_LAYOUT_PRECOMPUTE
+    item->text_len = Easy_Menu_Text_Fit(text, EASY_MENU_COL_MAX_NUM - 1);
+#endif
     
     item->Input = Goto_Item_Input;
 
@@ -403,3 +436,221 @@ void Goto_Item_Input(Item *item, Easy_Menu_Input_TYPE user_input)
     }
 }
 
+/* ================================================================= 数值显示 ================================================================= */
+#if VALUE_FORMAT_MODE
+#define VALUE_TEXT_SIZE 48      // 可以放下 "[-" + float 的最多 39 位整数 + ".00]"
+
+/* 与 Easy_Menu_Printf 相同：超出一行的部分截掉后右对齐显示 */
+static void Value_Display_Text(unsigned char line, char *text, unsigned char len)
+{
+    if(len > EASY_MENU_COL_MAX_NUM - 1)
+        len = EASY_MENU_COL_MAX_NUM - 1;
+    text[len] = '\0';
+    
+    Easy_Menu_Display_String(-1, line, text);
+}
+
+#if VALUE_FORMAT_TYPES
+/* 从 end 向前写入 value 的十进制数字，返回第一个数字的位置 */
+static char *Value_Format_Unsigned(char *end, unsigned long value)
+{
+    do
+    {
+        *--end = '0' + value % 10;
+        value /= 10;
+    } while(value != 0);
+    
+    return end;
+}
+#endif
+
+#if VALUE_FORMAT_TYPES & VALUE_FORMAT_SIGNED
+static char *Value_Format_Signed(char *end, long value)
+{
+    char *start = Value_Format_Unsigned(end, value < 0 ? 0UL - (unsigned long)value : (unsigned long)value);
+    
+    if(value < 0)
+        *--start = '-';
+    return start;
+}
+#endif
+
+#if VALUE_FORMAT_TYPES & VALUE_FORMAT_FLOAT
+/* 与 "%.2f" 相同：按 float 的精确值舍入到两位小数，恰好一半时取偶数 */
+static char *Value_Format_Float(char *end, float value)
+{
+    union { float f; uint32_t u; } bits = { value };
+    uint32_t mantissa = bits.u & 0x7FFFFFUL;
+    int exponent = (bits.u >> 23) & 0xFF;
+    char *start = end;
+    
+    if(exponent == 0xFF)
+    {
+        start -= 3;
+        memcpy(start, mantissa != 0 ? "nan" : "inf", 3);
+    }
+    else
+    {
+        /* value = mantissa * 2^exponent */
+        if(exponent != 0)
+            mantissa |= 0x800000UL;
+        else
+            exponent = 1;
+        exponent -= 150;
+        
+        if(exponent < 0)
+        {
+            /* 百分位：mantissa * 100 / 2^-exponent，舍入时比较余数与一半 */
+            uint32_t hundredths = 0;
+            if(exponent > -32)
+            {
+                uint32_t scaled = mantissa * 100;
+                unsigned char shift = -exponent;
+                uint32_t rest = scaled & ((1UL << shift) - 1);
+                uint32_t half = 1UL << (shift - 1);
+                
+                hundredths = scaled >> shift;
+                if(rest > half || (rest == half && (hundredths & 1)))
+                    hundredths++;
+            }
+            *--start = '0' + hundredths % 10;
+            hundredths /= 10;
+            *--start = '0' + hundredths % 10;
+            hundredths /= 10;
+            *--start = '.';
+            start = Value_Format_Unsigned(start, hundredths);
+        }
+        else
+        {
+            /* 整数：以 10^9 为基逐次乘 2，低位在前，最大 2^128 需要 5 节 */
+            uint32_t limbs[5] = {mantissa};
+            unsigned char count = 1;
+            
+            while(exponent-- > 0)
+            {
+                uint32_t carry = 0;
+                for(unsigned char i = 0; i < count; i++)
+                {
+                    uint32_t limb = limbs[i] * 2 + carry;
+                    carry = limb >= 1000000000UL;
+                    limbs[i] = carry ? limb - 1000000000UL : limb;
+                }
+                if(carry)
+                    limbs[count++] = carry;
+            }
+            
+            *--start = '0';
+            *--start = '0';
+            *--start = '.';
+            for(unsigned char i = 0; i + 1 < count; i++)
+            {
+                /* 除最高一节外每节补足 9 位 */
+                uint32_t limb = limbs[i];
+                for(unsigned char k = 0; k < 9; k++)
+                {
+                    *--start = '0' + limb % 10;
+                    limb /= 10;
+                }
+            }
+            start = Value_Format_Unsigned(start, limbs[count - 1]);
+        }
+    }
+    
+    if(bits.u >> 31)
+        *--start = '-';
+    return start;
+}
+#endif
+#endif
+
+void Easy_Menu_Display_Value(unsigned char line, DATA_TYPE data_type, void *data)
+{
+#if VALUE_FORMAT_MODE
+    char text[VALUE_TEXT_SIZE];
+    char *end = text + VALUE_TEXT_SIZE - 2;
+    char *start;
+    
+    end[0] = ']';
+    end[1] = '\0';
+    
+    switch(data_type)
+    {
+#if VALUE_FORMAT_TYPES & VALUE_FORMAT_UNSIGNED
+        case UNSIGNED_CHAR:
+            start = Value_Format_Unsigned(end, *((unsigned char*)data));
+            break;
+        case UNSIGNED_SHORT_INT:
+            start = Value_Format_Unsigned(end, *((unsigned short int*)data));
+            break;
+        case UNSIGNED_INT:
+            start = Value_Format_Unsigned(end, *((unsigned int*)data));
+            break;
+#endif
+#if VALUE_FORMAT_TYPES & VALUE_FORMAT_SIGNED
+        case SIGNED_CHAR:
+            start = Value_Format_Signed(end, *((signed char*)data));
+            break;
+        case SIGNED_SHORT_INT:
+            start = Value_Format_Signed(end, *((signed short int*)data));
+            break;
+        case SIGNED_INT:
+            start = Value_Format_Signed(end, *((signed int*)data));
+            break;
+#endif
+#if VALUE_FORMAT_TYPES & VALUE_FORMAT_FLOAT
+        case FLOAT:
+            start = Value_Format_Float(end, *((float*)data));
+            break;
+#endif
+        default:
+            /* 没有编译的类型不显示 */
+            return;
+    }
+    
+    *--start = '[';
+    Value_Display_Text(line, start, end + 1 - start);
+#else
+    switch(data_type)
+    {
+        case UNSIGNED_CHAR:
+            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned char*)data));
+            break;
+        case UNSIGNED_SHORT_INT:
+            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned short int*)data));
+            break;
+        case UNSIGNED_INT:
+            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned int*)data));
+            break;
+        case SIGNED_CHAR:
+            Easy_Menu_Printf(-1, line, "[%d]", *((signed char*)data));
+            break;
+        case SIGNED_SHORT_INT:
+            Easy_Menu_Printf(-1, line, "[%d]", *((signed short int*)data));
+            break;
+        case SIGNED_INT:
+            Easy_Menu_Printf(-1, line, "[%d]", *((signed int*)data));
+            break;
+        case FLOAT:
+            Easy_Menu_Printf(-1, line, "[%.2f]", *((float*)data));
+            break;
+    }
+#endif
+}
+
+void Easy_Menu_Display_Enum(unsigned char line, char *str)
+{
+#if VALUE_FORMAT_MODE
+    char text[EASY_MENU_COL_MAX_NUM + 1];
+    unsigned char len = 0;
+    
+    text[len++] = '[';
+    while(*str != '\0' && len < EASY_MENU_COL_MAX_NUM)
+        text[len++] = *str++;
+    if(len < EASY_MENU_COL_MAX_NUM)
+        text[len++] = ']';
+    
+    Value_Display_Text(line, text, len);
+#else
+    Easy_Menu_Printf(-1, line, "[%s]", str);
+#endif
+}
@@ -27,11 +27,26 @@ void Text_Item_Input(Item *item, Easy_Menu_Input_TYPE user_input);
 typedef struct Switch_Item {
 	Item item;
     unsigned char *data;
+#if SWITCH_ITEM_BIT_PACK
+    unsigned char mask;         // 开关状态在 *data 中对应的位，为 0 时单独占用整个字节（与不按位存放时相同）
+#endif
     
     void (*Callback)(unsigned char data);
 } Switch_Item;
+// ------ 开关状态的读取与翻转
+#if SWITCH_ITEM_BIT_PACK
+#define SWITCH_ITEM_STATE(switch_item)  ((switch_item)->mask ? (*((switch_item)->data) & (switch_item)->mask) != 0 \
+                                                            : *((switch_item)->data))
+#define SWITCH_ITEM_TOGGLE(switch_item) (*((switch_item)->data) ^= ((switch_item)->mask ? (switch_item)->mask : 1))
+#else
+#define SWITCH_ITEM_STATE(switch_item)  (*((switch_item)->data))
+#define SWITCH_ITEM_TOGGLE(switch_item) (*((switch_item)->data) ^= 1)
+#endif
 // ------ 相关函数
 void Switch_Item_Init(Page *parent_page, Item *item, char *text, unsigned char *data, void (*Callback)(unsigned char data));
+#if SWITCH_ITEM_BIT_PACK
+void Switch_Item_Bit_Init(Page *parent_page, Item *item, char *text, unsigned char *data, unsigned char mask, void (*Callback)(unsigned char data));
+#endif
 void Switch_Item_Input(Item *item, Easy_Menu_Input_TYPE user_input);
 /* ================================================================= 数值条目 ================================================================= */
 // ------ 功能介绍
@@ -146,4 +161,14 @@ typedef struct Goto_Item {
 void Goto_Item_Init(Page *parent_page, Item *item, char *text, Page *target_page);
 void Goto_Item_Input(Item *item, Easy_Menu_Input_TYPE user_input);
 
+/* ================================================================= 数值显示 ================================================================= */
+// ------ 功能介绍
+/*
+ * 在行尾显示数据、展示条目的数值（[数值]，小数保留两位）和枚举条目的当前字符串（[字符串]），超出一行的部分截掉
+ * VALUE_FORMAT_MODE 为 0 时使用 Easy_Menu_Printf，为 1 时使用按类型的专用格式化函数，只编译 VALUE_FORMAT_TYPES 中的类型
+*/
+// ------ 相关函数
+void Easy_Menu_Display_Value(unsigned char line, DATA_TYPE data_type, void *data);
+void Easy_Menu_Display_Enum(unsigned char line, char *str);
+
 #endif 
@@ -2,10 +2,43 @@
 #include "Easy_Menu_Item.h"
 
 /* ================================================================= 普通页面 ================================================================= */
+/* 显示条目名称 */
+static void Ordinary_Page_Display_Item_Text(Item *item, unsigned char line)
+{
+#if TEXT_LAYOUT_PRECOMPUTE
+    Easy_Menu_Display_Text(1, line, item->text, item->text_len);
+#else
+    Easy_Menu_Display_String(1, line, item->text);
+#endif
+}
+
+#if ORDINARY_PAGE_TITLE_DISPLAY
+/* 居中显示标题 */
+static void Ordinary_Page_Display_Title(Ordinary_Page *ordinary_page)
+{
+#if TEXT_LAYOUT_PRECOMPUTE
+    unsigned char title_x = ordinary_page->title_x;
+    
+    Easy_Menu_Display_Char(title_x - 1, 0, EASY_MENU_TITLE_LEFT_CHAR);
+    Easy_Menu_Display_Text(title_x, 0, ordinary_page->page.text, ordinary_page->page.text_len);
+    Easy_Menu_Display_Char(title_x + ordinary_page->page.text_len, 0, EASY_MENU_TITLE_RIGHT_CHAR);
+#else
+    unsigned char title_x = (EASY_MENU_COL_MAX_NUM / 2) - (strlen(ordinary_page->page.text) / 2);
+    
+    Easy_Menu_Display_Char(title_x - 1, 0, EASY_MENU_TITLE_LEFT_CHAR);
+    Easy_Menu_Display_String(title_x, 0, ordinary_page->page.text);
+    Easy_Menu_Display_Char(title_x + strlen(ordinary_page->page.text), 0, EASY_MENU_TITLE_RIGHT_CHAR);
+#endif
+}
+#endif
+
 void Ordinary_Page_Init(Page *prev_page, Page *page, char *text, Item **items, unsigned char item_num)
 {
     page->type = ORDINARY_PAGE;
     page->text = text;
+#if TEXT_LAYOUT_PRECOMPUTE
+    page->text_len = Easy_Menu_Text_Fit(text, UCHAR_MAX);
+#endif
     page->prev_page = prev_page;
     
     page->Enter = Ordinary_Page_Enter;
@@ -26,6 +59,9 @@ void Ordinary_Page_Init(Page *prev_page, Page *page, char *text, Item **items, u
 #else
     ordinary_page->cursor = 1;
 #endif
+#if TEXT_LAYOUT_PRECOMPUTE
+    ordinary_page->title_x = (EASY_MENU_COL_MAX_NUM / 2) - (page->text_len / 2);
+#endif
 
     ordinary_page->Refresh = Ordinary_Page_Refresh;
 }
@@ -43,7 +79,7 @@ void Ordinary_Page_Enter(void)
             {
                 Switch_Item *switch_item = (Switch_Item*)ordinary_page->items[item_index];
                 if(switch_item->Callback != NULL)
-                    switch_item->Callback(*(switch_item->data));
+                    switch_item->Callback(SWITCH_ITEM_STATE(switch_item));
                 break;
             }
             case DATA_ITEM:
@@ -91,7 +127,7 @@ void Ordinary_Page_Enter(void)
         for(unsigned char line = 0; ordinary_page->items_index + line < ordinary_page->item_num && line < max_visible_items && ordinary_page->items[ordinary_page->items_index + line] != NULL; line++)
         {
             /* 显示条目名称 */
-            Easy_Menu_Display_String(1, line, ordinary_page->items[ordinary_page->items_index + line]->text);
+            Ordinary_Page_Display_Item_Text(ordinary_page->items[ordinary_page->items_index + line], line);
             
             /* 显示条目数值 */
             switch(ordinary_page->items[ordinary_page->items_index + line]->type)
@@ -100,12 +136,12 @@ void Ordinary_Page_Enter(void)
                 {
                     Switch_Item *switch_item = (Switch_Item*)ordinary_page->items[ordinary_page->items_index + line];
 #if SWITCH_ITEM_MODE == 0
-                    if(*(switch_item->data) == 0)
+                    if(SWITCH_ITEM_STATE(switch_item) == 0)
                         Easy_Menu_Display_String(-1, line, "[0]");
                     else
                         Easy_Menu_Display_String(-1, line, "[1]");
 #else
-                    if(*(switch_item->data) == 0)
+                    if(SWITCH_ITEM_STATE(switch_item) == 0)
                         Easy_Menu_Display_String(-1, line, "[OFF]");
                     else
                         Easy_Menu_Display_String(-1, line, "[ON]");
@@ -115,65 +151,19 @@ void Ordinary_Page_Enter(void)
                 case DATA_ITEM:
                 {
                     Data_Item *data_item = (Data_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    switch(data_item->data_type)
-                    {
-                        case UNSIGNED_CHAR:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned char*)(data_item->data)));
-                            break;
-                        case UNSIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned short int*)(data_item->data)));
-                            break;
-                        case UNSIGNED_INT:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned int*)(data_item->data)));
-                            break;
-                        case SIGNED_CHAR:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed char*)(data_item->data)));
-                            break;
-                        case SIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed short int*)(data_item->data)));
-                            break;
-                        case SIGNED_INT:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed int*)(data_item->data)));
-                            break;
-                        case FLOAT:
-                            Easy_Menu_Printf(-1, line, "[%.2f]", *((float*)(data_item->data)));
-                            break;
-                    }
+                    Easy_Menu_Display_Value(line, data_item->data_type, data_item->data);
                     break;
                 }
                 case ENUM_ITEM:
                 {
                     Enum_Item *enum_item = (Enum_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    Easy_Menu_Printf(-1, line, "[%s]", enum_item->enum_str[enum_item->enum_str_index]);
+                    Easy_Menu_Display_Enum(line, enum_item->enum_str[enum_item->enum_str_index]);
                     break;
                 }
                 case SHOW_ITEM:
                 {
                     Show_Item *show_item = (Show_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    switch(show_item->data_type)
-                    {
-                        case UNSIGNED_CHAR:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned char*)(show_item->data)));
-                            break;
-                        case UNSIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned short int*)(show_item->data)));
-                            break;
-                        case UNSIGNED_INT:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned int*)(show_item->data)));
-                            break;
-                        case SIGNED_CHAR:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed char*)(show_item->data)));
-                            break;
-                        case SIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed short int*)(show_item->data)));
-                            break;
-                        case SIGNED_INT:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed int*)(show_item->data)));
-                            break;
-                        case FLOAT:
-                            Easy_Menu_Printf(-1, line, "[%.2f]", *((float*)(show_item->data)));
-                            break;
-                    }
+                    Easy_Menu_Display_Value(line, show_item->data_type, show_item->data);
                     break;
                 }
                 case GOTO_ITEM:
@@ -185,11 +175,7 @@ void Ordinary_Page_Enter(void)
         }
 #else
         /* 显示标题 */
-        unsigned char title_x = (EASY_MENU_COL_MAX_NUM / 2) - (strlen(ordinary_page->page.text) / 2);
-        
-        Easy_Menu_Display_Char(title_x - 1, 0, EASY_MENU_TITLE_LEFT_CHAR);
-        Easy_Menu_Display_String(title_x, 0, ordinary_page->page.text);
-        Easy_Menu_Display_Char(title_x + strlen(ordinary_page->page.text), 0, EASY_MENU_TITLE_RIGHT_CHAR);
+        Ordinary_Page_Display_Title(ordinary_page);
 
         
         /* 显示条目 */
@@ -198,7 +184,7 @@ void Ordinary_Page_Enter(void)
             unsigned char display_line = line + line_offset; // 显示行号（跳过标题行）
             
             /* 显示条目名称 */
-            Easy_Menu_Display_String(1, display_line, ordinary_page->items[ordinary_page->items_index + line]->text);
+            Ordinary_Page_Display_Item_Text(ordinary_page->items[ordinary_page->items_index + line], display_line);
             
             /* 显示条目数值 */
             switch(ordinary_page->items[ordinary_page->items_index + line]->type)
@@ -207,12 +193,12 @@ void Ordinary_Page_Enter(void)
                 {
                     Switch_Item *switch_item = (Switch_Item*)ordinary_page->items[ordinary_page->items_index + line];
 #if SWITCH_ITEM_MODE == 0
-                    if(*(switch_item->data) == 0)
+                    if(SWITCH_ITEM_STATE(switch_item) == 0)
                         Easy_Menu_Display_String(-1, display_line, "[0]");
                     else
                         Easy_Menu_Display_String(-1, display_line, "[1]");
 #else
-                    if(*(switch_item->data) == 0)
+                    if(SWITCH_ITEM_STATE(switch_item) == 0)
                         Easy_Menu_Display_String(-1, display_line, "[OFF]");
                     else
                         Easy_Menu_Display_String(-1, display_line, "[ON]");
@@ -222,65 +208,19 @@ void Ordinary_Page_Enter(void)
                 case DATA_ITEM:
                 {
                     Data_Item *data_item = (Data_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    switch(data_item->data_type)
-                    {
-                        case UNSIGNED_CHAR:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned char*)(data_item->data)));
-                            break;
-                        case UNSIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned short int*)(data_item->data)));
-                            break;
-                        case UNSIGNED_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned int*)(data_item->data)));
-                            break;
-                        case SIGNED_CHAR:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed char*)(data_item->data)));
-                            break;
-                        case SIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed short int*)(data_item->data)));
-                            break;
-                        case SIGNED_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed int*)(data_item->data)));
-                            break;
-                        case FLOAT:
-                            Easy_Menu_Printf(-1, display_line, "[%.2f]", *((float*)(data_item->data)));
-                            break;
-                    }
+                    Easy_Menu_Display_Value(display_line, data_item->data_type, data_item->data);
                     break;
                 }
                 case ENUM_ITEM:
                 {
                     Enum_Item *enum_item = (Enum_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    Easy_Menu_Printf(-1, display_line, "[%s]", enum_item->enum_str[enum_item->enum_str_index]);
+                    Easy_Menu_Display_Enum(display_line, enum_item->enum_str[enum_item->enum_str_index]);
                     break;
                 }
                 case SHOW_ITEM:
                 {
                     Show_Item *show_item = (Show_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    switch(show_item->data_type)
-                    {
-                        case UNSIGNED_CHAR:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned char*)(show_item->data)));
-                            break;
-                        case UNSIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned short int*)(show_item->data)));
-                            break;
-                        case UNSIGNED_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned int*)(show_item->data)));
-                            break;
-                        case SIGNED_CHAR:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed char*)(show_item->data)));
-                            break;
-                        case SIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed short int*)(show_item->data)));
-                            break;
-                        case SIGNED_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed int*)(show_item->data)));
-                            break;
-                        case FLOAT:
-                            Easy_Menu_Printf(-1, display_line, "[%.2f]", *((float*)(show_item->data)));
-                            break;
-                    }
+                    Easy_Menu_Display_Value(display_line, show_item->data_type, show_item->data);
                     break;
                 }
                 case GOTO_ITEM:
@@ -309,6 +249,7 @@ void Ordinary_Page_Display(void)
 #endif
 
     Ordinary_Page *ordinary_page = (Ordinary_Page*)(easy_menu.current_page);
+    unsigned char refresh_flag = 0;                // 本次有展示条目刷新，同一次调用中的刷新共用一次屏幕更新
     
     // 修复索引问题：需要考虑行偏移量
     for(unsigned char line = cursor_start_line; line < EASY_MENU_LINE_MAX_NUM; line++)
@@ -331,37 +272,19 @@ void Ordinary_Page_Display(void)
                 show_item->Callback();
                 
                 Easy_Menu_Area_Clear(1, EASY_MENU_COL_MAX_NUM, line, line);
-                Easy_Menu_Display_String(1, line, ordinary_page->items[item_index]->text);
+                Ordinary_Page_Display_Item_Text(ordinary_page->items[item_index], line);
                 
-                switch(show_item->data_type)
-                {
-                    case UNSIGNED_CHAR:
-                        Easy_Menu_Printf(-1, line, "[%u]", *((unsigned char*)(show_item->data)));
-                        break;
-                    case UNSIGNED_SHORT_INT:
-                        Easy_Menu_Printf(-1, line, "[%u]", *((unsigned short int*)(show_item->data)));
-                        break;
-                    case UNSIGNED_INT:
-                        Easy_Menu_Printf(-1, line, "[%u]", *((unsigned int*)(show_item->data)));
-                        break;
-                    case SIGNED_CHAR:
-                        Easy_Menu_Printf(-1, line, "[%d]", *((signed char*)(show_item->data)));
-                        break;
-                    case SIGNED_SHORT_INT:
-                        Easy_Menu_Printf(-1, line, "[%d]", *((signed short int*)(show_item->data)));
-                        break;
-                    case SIGNED_INT:
-                        Easy_Menu_Printf(-1, line, "[%d]", *((signed int*)(show_item->data)));
-                        break;
-                    case FLOAT:
-                        Easy_Menu_Printf(-1, line, "[%.2f]", *((float*)(show_item->data)));
-                        break;
-                }
+                Easy_Menu_Display_Value(line, show_item->data_type, show_item->data);
                 
-                Easy_Menu_All_Update();
+                refresh_flag = 1;
             }
         }
     }
+    
+    if(refresh_flag)
+    {
+        Easy_Menu_All_Update();
+    }
 }
 
 void Ordinary_Page_Input(Easy_Menu_Input_TYPE user_input)
@@ -564,7 +487,7 @@ void Ordinary_Page_Input(Easy_Menu_Input_TYPE user_input)
         for(unsigned char line = 0; ordinary_page->items_index + line < ordinary_page->item_num && line < max_visible_items && ordinary_page->items[ordinary_page->items_index + line] != NULL; line++)
         {
             /* 显示条目名称 */
-            Easy_Menu_Display_String(1, line, ordinary_page->items[ordinary_page->items_index + line]->text);
+            Ordinary_Page_Display_Item_Text(ordinary_page->items[ordinary_page->items_index + line], line);
             /* 显示条目数值 */
             switch(ordinary_page->items[ordinary_page->items_index + line]->type)
             {
@@ -572,12 +495,12 @@ void Ordinary_Page_Input(Easy_Menu_Input_TYPE user_input)
                 {
                     Switch_Item *switch_item = (Switch_Item*)ordinary_page->items[ordinary_page->items_index + line];
 #if SWITCH_ITEM_MODE == 0
-                    if(*(switch_item->data) == 0)
+                    if(SWITCH_ITEM_STATE(switch_item) == 0)
                         Easy_Menu_Display_String(-1, line, "[0]");
                     else
                         Easy_Menu_Display_String(-1, line, "[1]");
 #else
-                    if(*(switch_item->data) == 0)
+                    if(SWITCH_ITEM_STATE(switch_item) == 0)
                         Easy_Menu_Display_String(-1, line, "[OFF]");
                     else
                         Easy_Menu_Display_String(-1, line, "[ON]");
@@ -587,65 +510,19 @@ void Ordinary_Page_Input(Easy_Menu_Input_TYPE user_input)
                 case DATA_ITEM:
                 {
                     Data_Item *data_item = (Data_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    switch(data_item->data_type)
-                    {
-                        case UNSIGNED_CHAR:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned char*)(data_item->data)));
-                            break;
-                        case UNSIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned short int*)(data_item->data)));
-                            break;
-                        case UNSIGNED_INT:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned int*)(data_item->data)));
-                            break;
-                        case SIGNED_CHAR:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed char*)(data_item->data)));
-                            break;
-                        case SIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed short int*)(data_item->data)));
-                            break;
-                        case SIGNED_INT:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed int*)(data_item->data)));
-                            break;
-                        case FLOAT:
-                            Easy_Menu_Printf(-1, line, "[%.2f]", *((float*)(data_item->data)));
-                            break;
-                    }
+                    Easy_Menu_Display_Value(line, data_item->data_type, data_item->data);
                     break;
                 }
                 case ENUM_ITEM:
                 {
                     Enum_Item *enum_item = (Enum_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    Easy_Menu_Printf(-1, line, "[%s]", enum_item->enum_str[enum_item->enum_str_index]);
+                    Easy_Menu_Display_Enum(line, enum_item->enum_str[enum_item->enum_str_index]);
                     break;
                 }
                 case SHOW_ITEM:
                 {
                     Show_Item *show_item = (Show_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    switch(show_item->data_type)
-                    {
-                        case UNSIGNED_CHAR:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned char*)(show_item->data)));
-                            break;
-                        case UNSIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned short int*)(show_item->data)));
-                            break;
-                        case UNSIGNED_INT:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned int*)(show_item->data)));
-                            break;
-                        case SIGNED_CHAR:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed char*)(show_item->data)));
-                            break;
-                        case SIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed short int*)(show_item->data)));
-                            break;
-                        case SIGNED_INT:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed int*)(show_item->data)));
-                            break;
-                        case FLOAT:
-                            Easy_Menu_Printf(-1, line, "[%.2f]", *((float*)(show_item->data)));
-                            break;
-                    }
+                    Easy_Menu_Display_Value(line, show_item->data_type, show_item->data);
                     break;
                 }
                 case GOTO_ITEM:
@@ -657,11 +534,7 @@ void Ordinary_Page_Input(Easy_Menu_Input_TYPE user_input)
         }
 #else
         /* 显示标题 */
-        unsigned char title_x = (EASY_MENU_COL_MAX_NUM / 2) - (strlen(ordinary_page->page.text) / 2);
-        
-        Easy_Menu_Display_Char(title_x - 1, 0, EASY_MENU_TITLE_LEFT_CHAR);
-        Easy_Menu_Display_String(title_x, 0, ordinary_page->page.text);
-        Easy_Menu_Display_Char(title_x + strlen(ordinary_page->page.text), 0, EASY_MENU_TITLE_RIGHT_CHAR);
+        Ordinary_Page_Display_Title(ordinary_page);
         
         /* 显示条目 */
         for(unsigned char line = 0; ordinary_page->items_index + line < ordinary_page->item_num && line < max_visible_items && ordinary_page->items[ordinary_page->items_index + line] != NULL; line++)
@@ -669,7 +542,7 @@ void Ordinary_Page_Input(Easy_Menu_Input_TYPE user_input)
             unsigned char display_line = line + line_offset; // 显示行号（跳过标题行）
             
             /* 显示条目名称 */
-            Easy_Menu_Display_String(1, display_line, ordinary_page->items[ordinary_page->items_index + line]->text);
+            Ordinary_Page_Display_Item_Text(ordinary_page->items[ordinary_page->items_index + line], display_line);
             
             /* 显示条目数值 */
             switch(ordinary_page->items[ordinary_page->items_index + line]->type)
@@ -678,12 +551,12 @@ void Ordinary_Page_Input(Easy_Menu_Input_TYPE user_input)
                 {
                     Switch_Item *switch_item = (Switch_Item*)ordinary_page->items[ordinary_page->items_index + line];
 #if SWITCH_ITEM_MODE == 0
-                    if(*(switch_item->data) == 0)
+                    if(SWITCH_ITEM_STATE(switch_item) == 0)
                         Easy_Menu_Display_String(-1, display_line, "[0]");
                     else
                         Easy_Menu_Display_String(-1, display_line, "[1]");
 #else
-                    if(*(switch_item->data) == 0)
+                    if(SWITCH_ITEM_STATE(switch_item) == 0)
                         Easy_Menu_Display_String(-1, display_line, "[OFF]");
                     else
                         Easy_Menu_Display_String(-1, display_line, "[ON]");
@@ -693,65 +566,19 @@ void Ordinary_Page_Input(Easy_Menu_Input_TYPE user_input)
                 case DATA_ITEM:
                 {
                     Data_Item *data_item = (Data_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    switch(data_item->data_type)
-                    {
-                        case UNSIGNED_CHAR:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned char*)(data_item->data)));
-                            break;
-                        case UNSIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned short int*)(data_item->data)));
-                            break;
-                        case UNSIGNED_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned int*)(data_item->data)));
-                            break;
-                        case SIGNED_CHAR:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed char*)(data_item->data)));
-                            break;
-                        case SIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed short int*)(data_item->data)));
-                            break;
-                        case SIGNED_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed int*)(data_item->data)));
-                            break;
-                        case FLOAT:
-                            Easy_Menu_Printf(-1, display_line, "[%.2f]", *((float*)(data_item->data)));
-                            break;
-                    }
+                    Easy_Menu_Display_Value(display_line, data_item->data_type, data_item->data);
                     break;
                 }
                 case ENUM_ITEM:
                 {
                     Enum_Item *enum_item = (Enum_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    Easy_Menu_Printf(-1, display_line, "[%s]", enum_item->enum_str[enum_item->enum_str_index]);
+                    Easy_Menu_Display_Enum(display_line, enum_item->enum_str[enum_item->enum_str_index]);
                     break;
                 }
                 case SHOW_ITEM:
                 {
                     Show_Item *show_item = (Show_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    switch(show_item->data_type)
-                    {
-                        case UNSIGNED_CHAR:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned char*)(show_item->data)));
-                            break;
-                        case UNSIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned short int*)(show_item->data)));
-                            break;
-                        case UNSIGNED_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned int*)(show_item->data)));
-                            break;
-                        case SIGNED_CHAR:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed char*)(show_item->data)));
-                            break;
-                        case SIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed short int*)(show_item->data)));
-                            break;
-                        case SIGNED_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed int*)(show_item->data)));
-                            break;
-                        case FLOAT:
-                            Easy_Menu_Printf(-1, display_line, "[%.2f]", *((float*)(show_item->data)));
-                            break;
-                    }
+                    Easy_Menu_Display_Value(display_line, show_item->data_type, show_item->data);
                     break;
                 }
                 case GOTO_ITEM:
@@ -807,7 +634,7 @@ void Ordinary_Page_Refresh(void)
         for(unsigned char line = 0; ordinary_page->items_index + line < ordinary_page->item_num && line < max_visible_items && ordinary_page->items[ordinary_page->items_index + line] != NULL; line++)
         {
             /* 显示条目名称 */
-            Easy_Menu_Display_String(1, line, ordinary_page->items[ordinary_page->items_index + line]->text);
+            Ordinary_Page_Display_Item_Text(ordinary_page->items[ordinary_page->items_index + line], line);
             /* 显示条目数值 */
             switch(ordinary_page->items[ordinary_page->items_index + line]->type)
             {
@@ -815,12 +642,12 @@ void Ordinary_Page_Refresh(void)
                 {
                     Switch_Item *switch_item = (Switch_Item*)ordinary_page->items[ordinary_page->items_index + line];
 #if SWITCH_ITEM_MODE == 0
-                    if(*(switch_item->data) == 0)
+                    if(SWITCH_ITEM_STATE(switch_item) == 0)
                         Easy_Menu_Display_String(-1, line, "[0]");
                     else
                         Easy_Menu_Display_String(-1, line, "[1]");
 #else
-                    if(*(switch_item->data) == 0)
+                    if(SWITCH_ITEM_STATE(switch_item) == 0)
                         Easy_Menu_Display_String(-1, line, "[OFF]");
                     else
                         Easy_Menu_Display_String(-1, line, "[ON]");
@@ -830,65 +657,19 @@ void Ordinary_Page_Refresh(void)
                 case DATA_ITEM:
                 {
                     Data_Item *data_item = (Data_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    switch(data_item->data_type)
-                    {
-                        case UNSIGNED_CHAR:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned char*)(data_item->data)));
-                            break;
-                        case UNSIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned short int*)(data_item->data)));
-                            break;
-                        case UNSIGNED_INT:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned int*)(data_item->data)));
-                            break;
-                        case SIGNED_CHAR:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed char*)(data_item->data)));
-                            break;
-                        case SIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed short int*)(data_item->data)));
-                            break;
-                        case SIGNED_INT:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed int*)(data_item->data)));
-                            break;
-                        case FLOAT:
-                            Easy_Menu_Printf(-1, line, "[%.2f]", *((float*)(data_item->data)));
-                            break;
-                    }
+                    Easy_Menu_Display_Value(line, data_item->data_type, data_item->data);
                     break;
                 }
                 case ENUM_ITEM:
                 {
                     Enum_Item *enum_item = (Enum_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    Easy_Menu_Printf(-1, line, "[%s]", enum_item->enum_str[enum_item->enum_str_index]);
+                    Easy_Menu_Display_Enum(line, enum_item->enum_str[enum_item->enum_str_index]);
                     break;
                 }
                 case SHOW_ITEM:
                 {
                     Show_Item *show_item = (Show_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    switch(show_item->data_type)
-                    {
-                        case UNSIGNED_CHAR:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned char*)(show_item->data)));
-                            break;
-                        case UNSIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned short int*)(show_item->data)));
-                            break;
-                        case UNSIGNED_INT:
-                            Easy_Menu_Printf(-1, line, "[%u]", *((unsigned int*)(show_item->data)));
-                            break;
-                        case SIGNED_CHAR:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed char*)(show_item->data)));
-                            break;
-                        case SIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed short int*)(show_item->data)));
-                            break;
-                        case SIGNED_INT:
-                            Easy_Menu_Printf(-1, line, "[%d]", *((signed int*)(show_item->data)));
-                            break;
-                        case FLOAT:
-                            Easy_Menu_Printf(-1, line, "[%.2f]", *((float*)(show_item->data)));
-                            break;
-                    }
+                    Easy_Menu_Display_Value(line, show_item->data_type, show_item->data);
                     break;
                 }
                 case GOTO_ITEM:
@@ -900,11 +681,7 @@ void Ordinary_Page_Refresh(void)
         }
 #else
         /* 显示标题 */
-        unsigned char title_x = (EASY_MENU_COL_MAX_NUM / 2) - (strlen(ordinary_page->page.text) / 2);
-        
-        Easy_Menu_Display_Char(title_x - 1, 0, EASY_MENU_TITLE_LEFT_CHAR);
-        Easy_Menu_Display_String(title_x, 0, ordinary_page->page.text);
-        Easy_Menu_Display_Char(title_x + strlen(ordinary_page->page.text), 0, EASY_MENU_TITLE_RIGHT_CHAR);
+        Ordinary_Page_Display_Title(ordinary_page);
 
         
         /* 显示条目 */
@@ -913,7 +690,7 @@ void Ordinary_Page_Refresh(void)
             unsigned char display_line = line + line_offset; // 显示行号（跳过标题行）
             
             /* 显示条目名称 */
-            Easy_Menu_Display_String(1, display_line, ordinary_page->items[ordinary_page->items_index + line]->text);
+            Ordinary_Page_Display_Item_Text(ordinary_page->items[ordinary_page->items_index + line], display_line);
             
             /* 显示条目数值 */
             switch(ordinary_page->items[ordinary_page->items_index + line]->type)
@@ -922,12 +699,12 @@ void Ordinary_Page_Refresh(void)
                 {
                     Switch_Item *switch_item = (Switch_Item*)ordinary_page->items[ordinary_page->items_index + line];
 #if SWITCH_ITEM_MODE == 0
-                    if(*(switch_item->data) == 0)
+                    if(SWITCH_ITEM_STATE(switch_item) == 0)
                         Easy_Menu_Display_String(-1, display_line, "[0]");
                     else
                         Easy_Menu_Display_String(-1, display_line, "[1]");
 #else
-                    if(*(switch_item->data) == 0)
+                    if(SWITCH_ITEM_STATE(switch_item) == 0)
                         Easy_Menu_Display_String(-1, display_line, "[OFF]");
                     else
                         Easy_Menu_Display_String(-1, display_line, "[ON]");
@@ -937,65 +714,19 @@ void Ordinary_Page_Refresh(void)
                 case DATA_ITEM:
                 {
                     Data_Item *data_item = (Data_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    switch(data_item->data_type)
-                    {
-                        case UNSIGNED_CHAR:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned char*)(data_item->data)));
-                            break;
-                        case UNSIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned short int*)(data_item->data)));
-                            break;
-                        case UNSIGNED_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned int*)(data_item->data)));
-                            break;
-                        case SIGNED_CHAR:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed char*)(data_item->data)));
-                            break;
-                        case SIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed short int*)(data_item->data)));
-                            break;
-                        case SIGNED_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed int*)(data_item->data)));
-                            break;
-                        case FLOAT:
-                            Easy_Menu_Printf(-1, display_line, "[%.2f]", *((float*)(data_item->data)));
-                            break;
-                    }
+                    Easy_Menu_Display_Value(display_line, data_item->data_type, data_item->data);
                     break;
                 }
                 case ENUM_ITEM:
                 {
                     Enum_Item *enum_item = (Enum_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    Easy_Menu_Printf(-1, display_line, "[%s]", enum_item->enum_str[enum_item->enum_str_index]);
+                    Easy_Menu_Display_Enum(display_line, enum_item->enum_str[enum_item->enum_str_index]);
                     break;
                 }
                 case SHOW_ITEM:
                 {
                     Show_Item *show_item = (Show_Item*)ordinary_page->items[ordinary_page->items_index + line];
-                    switch(show_item->data_type)
-                    {
-                        case UNSIGNED_CHAR:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned char*)(show_item->data)));
-                            break;
-                        case UNSIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned short int*)(show_item->data)));
-                            break;
-                        case UNSIGNED_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%u]", *((unsigned int*)(show_item->data)));
-                            break;
-                        case SIGNED_CHAR:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed char*)(show_item->data)));
-                            break;
-                        case SIGNED_SHORT_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed short int*)(show_item->data)));
-                            break;
-                        case SIGNED_INT:
-                            Easy_Menu_Printf(-1, display_line, "[%d]", *((signed int*)(show_item->data)));
-                            break;
-                        case FLOAT:
-                            Easy_Menu_Printf(-1, display_line, "[%.2f]", *((float*)(show_item->data)));
-                            break;
-                    }
+                    Easy_Menu_Display_Value(display_line, show_item->data_type, show_item->data);
                     break;
                 }
                 case GOTO_ITEM:
@@ -1018,6 +749,9 @@ void Show_Page_Init(Page *prev_page, Page *page, char *text, unsigned short int
 {
     page->type = SHOW_PAGE;
     page->text = text;
+#if TEXT_LAYOUT_PRECOMPUTE
+    page->text_len = Easy_Menu_Text_Fit(text, UCHAR_MAX);
+#endif
     page->prev_page = prev_page;
     
     page->Enter = Show_Page_Enter;
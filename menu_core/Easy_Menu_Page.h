@@ -12,6 +12,9 @@ typedef struct Ordinary_Page {
     unsigned char items_index;                 // 条目数组索引（每页的第一行）
     
     unsigned char cursor;                      // 光标（行）
+#if TEXT_LAYOUT_PRECOMPUTE
+    unsigned char title_x;                     // 居中显示的标题起始列
+#endif
     
     void (*Refresh)(void);
 } Ordinary_Page;